@@ -1,12 +1,12 @@
 /* Beautiful F1 — Dashboard : onglet Calendrier + drill-down circuit.
  *
- * Le calendrier (léger, issu de dashboard_2026.json) s'affiche immédiatement.
- * Les données lourdes du circuit (circuits_2026.json ~152 Ko + gp_history.json)
+ * Le calendrier (léger, issu de dashboard.json) s'affiche immédiatement.
+ * Les données lourdes du circuit (circuits.json ~152 Ko + gp_history.json)
  * sont chargées à la demande au premier affichage de l'onglet → allège le load initial.
  */
 
 import { t } from "../i18n.js";
-import { formatDateShort, fetchJson } from "../utils.js";
+import { formatDateShort, fetchJson, seasonDataUrl } from "../utils.js";
 import { GP_TO_CIRCUIT } from "../constants.js";
 import { renderCircuitDetail } from "./circuit.js";
 import { wireCircuitHistory } from "./history.js";
@@ -66,7 +66,7 @@ export function initCalendar(dashRes, teamColor) {
     if (enhanced) return;
     enhanced = true;
     const [circuitsRes, historyRes] = await Promise.all([
-      fetchJson("data/circuits_2026.json"),
+      fetchJson(seasonDataUrl(dashRes.season, "circuits")),
       fetchJson("data/gp_history.json"),
     ]);
     const circuits = (circuitsRes && circuitsRes.circuits) || {};
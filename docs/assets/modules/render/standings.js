@@ -1,11 +1,42 @@
 /* Beautiful F1 — Dashboard : classements pilotes/constructeurs + drill-down pilote. */
 
 import { t } from "../i18n.js";
-import { renderDriverDetail } from "./driver.js";
+import { decodeProgress, renderDriverDetail } from "./driver.js";
+
+const COMPACT_SCHEMA = 2;
 
 const fmtDelta = (n) => (n > 0 ? `+${n}` : n === 0 ? "0" : `${n}`);
 const trophy = (rank) => (rank === 1 ? "🏆" : rank);
 
+// Développe le schéma compact de dashboard.json (tables `rounds`, `teams`,
+// `drivers` référencées par index) en payload classique ; sinon renvoie tel quel.
+export function decodeDashboard(dashRes) {
+  if (dashRes.schema !== COMPACT_SCHEMA) return dashRes;
+  const { schema, rounds, teams, drivers, constructors, calendar, ...head } = dashRes;
+  const winner = (i) =>
+    i === null
+      ? null
+      : { name: drivers[i].name, team: teams[drivers[i].team], shortName: drivers[i].shortName };
+  return {
+    ...head,
+    standings: {
+      drivers: drivers.map((d) => ({
+        name: d.name,
+        shortName: d.shortName,
+        team: teams[d.team],
+        image: d.image,
+        points: d.points,
+        deltaLastGp: d.deltaLastGp,
+        progress: decodeProgress(d, rounds),
+        rank: d.rank,
+        leaderGap: d.leaderGap,
+      })),
+      constructors: constructors.map((c) => ({ ...c, team: teams[c.team] })),
+    },
+    calendar: calendar.map((c) => ({ ...c, winner: winner(c.winner) })),
+  };
+}
+
 // Construit les deux tableaux de classement et câble le drill-down pilote.
 export function initStandings(dashRes, teamColor) {
   initDriversTable(dashRes, teamColor);
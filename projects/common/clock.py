@@ -0,0 +1,30 @@
+"""Horloge de référence des builders, figeable pour les rejeux hors ligne.
+
+Les builders décident "GP couru ou non" et datent leurs sorties (generatedAt)
+à partir de l'heure courante. Pour rejouer un enregistrement (voir replay.py)
+et obtenir des sorties identiques d'un run à l'autre, on fige cette heure :
+
+    F1_NOW=2026-07-28T12:00:00+00:00 python projects/dashboard/build_all.py --replay DIR
+
+Sans F1_NOW, `now()` est l'heure UTC réelle.
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import date, datetime, timezone
+
+NOW_ENV = "F1_NOW"
+
+
+def now() -> datetime:
+    """Heure courante (UTC, avec fuseau), ou celle figée par F1_NOW."""
+    frozen = os.environ.get(NOW_ENV)
+    if not frozen:
+        return datetime.now(timezone.utc)
+    value = datetime.fromisoformat(frozen)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def today() -> date:
+    return now().date()
@@ -0,0 +1,223 @@
+"""Cache FastF1 partagé par tous les builders : emplacement, taille max, stats, warm-up.
+
+Emplacement : $F1_CACHE_DIR, sinon ~/.fastf1_cache (dossier conservé entre deux
+runs par le workflow refresh-after-gp.yml). Chaque builder appelle
+`enable_cache()` avant son premier accès FastF1 ; l'appel est idempotent.
+
+Taille max : $F1_CACHE_MAX_MB (2048 par défaut). Au-delà, `evict()` supprime
+les sessions les moins récemment utilisées (dossiers <saison>/<GP>/<session>/
+écrits par FastF1 ; récence = dernier accès ou écriture d'un de leurs fichiers).
+Le cache HTTP (fastf1_http_cache.sqlite) est compté mais jamais évincé ici :
+requests-cache gère lui-même l'expiration de ses entrées.
+
+Hors ligne : avec $F1_OFFLINE=1, FastF1 ne lit que son cache (aucune requête
+réseau, une réponse absente lève une erreur). Voir replay.py.
+
+Usage :
+    python projects/common/fastf1_cache.py stats
+    python projects/common/fastf1_cache.py evict --max-mb 1024
+    python projects/common/fastf1_cache.py warm --season 2026   # avant un week-end de course
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import sys
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+import fastf1
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parents[1]
+
+# Racine du repo sur sys.path (pour importer projects.common quand lancé en script)
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from projects.common.load_plan import LOAD_KWARGS, plan_sessions  # noqa: E402
+from projects.common.session_loader import load_many  # noqa: E402
+from projects.dashboard import seasons  # noqa: E402
+
+CACHE_ENV = "F1_CACHE_DIR"
+MAX_MB_ENV = "F1_CACHE_MAX_MB"
+OFFLINE_ENV = "F1_OFFLINE"
+DEFAULT_DIR = Path("~/.fastf1_cache")
+DEFAULT_MAX_MB = 2048
+HTTP_CACHE_NAME = "fastf1_http_cache.sqlite"
+
+_lock = threading.Lock()
+_enabled: Path | None = None
+
+
+@dataclass
+class CacheEntry:
+    """Une session en cache (dossier FastF1)."""
+
+    path: Path
+    size: int
+    last_used: float
+
+
+def cache_dir() -> Path:
+    return Path(os.environ.get(CACHE_ENV) or DEFAULT_DIR).expanduser()
+
+
+def max_mb() -> int:
+    try:
+        return int(os.environ.get(MAX_MB_ENV, DEFAULT_MAX_MB))
+    except ValueError:
+        return DEFAULT_MAX_MB
+
+
+def offline() -> bool:
+    return os.environ.get(OFFLINE_ENV, "") not in ("", "0")
+
+
+def enable_cache(path: Path | None = None) -> Path:
+    """Active le cache FastF1 partagé (une seule fois par process), hors ligne si demandé."""
+    global _enabled
+    path = Path(path or cache_dir()).expanduser()
+    with _lock:
+        if _enabled != path:
+            path.mkdir(parents=True, exist_ok=True)
+            fastf1.Cache.enable_cache(str(path))
+            if offline():
+                fastf1.Cache.offline_mode(True)
+            _enabled = path
+    return path
+
+
+def _dir_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def session_entries(root: Path) -> list[CacheEntry]:
+    """Sessions en cache, de la moins à la plus récemment utilisée."""
+    entries = []
+    if not root.is_dir():
+        return entries
+    for season in root.iterdir():
+        if not (season.is_dir() and season.name.isdigit()):
+            continue
+        for event in (e for e in season.iterdir() if e.is_dir()):
+            for session in (s for s in event.iterdir() if s.is_dir()):
+                stats = [p.stat() for p in session.rglob("*") if p.is_file()]
+                last_used = max((max(st.st_atime, st.st_mtime) for st in stats), default=0.0)
+                size = sum(st.st_size for st in stats)
+                entries.append(CacheEntry(session, size, last_used))
+    entries.sort(key=lambda e: e.last_used)
+    return entries
+
+
+def stats(root: Path | None = None) -> dict:
+    root = Path(root or cache_dir()).expanduser()
+    entries = session_entries(root)
+    http = root / HTTP_CACHE_NAME
+    by_season: dict[str, int] = {}
+    for e in entries:
+        season = e.path.relative_to(root).parts[0]
+        by_season[season] = by_season.get(season, 0) + e.size
+    return {
+        "path": str(root),
+        "totalMb": round(_dir_size(root) / 1e6, 1) if root.is_dir() else 0.0,
+        "maxMb": max_mb(),
+        "sessions": len(entries),
+        "httpCacheMb": round(http.stat().st_size / 1e6, 1) if http.exists() else 0.0,
+        "bySeasonMb": {k: round(v / 1e6, 1) for k, v in sorted(by_season.items())},
+        "oldestUse": (
+            datetime.fromtimestamp(entries[0].last_used, timezone.utc).isoformat(timespec="seconds")
+            if entries
+            else None
+        ),
+    }
+
+
+def format_stats(s: dict) -> str:
+    lines = [
+        f"[INFO] Cache FastF1 : {s['path']}",
+        f"  taille   : {s['totalMb']} Mo / {s['maxMb']} Mo max "
+        f"(dont cache HTTP {s['httpCacheMb']} Mo)",
+        f"  sessions : {s['sessions']}",
+    ]
+    for season, mb in s["bySeasonMb"].items():
+        lines.append(f"    {season} : {mb} Mo")
+    if s["oldestUse"]:
+        lines.append(f"  plus ancien usage : {s['oldestUse']}")
+    return "\n".join(lines)
+
+
+def evict(root: Path | None = None, max_bytes: int | None = None) -> list[CacheEntry]:
+    """Supprime les sessions LRU jusqu'à repasser sous la taille max. Retourne les évincées."""
+    root = Path(root or cache_dir()).expanduser()
+    limit = max_mb() * 1_000_000 if max_bytes is None else max_bytes
+    if not root.is_dir():
+        return []
+    total = _dir_size(root)
+    evicted = []
+    for entry in session_entries(root):
+        if total <= limit:
+            break
+        shutil.rmtree(entry.path, ignore_errors=True)
+        total -= entry.size
+        evicted.append(entry)
+        event = entry.path.parent
+        if event.is_dir() and not any(event.iterdir()):
+            event.rmdir()
+    return evicted
+
+
+def _warm_one(season: int, round_no: int, session: str, tier: str) -> None:
+    ses = fastf1.get_session(season, round_no, session)
+    ses.load(**LOAD_KWARGS[tier])
+
+
+def warm(season: int, builders=None, max_workers: int | None = None) -> dict[str, int]:
+    """Pré-charge dans le cache les sessions disputées dont les builders ont besoin."""
+    enable_cache()
+    schedule = fastf1.get_event_schedule(season, include_testing=False)
+    plan = plan_sessions(schedule, builders=builders)
+    keys = [(season, p.round, p.name, p.tier) for p in plan]
+    loaded = load_many(keys, _warm_one, max_workers=max_workers)
+    failed = 0
+    for (_, round_no, name, _), item in loaded.items():
+        if not item.ok:
+            failed += 1
+            print(f"  [SKIP r{round_no:02d} {name}] {item.error}", file=sys.stderr)
+    return {"sessions": len(keys), "failed": failed}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Gestion du cache FastF1 partagé.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Taille et contenu du cache")
+    p_evict = sub.add_parser("evict", help="Éviction LRU jusqu'à la taille max")
+    p_evict.add_argument("--max-mb", type=int, default=None)
+    p_warm = sub.add_parser("warm", help="Pré-charge les sessions disputées d'une saison")
+    p_warm.add_argument("--season", type=int, default=seasons.CURRENT_SEASON)
+    p_warm.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "stats":
+        print(format_stats(stats()))
+    elif args.command == "evict":
+        max_bytes = args.max_mb * 1_000_000 if args.max_mb is not None else None
+        evicted = evict(max_bytes=max_bytes)
+        freed = sum(e.size for e in evicted) / 1e6
+        print(f"[OK] {len(evicted)} session(s) évincée(s), {freed:.1f} Mo libérés")
+    else:
+        counts = warm(args.season, max_workers=args.workers)
+        evicted = evict()
+        print(
+            f"[OK] warm {args.season} : {counts['sessions'] - counts['failed']} session(s) "
+            f"en cache, {counts['failed']} en échec, {len(evicted)} évincée(s)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""Duels entre coéquipiers, indexés par (écurie, paire de pilotes).
+
+Chaque session (qualif, course…) est une liste de lignes pilote ; dans chaque
+écurie, chaque paire de pilotes présents forme un duel. Les duels sont
+agrégés par *pairing* — (écurie, pilote A, pilote B), A < B alphabétiquement :
+un changement de pilote en cours de saison ouvre un nouveau pairing au lieu
+de fausser (ou d'écarter) les duels du premier.
+
+    h2h = HeadToHead(QUALIFYING)
+    h2h.extend(sessions)            # [{round, gp, shortName, type, drivers: [...]}]
+    h2h.add_session(meta, drivers)  # GP suivant : mise à jour incrémentale
+    h2h.to_json()                   # [{team, drivers, h2h, <compteurs>, sessions}]
+
+Ce qui est comparé et publié dépend d'un `DuelSpec` : `QUALIFYING` (lignes de
+build_qualifying_data.load_round_session, meilleur temps) et `RACE` (position
+d'arrivée) ; un nouveau jeu de duels n'a qu'à déclarer le sien. Le coût d'un
+ajout ne dépend que du nombre de pilotes de la session.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import Callable, Iterable
+
+
+@dataclass(frozen=True)
+class DuelSpec:
+    """Valeur comparée et champs publiés pour un type de duel.
+
+    `value` : plus petit = meilleur, None = pas de duel (le pilote reste dans
+    le pairing). `entry(a, b)` : champs propres au duel, A et B dans l'ordre
+    du pairing. `counters` : compteurs par pilote (ex. accès en Q3).
+    """
+
+    types: tuple[str, ...]
+    value: Callable[[dict], float | None]
+    entry: Callable[[dict, dict], dict]
+    winner_key: str = "winner"
+    counters: dict[str, Callable[[dict, dict], bool]] = field(default_factory=dict)
+
+
+def _qualifying_entry(a: dict, b: dict) -> dict:
+    return {
+        "gapSec": round(abs(a["bestTimeSec"] - b["bestTimeSec"]), 3),
+        "timeA": a["bestTimeStr"],
+        "timeB": b["bestTimeStr"],
+        "posA": a["position"],
+        "posB": b["position"],
+    }
+
+
+def _race_entry(a: dict, b: dict) -> dict:
+    return {
+        "posA": a["position"],
+        "posB": b["position"],
+        "pointsA": a.get("points"),
+        "pointsB": b.get("points"),
+    }
+
+
+QUALIFYING = DuelSpec(
+    types=("Q", "SQ"),
+    value=lambda d: d["bestTimeSec"],
+    entry=_qualifying_entry,
+    winner_key="fastest",
+    # Q3 n'existe qu'en qualifs classiques
+    counters={"q3Count": lambda meta, d: meta["type"] == "Q" and d["q3"]},
+)
+
+RACE = DuelSpec(
+    types=("R", "S"),
+    value=lambda d: d["position"],
+    entry=_race_entry,
+    winner_key="ahead",
+)
+
+
+def _merge_counts(
+    target: dict[str, dict[str, int]], source: dict[str, dict[str, int]], name: str
+) -> None:
+    """Déplace les compteurs de `name` de `source` vers `target`."""
+    for counter, counts in source.items():
+        n = counts.pop(name, 0)
+        if n:
+            target[counter][name] = target[counter].get(name, 0) + n
+
+
+@dataclass
+class Pairing:
+    team: str
+    drivers: tuple[str, ...]  # (A, B), ou (A,) tant que l'écurie n'a aligné qu'un pilote
+    h2h: dict[str, dict[str, int]]
+    counts: dict[str, dict[str, int]]
+    duels: list[dict] = field(default_factory=list)
+
+
+class HeadToHead:
+    """Agrégat incrémental des duels d'une saison (sessions ajoutées dans l'ordre)."""
+
+    def __init__(self, spec: DuelSpec) -> None:
+        self.spec = spec
+        self.pairings: dict[tuple[str, ...], Pairing] = {}
+        # écurie -> clés de ses pairings (ordre de première apparition)
+        self.by_team: dict[str, list[tuple[str, ...]]] = {}
+
+    def _pairing(self, team: str, drivers: tuple[str, ...]) -> Pairing:
+        key = (team, *drivers)
+        pairing = self.pairings.get(key)
+        if pairing is None:
+            pairing = Pairing(
+                team=team,
+                drivers=drivers,
+                h2h={t: {} for t in self.spec.types},
+                counts={name: {} for name in self.spec.counters},
+            )
+            self.pairings[key] = pairing
+            self.by_team.setdefault(team, []).append(key)
+            if len(drivers) > 1:
+                # Sessions courues seul avant la paire : compteurs repris par celle-ci
+                for name in drivers:
+                    solo = self.pairings.get((team, name))
+                    if solo is not None:
+                        _merge_counts(pairing.counts, solo.counts, name)
+        return pairing
+
+    def _solo_target(self, team: str, name: str) -> Pairing:
+        """Pairing qui reçoit les compteurs d'un pilote seul de son écurie en session.
+
+        Le dernier duo de l'écurie qui le contient ; à défaut un pairing solo,
+        repris par le premier duo formé ensuite.
+        """
+        for key in reversed(self.by_team.get(team, [])):
+            if len(key) > 2 and name in key[1:]:
+                return self.pairings[key]
+        return self._pairing(team, (name,))
+
+    def add_session(self, meta: dict, drivers: list[dict]) -> None:
+        """Ajoute une session : un duel par paire de coéquipiers présents."""
+        lineups: dict[str, dict[str, dict]] = {}
+        for d in drivers:
+            if d["team"]:
+                lineups.setdefault(d["team"], {})[d["fullName"]] = d
+        spec = self.spec
+        for team, lineup in lineups.items():
+            names = sorted(lineup)
+            for pair in combinations(names, 2) if len(names) > 1 else [tuple(names)]:
+                if len(pair) > 1:
+                    pairing = self._pairing(team, pair)
+                else:
+                    pairing = self._solo_target(team, pair[0])
+                for name, counter in spec.counters.items():
+                    for d in lineup.values():  # ordre de la session
+                        if d["fullName"] in pair and counter(meta, d):
+                            counts = pairing.counts[name]
+                            counts[d["fullName"]] = counts.get(d["fullName"], 0) + 1
+                if len(pair) < 2:
+                    continue
+                a, b = pair
+                da, db = lineup[a], lineup[b]
+                va, vb = spec.value(da), spec.value(db)
+                if va is None or vb is None:
+                    continue
+                winner = a if va < vb else b
+                wins = pairing.h2h.setdefault(meta["type"], {})
+                wins[winner] = wins.get(winner, 0) + 1
+                pairing.duels.append(
+                    {
+                        "round": meta["round"],
+                        "gp": meta["gp"],
+                        "shortName": meta["shortName"],
+                        "type": meta["type"],
+                        spec.winner_key: winner,
+                        **spec.entry(da, db),
+                    }
+                )
+
+    def extend(self, sessions: Iterable[dict]) -> HeadToHead:
+        for s in sessions:
+            self.add_session(s, s["drivers"])
+        return self
+
+    def to_json(self) -> list[dict]:
+        """Pairings groupés par écurie (ordre de première apparition).
+
+        Un pilote seul n'est publié que si son écurie n'a aligné aucun duo (ses
+        sessions en solo sont alors comptées dans le duo, voir `_solo_target`).
+        """
+        out = []
+        for keys in self.by_team.values():
+            has_pair = any(len(key) > 2 for key in keys)
+            for key in keys:
+                p = self.pairings[key]
+                if has_pair and len(p.drivers) < 2:
+                    continue
+                out.append(
+                    {
+                        "team": p.team,
+                        "drivers": list(p.drivers),
+                        "h2h": {t: dict(w) for t, w in p.h2h.items()},
+                        **{name: dict(c) for name, c in p.counts.items()},
+                        "sessions": list(p.duels),
+                    }
+                )
+        return out
@@ -0,0 +1,136 @@
+"""Plan de chargement des sessions FastF1 : quoi charger, à quel niveau de données.
+
+Le plan est déduit du calendrier FastF1 (noms et dates des sessions de chaque
+événement, EventFormat) et des besoins déclarés de chaque builder :
+
+    race_chart : Race + Sprint            → résultats seuls
+    heatmap    : Race + Sprint            → résultats seuls
+    qualifying : Qualifying               → résultats seuls (Q1/Q2/Q3)
+                 Sprint Qualifying        → laps (meilleur tour, absent d'Ergast)
+
+Seules les sessions déjà disputées et réellement au programme sont planifiées :
+pas de tentative "Sprint" sur un week-end classique, pas de GP futur.
+
+Niveaux de données (`TIERS`, du plus léger au plus lourd) et arguments de
+`Session.load()` correspondants dans `LOAD_KWARGS`. `ESTIMATED_MB` donne un
+ordre de grandeur du volume téléchargé par session (cache HTTP vide) : assez
+pour comparer deux plans (`--dry-run`), pas une mesure.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Iterable
+
+import pandas as pd
+
+from projects.common import clock
+
+# Nom de session FastF1 (schedule) -> code court
+SESSION_CODES = {
+    "Race": "R",
+    "Sprint": "S",
+    "Qualifying": "Q",
+    "Sprint Qualifying": "SQ",
+    "Sprint Shootout": "SQ",  # nom 2023 des qualifs sprint
+}
+
+TIERS = ("results", "laps", "telemetry")
+LOAD_KWARGS = {
+    "results": {"laps": False, "telemetry": False, "weather": False, "messages": False},
+    # Messages de la direction de course : FastF1 en tire les tours supprimés (Deleted)
+    "laps": {"laps": True, "telemetry": False, "weather": False, "messages": True},
+    "telemetry": {"laps": True, "telemetry": True, "weather": False, "messages": False},
+}
+ESTIMATED_MB = {"results": 0.3, "laps": 8.0, "telemetry": 60.0}
+
+# Besoins par builder : code session -> niveau de données
+BUILDER_NEEDS = {
+    "race_chart": {"R": "results", "S": "results"},
+    "heatmap": {"R": "results", "S": "results"},
+    "qualifying": {"Q": "results", "SQ": "laps"},
+}
+
+
+@dataclass(frozen=True)
+class PlannedSession:
+    round: int
+    code: str
+    name: str
+    date: datetime
+    tier: str
+    builders: tuple[str, ...]
+    stored: bool = False
+
+    @property
+    def estimated_mb(self) -> float:
+        return 0.0 if self.stored else ESTIMATED_MB[self.tier]
+
+
+def session_tier(code: str, builders: Iterable[str] | None = None) -> str | None:
+    """Niveau de données le plus lourd requis pour ce code par les builders donnés."""
+    tiers = [
+        BUILDER_NEEDS[b][code] for b in (builders or BUILDER_NEEDS) if code in BUILDER_NEEDS[b]
+    ]
+    return max(tiers, key=TIERS.index) if tiers else None
+
+
+def plan_sessions(
+    schedule: pd.DataFrame,
+    builders: Iterable[str] | None = None,
+    now: datetime | None = None,
+    is_stored: Callable[[int, str], bool] | None = None,
+) -> list[PlannedSession]:
+    """Sessions disputées dont les builders ont besoin, dans l'ordre du calendrier.
+
+    `is_stored(round, code)` marque les sessions déjà disponibles localement
+    (store de résultats) : elles restent dans le plan, sans coût de téléchargement.
+    """
+    builders = tuple(builders or BUILDER_NEEDS)
+    now = now or clock.now()
+    plan = []
+    for _, event in schedule.iterrows():
+        round_no = int(event["RoundNumber"])
+        if round_no <= 0 or event.get("EventFormat") == "testing":
+            continue
+        for i in range(1, 6):
+            name = event.get(f"Session{i}")
+            code = SESSION_CODES.get(name)
+            start = event.get(f"Session{i}DateUtc")
+            if code is None or start is None or pd.isna(start):
+                continue
+            start = pd.Timestamp(start).to_pydatetime().replace(tzinfo=timezone.utc)
+            users = tuple(b for b in builders if code in BUILDER_NEEDS[b])
+            if start >= now or not users:
+                continue
+            plan.append(
+                PlannedSession(
+                    round=round_no,
+                    code=code,
+                    name=name,
+                    date=start,
+                    tier=session_tier(code, users),
+                    builders=users,
+                    stored=bool(is_stored and is_stored(round_no, code)),
+                )
+            )
+    return plan
+
+
+def format_plan(plan: list[PlannedSession], season: int) -> str:
+    """Plan lisible pour --dry-run (une ligne par session + total estimé)."""
+    lines = [f"[INFO] Plan de chargement {season} : {len(plan)} session(s)"]
+    for p in plan:
+        state = "stockée" if p.stored else f"~{p.estimated_mb:g} Mo"
+        lines.append(
+            f"  r{p.round:02d} {p.code:<2} {p.name:<18} {p.date:%Y-%m-%d}  {p.tier:<9} "
+            f"{', '.join(p.builders):<32} {state}"
+        )
+    todo = [p for p in plan if not p.stored]
+    total = sum(p.estimated_mb for p in todo)
+    lines.append(
+        f"[INFO] {len(todo)} à télécharger (~{total:.1f} Mo estimés), "
+        f"{len(plan) - len(todo)} déjà stockée(s)"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,69 @@
+"""Enregistrement / rejeu hors ligne des réponses FastF1 et Jolpica/Ergast.
+
+Un enregistrement est un dossier de cache FastF1 complet (cache HTTP
+fastf1_http_cache.sqlite + sessions parsées) accompagné d'un manifeste
+`replay.json` (date de l'enregistrement, saison, version de FastF1). Les
+requêtes Ergast passent par le même cache HTTP que FastF1 : un seul dossier
+suffit pour tout build_all.
+
+    python projects/dashboard/build_all.py --record snapshots/2026-r12   # réseau, remplit DIR
+    python projects/dashboard/build_all.py --replay snapshots/2026-r12   # aucun accès réseau
+
+En rejeu :
+  - FastF1 passe en mode hors ligne (F1_OFFLINE, voir fastf1_cache.enable_cache) :
+    une requête absente de l'enregistrement échoue au lieu de partir sur le réseau ;
+  - l'horloge des builders est figée à la date de l'enregistrement (F1_NOW, voir
+    clock.py) : mêmes sessions "disputées", même generatedAt, sorties identiques
+    d'un rejeu à l'autre ;
+  - l'éviction LRU du cache est neutralisée (F1_CACHE_MAX_MB) pour ne jamais
+    amputer un enregistrement.
+
+Le dossier .fastf1/cache versionné (cache HTTP seul) est un point de départ
+utilisable tel quel avec --replay, sans manifeste (horloge non figée).
+
+Les réglages passent par variables d'environnement : ils valent pour le
+process courant et sont hérités par les builders lancés en sous-process.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import fastf1
+
+from projects.common import clock
+from projects.common.fastf1_cache import CACHE_ENV, MAX_MB_ENV, OFFLINE_ENV
+
+MANIFEST = "replay.json"
+NO_EVICTION_MB = 10**9
+
+
+def record_env(path: Path, season: int) -> dict[str, str]:
+    """Variables d'un run d'enregistrement ; écrit le manifeste dans `path`."""
+    path = Path(path).expanduser()
+    path.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        "recordedAt": clock.now().isoformat(timespec="seconds"),
+        "season": season,
+        "fastf1Version": fastf1.__version__,
+    }
+    (path / MANIFEST).write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    return {CACHE_ENV: str(path), MAX_MB_ENV: str(NO_EVICTION_MB)}
+
+
+def replay_env(path: Path) -> dict[str, str]:
+    """Variables d'un rejeu hors ligne de l'enregistrement `path`."""
+    path = Path(path).expanduser()
+    if not path.is_dir():
+        raise FileNotFoundError(f"Enregistrement introuvable : {path}")
+    env = {CACHE_ENV: str(path), MAX_MB_ENV: str(NO_EVICTION_MB), OFFLINE_ENV: "1"}
+    manifest = path / MANIFEST
+    if manifest.exists():
+        env[clock.NOW_ENV] = json.loads(manifest.read_text(encoding="utf-8"))["recordedAt"]
+    return env
+
+
+def offline_env() -> dict[str, str]:
+    """Variables d'un run hors ligne sur le cache courant (API amont indisponible)."""
+    return {OFFLINE_ENV: "1"}
@@ -0,0 +1,349 @@
+"""Store local des résultats de session FastF1, partagé par tous les builders.
+
+Race chart, heatmaps et qualifs lisaient chacun les mêmes sessions (Race,
+Sprint, Qualifying, Sprint Qualifying) via `fastf1.get_session(...).load()`.
+Le store normalise ces résultats dans un CSV par session :
+
+    projects/common/data/results/<season>/r<round:02d>_<code>.csv
+        code ∈ R (course), S (sprint), Q (qualifs), SQ (qualifs sprint)
+
+Le store part vide : aucun CSV n'est versionné dans le dépôt à ce jour, donc le
+premier run d'un checkout neuf (runner CI) charge toute la saison via FastF1
+(le cache HTTP de fastf1_cache.py en absorbe une partie). Le dossier n'est pas
+ignoré par git : le workflow de refresh, qui committe toutes les données
+modifiées, le versionne à son premier passage ; les runs suivants ne chargent
+plus que les sessions absentes ou récentes (REFRESH_DAYS).
+
+Remplissage une fois par refresh (étape `results_store` de build_all.py) :
+    python projects/common/results_store.py --season 2026
+
+Les builders lisent via `load_results()` (lecture du store, sinon chargement
+FastF1 puis écriture dans le store) : lancés seuls, ils restent autonomes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import warnings
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import fastf1
+import pandas as pd
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parents[1]
+STORE_DIR = HERE / "data" / "results"
+
+# Racine du repo sur sys.path (pour importer projects.common quand lancé en script)
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from projects.common import clock  # noqa: E402
+from projects.common.fastf1_cache import enable_cache, evict  # noqa: E402
+from projects.common.load_plan import (  # noqa: E402
+    LOAD_KWARGS,
+    SESSION_CODES,
+    format_plan,
+    plan_sessions,
+    session_tier,
+)
+from projects.common.run_report import reported  # noqa: E402
+from projects.common.session_loader import load_many  # noqa: E402
+from projects.dashboard import seasons  # noqa: E402
+
+COLUMNS = [
+    "DriverNumber",
+    "Abbreviation",
+    "FirstName",
+    "LastName",
+    "FullName",
+    "TeamName",
+    "HeadshotUrl",
+    "Position",
+    "GridPosition",
+    "Points",
+    "Status",
+    "Q1",
+    "Q2",
+    "Q3",
+    "BestLapTime",
+]
+STRING_COLUMNS = ["DriverNumber", "Abbreviation", "FirstName", "LastName", "FullName"]
+STRING_COLUMNS += ["TeamName", "HeadshotUrl", "Status"]
+# Stockées en secondes, restituées en Timedelta (comme FastF1)
+TIME_COLUMNS = ["Q1", "Q2", "Q3", "BestLapTime"]
+
+# Sessions récentes re-chargées même si présentes (résultats encore en
+# propagation / pénalités post-course) — aligné sur check_should_refresh.LOOKBACK_DAYS
+REFRESH_DAYS = 2
+
+
+def session_path(season: int, round_no: int, code: str, store_dir: Path | None = None) -> Path:
+    return (store_dir or STORE_DIR) / str(season) / f"r{int(round_no):02d}_{code}.csv"
+
+
+def normalise_results(
+    results: pd.DataFrame, best_laps: dict[str, float] | None = None
+) -> pd.DataFrame:
+    """Réduit `session.results` FastF1 aux colonnes du store (temps en secondes)."""
+    df = pd.DataFrame(index=range(len(results)))
+    src = results.reset_index(drop=True)
+    for col in COLUMNS:
+        if col in TIME_COLUMNS:
+            if col in src.columns:
+                df[col] = pd.to_timedelta(src[col]).dt.total_seconds()
+            else:
+                df[col] = float("nan")
+        elif col in src.columns:
+            df[col] = src[col]
+        else:
+            df[col] = "" if col in STRING_COLUMNS else float("nan")
+    for col in STRING_COLUMNS:
+        df[col] = df[col].fillna("").astype(str)
+    if best_laps:
+        df["BestLapTime"] = df["Abbreviation"].map(best_laps).astype(float)
+    return df
+
+
+def read_results(
+    season: int, round_no: int, code: str, store_dir: Path | None = None
+) -> pd.DataFrame | None:
+    """Résultats d'une session depuis le store (None si absente)."""
+    path = session_path(season, round_no, code, store_dir)
+    if not path.exists():
+        return None
+    df = pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8")
+    for col in COLUMNS:
+        if col not in df.columns:
+            df[col] = ""
+    for col in ("Position", "GridPosition", "Points"):
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    for col in TIME_COLUMNS:
+        df[col] = pd.to_timedelta(pd.to_numeric(df[col], errors="coerce"), unit="s")
+    return df
+
+
+def write_results(
+    season: int, round_no: int, code: str, results: pd.DataFrame, store_dir: Path | None = None
+) -> Path:
+    """Écriture atomique (deux builders parallèles peuvent remplir la même session)."""
+    path = session_path(season, round_no, code, store_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}_", suffix=".csv")
+    with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+        results[COLUMNS].to_csv(f, index=False)
+    os.replace(tmp, path)
+    return path
+
+
+# Mêmes messages que ceux lus par FastF1 (Session._set_laps_deleted_from_rcm)
+_DELETED = re.compile(r"CAR (\d{1,2}) .* TIME (\d:\d\d\.\d\d\d) DELETED - ")
+_REINSTATED = re.compile(r"CAR (\d{1,2}) .* TIME (\d:\d\d\.\d\d\d) .*REINSTATED")
+
+
+def deleted_laps(messages: list[str]) -> set[tuple[str, float]]:
+    """Tours supprimés d'après les messages de la direction de course.
+
+    (numéro pilote, temps en secondes), hors tours rétablis ensuite.
+    """
+
+    def parse(pattern: re.Pattern) -> set[tuple[str, float]]:
+        found = set()
+        for msg in messages:
+            m = pattern.match(str(msg))
+            if m:
+                minutes, seconds = m[2].split(":")
+                found.add((m[1], round(int(minutes) * 60 + float(seconds), 3)))
+        return found
+
+    return parse(_DELETED) - parse(_REINSTATED)
+
+
+def best_lap_times(laps: pd.DataFrame) -> dict[str, float]:
+    """Meilleur tour de chaque pilote, en secondes : un seul groupby-min.
+
+    Même règle que `Laps.pick_fastest()` (tours marqués IsPersonalBest, hors
+    tours supprimés), restreinte aux tours fiables (IsAccurate) quand la
+    colonne existe, sur toutes les lignes d'un coup. Accepte les `Laps`
+    FastF1 comme le tableau brut de `fastf1.api.timing_data` : seules les
+    colonnes Driver et LapTime sont requises.
+    """
+    if laps is None or laps.empty:
+        return {}
+    keep = laps["LapTime"].notna()
+    if "IsAccurate" in laps.columns:
+        keep &= laps["IsAccurate"].eq(True)
+    if "IsPersonalBest" in laps.columns:
+        keep &= laps["IsPersonalBest"].eq(True)
+    if "Deleted" in laps.columns:
+        keep &= ~laps["Deleted"].eq(True)
+    best = laps.loc[keep].groupby("Driver", sort=False)["LapTime"].min()
+    return {str(drv): float(t) for drv, t in pd.to_timedelta(best).dt.total_seconds().items()}
+
+
+def timing_best_laps(ses, results: pd.DataFrame) -> dict[str, float] | None:
+    """Meilleurs tours depuis le seul flux de chronométrage (None si indisponible).
+
+    `fastf1.api.timing_data` parse les temps au tour sans construire l'objet
+    `Laps` (appariement pneus, statut piste, positions) : c'est tout ce qu'il
+    faut pour un meilleur tour. Le flux identifie les pilotes par numéro et ne
+    connaît pas les tours supprimés (limites de piste) : ils sont retirés
+    d'après les messages de la direction de course. Sans ces messages, None.
+    """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # fastf1.api annoncé comme privé
+            from fastf1 import api
+
+            laps, _ = api.timing_data(ses.api_path)
+            messages = api.race_control_messages(ses.api_path)["Message"]
+    except Exception as e:
+        print(f"[INFO] Chronométrage seul indisponible ({e}), chargement des laps complet")
+        return None
+    deleted = deleted_laps(messages)
+    seconds = pd.to_timedelta(laps["LapTime"]).dt.total_seconds().round(3)
+    laps = laps.assign(Deleted=[(str(d), t) in deleted for d, t in zip(laps["Driver"], seconds)])
+    by_number = dict(zip(results["DriverNumber"].astype(str), results["Abbreviation"]))
+    return {by_number.get(num, num): t for num, t in best_lap_times(laps).items()}
+
+
+def fetch_session_results(season: int, round_no: int, session: str) -> pd.DataFrame | None:
+    """Charge une session via FastF1 au niveau de données du plan et la normalise.
+
+    Résultats seuls en général ; pour les qualifs sprint (Ergast n'a pas leurs
+    temps), meilleur tour de chaque pilote lu dans le flux de chronométrage,
+    avec repli sur le chargement complet des laps.
+    """
+    enable_cache()
+    code = SESSION_CODES.get(session, session)
+    tier = session_tier(code) or "results"
+    needs_laps = LOAD_KWARGS[tier]["laps"]
+    ses = fastf1.get_session(season, round_no, session)
+    ses.load(**LOAD_KWARGS["results" if needs_laps else tier])
+    results = ses.results
+    if results is None or results.empty:
+        return None
+
+    best_laps = None
+    if needs_laps:
+        best_laps = timing_best_laps(ses, results)
+        if best_laps is None:
+            ses.load(**LOAD_KWARGS[tier])
+            best_laps = best_lap_times(ses.laps)
+    return normalise_results(results, best_laps)
+
+
+def load_results(
+    season: int, round_no: int, code: str, store_dir: Path | None = None, refresh: bool = False
+) -> pd.DataFrame | None:
+    """Lecture du store, sinon chargement FastF1 + écriture dans le store.
+
+    Les erreurs FastF1 (session inexistante, données absentes) sont propagées :
+    chaque builder garde sa propre politique de skip / fallback.
+    """
+    if not refresh:
+        cached = read_results(season, round_no, code, store_dir)
+        if cached is not None:
+            return cached
+    fetched = fetch_session_results(season, round_no, code)
+    if fetched is None:
+        return None
+    write_results(season, round_no, code, fetched, store_dir)
+    return read_results(season, round_no, code, store_dir)
+
+
+def fill_season(
+    season: int,
+    store_dir: Path | None = None,
+    refresh_days: int = REFRESH_DAYS,
+    full: bool = False,
+    now: datetime | None = None,
+    max_workers: int | None = None,
+) -> dict[str, int]:
+    """Remplit le store avec toutes les sessions disputées de la saison.
+
+    Sessions déjà présentes conservées, sauf celles des `refresh_days` derniers
+    jours (ou toutes avec `full=True`). Les chargements FastF1 sont répartis
+    sur `max_workers` threads (voir session_loader.py).
+    """
+    now = now or clock.now()
+    enable_cache()
+    schedule = fastf1.get_event_schedule(season, include_testing=False)
+    # Dossier créé même sans session disputée : c'est la sortie de l'étape build_all
+    ((store_dir or STORE_DIR) / str(season)).mkdir(parents=True, exist_ok=True)
+    counts = {"kept": 0, "loaded": 0, "refreshed": 0, "failed": 0}
+    todo = {}
+    for p in plan_sessions(schedule, now=now, is_stored=stored_in(season, store_dir)):
+        recent = now - p.date <= timedelta(days=refresh_days)
+        if p.stored and not (full or recent):
+            counts["kept"] += 1
+            continue
+        todo[(season, p.round, p.name)] = p
+
+    loaded = load_many(todo, fetch_session_results, max_workers=max_workers)
+    for key, item in loaded.items():
+        p = todo[key]
+        if not item.ok:
+            print(f"  [SKIP r{p.round:02d} {p.code}] {item.error}", file=sys.stderr)
+            counts["failed"] += 1
+            continue
+        if item.value is None:
+            counts["failed"] += 1
+            continue
+        write_results(season, p.round, p.code, item.value, store_dir)
+        counts["refreshed" if p.stored else "loaded"] += 1
+        print(f"  - r{p.round:02d} {p.code} ({p.name})")
+    return counts
+
+
+def stored_in(season: int, store_dir: Path | None = None):
+    """Prédicat (round, code) -> session présente dans le store (pour plan_sessions)."""
+    return lambda round_no, code: session_path(season, round_no, code, store_dir).exists()
+
+
+def season_plan(season: int, builders=None, store_dir: Path | None = None) -> str:
+    """Plan de chargement lisible de la saison (sessions déjà stockées comprises)."""
+    enable_cache()
+    schedule = fastf1.get_event_schedule(season, include_testing=False)
+    plan = plan_sessions(schedule, builders=builders, is_stored=stored_in(season, store_dir))
+    return format_plan(plan, season)
+
+
+@reported("results_store")
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Remplit le store local des résultats FastF1.")
+    parser.add_argument("--season", type=int, default=seasons.CURRENT_SEASON)
+    parser.add_argument(
+        "--full", action="store_true", help="Recharge toutes les sessions, même déjà stockées"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Chargements FastF1 en parallèle (défaut: 4)"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Affiche le plan de chargement sans rien charger"
+    )
+    args = parser.parse_args(argv)
+
+    if args.dry_run:
+        print(season_plan(args.season))
+        return 0
+
+    counts = fill_season(args.season, full=args.full, max_workers=args.workers)
+    print(
+        f"[OK] store {args.season} : {counts['loaded']} nouvelle(s), "
+        f"{counts['refreshed']} rafraîchie(s), {counts['kept']} conservée(s), "
+        f"{counts['failed']} en échec"
+    )
+    evicted = evict()
+    if evicted:
+        print(f"[INFO] Cache FastF1 : {len(evicted)} session(s) évincée(s) (taille max)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Noyaux de statistiques incrémentales (une valeur à la fois, ordre chronologique).
+
+Les colonnes d'analyse de la heatmap leaders (moyenne / médiane de position à
+date, moyenne des 5 derniers GP, taux de podium…) sont des statistiques
+"à date" par pilote. Plutôt que des `groupby().expanding()` / `rolling()`
+successifs réalignés par index, chaque noyau avance d'une observation à la
+fois et rend sa valeur courante :
+
+    median = RunningMedian()
+    [median.push(x) for x in (3, 1, 2)]   # -> [3.0, 2.0, 2.0]
+
+Conventions alignées sur pandas (min_periods=1) : une valeur manquante (NaN /
+None) n'entre pas dans la statistique ; `RunningMean` / `RunningMedian`
+rendent NaN tant qu'aucune valeur n'a été vue. Coût par observation : O(1),
+sauf `RunningMedian` en O(log n) (deux tas) au lieu d'un tri par pas.
+
+L'état d'un noyau n'est que son historique utile : pour reprendre un calcul
+(mode incrémental), rejouer les observations déjà connues puis continuer.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from collections import deque
+
+NAN = float("nan")
+
+
+def _missing(x) -> bool:
+    return x is None or (isinstance(x, float) and math.isnan(x))
+
+
+class RunningSum:
+    """Somme cumulée ; une valeur manquante rend NaN sans interrompre le cumul."""
+
+    def __init__(self) -> None:
+        self.total = 0.0
+
+    def push(self, x) -> float:
+        if _missing(x):
+            return NAN
+        self.total += x
+        return self.total
+
+
+class RunningMean:
+    """Moyenne de toutes les valeurs vues (équivalent `expanding().mean()`)."""
+
+    def __init__(self) -> None:
+        self.total = 0.0
+        self.count = 0
+
+    def push(self, x) -> float:
+        if not _missing(x):
+            self.total += x
+            self.count += 1
+        return self.total / self.count if self.count else NAN
+
+
+class RunningMedian:
+    """Médiane de toutes les valeurs vues, par deux tas (équivalent `expanding().median()`).
+
+    `low` : moitié basse (tas max, valeurs opposées), `high` : moitié haute (tas
+    min) ; `low` garde au plus un élément de plus que `high`.
+    """
+
+    def __init__(self) -> None:
+        self.low: list[float] = []
+        self.high: list[float] = []
+
+    def push(self, x) -> float:
+        if not _missing(x):
+            if self.low and x > -self.low[0]:
+                heapq.heappush(self.high, x)
+            else:
+                heapq.heappush(self.low, -x)
+            if len(self.low) > len(self.high) + 1:
+                heapq.heappush(self.high, -heapq.heappop(self.low))
+            elif len(self.high) > len(self.low):
+                heapq.heappush(self.low, -heapq.heappop(self.high))
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if not self.low:
+            return NAN
+        if len(self.low) > len(self.high):
+            return float(-self.low[0])
+        return (-self.low[0] + self.high[0]) / 2
+
+
+class WindowMean:
+    """Moyenne des `size` dernières observations (équivalent `rolling(size, min_periods=1)`).
+
+    Une observation manquante occupe sa place dans la fenêtre sans compter
+    dans la moyenne.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.window: deque = deque(maxlen=size)
+        self.total = 0.0
+        self.count = 0
+
+    def push(self, x) -> float:
+        if len(self.window) == self.window.maxlen:
+            old = self.window[0]
+            if not _missing(old):
+                self.total -= old
+                self.count -= 1
+        self.window.append(x)
+        if not _missing(x):
+            self.total += x
+            self.count += 1
+        return self.total / self.count if self.count else NAN
+
+
+class CumulativeRate:
+    """Succès cumulés / observations (manquantes comprises) : taux de podium, de points…
+
+    Une observation manquante compte au dénominateur et rend NaN à ce pas
+    (comme `cumsum()` pandas sur un indicateur NaN, divisé par le nombre de GP).
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0.0
+        self.count = 0
+
+    def push(self, hit) -> float:
+        self.count += 1
+        if _missing(hit):
+            return NAN
+        self.hits += float(hit)
+        return self.hits / self.count
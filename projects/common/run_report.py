@@ -0,0 +1,209 @@
+"""Instrumentation des builders : temps, mémoire, I/O et activité FastF1.
+
+Pour chaque étape mesurée (`instrument`) :
+    - wallSec / cpuSec     : temps réel et temps CPU du process,
+    - peakRssMb            : pic de mémoire résidente du process,
+    - sessionLoads         : nombre d'appels à fastf1 Session.load(),
+    - httpRequests         : requêtes HTTP émises (requests / requests-cache),
+    - httpCacheHits        : dont servies par le cache HTTP (cacheHitRate),
+    - bytesWritten         : octets écrits par le process (fichiers + stdout).
+
+Un builder lancé seul écrit son rapport JSON si la variable d'environnement
+F1_RUN_REPORT est définie :
+    F1_RUN_REPORT=report.json python projects/race_chart_builder/race_chart_builder_fastf1.py
+
+build_all.py agrège les rapports de ses étapes dans un seul fichier
+(voir --report). Limite : en mode in-process parallèle, CPU / RSS / octets
+écrits sont ceux du process entier, pas d'une seule étape.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+from typing import Iterator
+
+REPORT_ENV = "F1_RUN_REPORT"
+
+try:  # pragma: no cover - dépend de la plateforme
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:  # dépendance optionnelle (requirements.txt), fallback /proc sur Linux
+    import psutil
+except ImportError:
+    psutil = None
+
+_lock = threading.Lock()
+_counters = {"sessionLoads": 0, "httpRequests": 0, "httpCacheHits": 0}
+_hooked: set[str] = set()
+
+
+def _count(key: str, n: int = 1) -> None:
+    with _lock:
+        _counters[key] += n
+
+
+def install_hooks() -> None:
+    """Installe (une fois) les compteurs sur fastf1 et requests déjà importés.
+
+    Idempotent ; appelé au début de chaque mesure. Les builders importent
+    fastf1 en tête de module : au moment où leur main() tourne, les hooks
+    peuvent donc être posés.
+    """
+    with _lock:
+        if "requests" not in _hooked and "requests" in sys.modules:
+            import requests
+
+            orig_request = requests.Session.request
+
+            @functools.wraps(orig_request)
+            def request(self, *args, **kwargs):
+                resp = orig_request(self, *args, **kwargs)
+                _count("httpRequests")
+                if getattr(resp, "from_cache", False):
+                    _count("httpCacheHits")
+                return resp
+
+            requests.Session.request = request
+            _hooked.add("requests")
+
+        if "fastf1" not in _hooked and "fastf1" in sys.modules:
+            from fastf1.core import Session
+
+            orig_load = Session.load
+
+            @functools.wraps(orig_load)
+            def load(self, *args, **kwargs):
+                _count("sessionLoads")
+                return orig_load(self, *args, **kwargs)
+
+            Session.load = load
+            _hooked.add("fastf1")
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss : kilo-octets sous Linux, octets sous macOS
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def _bytes_written() -> int | None:
+    if psutil is not None:
+        try:
+            return int(psutil.Process().io_counters().write_chars)
+        except (AttributeError, psutil.Error):
+            pass
+    try:
+        for line in Path("/proc/self/io").read_text().splitlines():
+            if line.startswith("wchar:"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _snapshot() -> dict:
+    with _lock:
+        counters = dict(_counters)
+    return {
+        "wall": time.perf_counter(),
+        "cpu": time.process_time(),
+        "written": _bytes_written(),
+        **counters,
+    }
+
+
+@contextmanager
+def instrument(name: str) -> Iterator[dict]:
+    """Mesure le bloc et remplit le dict produit à la sortie (même en cas d'erreur)."""
+    install_hooks()
+    before = _snapshot()
+    metrics: dict = {"name": name}
+    try:
+        yield metrics
+    finally:
+        install_hooks()
+        after = _snapshot()
+        requests_made = after["httpRequests"] - before["httpRequests"]
+        hits = after["httpCacheHits"] - before["httpCacheHits"]
+        written = None
+        if before["written"] is not None and after["written"] is not None:
+            written = after["written"] - before["written"]
+        metrics.update(
+            {
+                "wallSec": round(after["wall"] - before["wall"], 3),
+                "cpuSec": round(after["cpu"] - before["cpu"], 3),
+                "peakRssMb": _peak_rss_mb(),
+                "sessionLoads": after["sessionLoads"] - before["sessionLoads"],
+                "httpRequests": requests_made,
+                "httpCacheHits": hits,
+                "cacheHitRate": round(hits / requests_made, 3) if requests_made else None,
+                "bytesWritten": written,
+            }
+        )
+
+
+def package_version(name: str) -> str | None:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def write_report(path: str | Path, steps: list[dict], **extra) -> None:
+    """Écrit le rapport JSON (schéma commun builders seuls / build_all)."""
+    payload = {
+        "generatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "fastf1Version": package_version("fastf1"),
+        **extra,
+        "steps": steps,
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def read_report(path: str | Path) -> dict | None:
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def reported(name: str):
+    """Décorateur du main() d'un builder : rapport JSON si F1_RUN_REPORT est défini."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            install_hooks()
+            path = os.environ.get(REPORT_ENV)
+            if not path:
+                return fn(*args, **kwargs)
+            metrics: dict = {"name": name, "ok": False}
+            try:
+                with instrument(name) as metrics:
+                    metrics["ok"] = False
+                    rc = fn(*args, **kwargs)
+                    metrics["ok"] = rc in (None, 0)
+                return rc
+            finally:
+                write_report(path, [metrics])
+
+        return wrapper
+
+    return decorator
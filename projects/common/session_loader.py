@@ -0,0 +1,80 @@
+"""Chargement concurrent de sessions FastF1 (pool de threads borné).
+
+Les builders bouclaient sur le calendrier et chargeaient les sessions une par
+une ; chaque chargement attend surtout le réseau / le cache disque. `load_many`
+répartit les appels sur au plus `max_workers` threads et capture l'erreur de
+chaque élément au lieu d'interrompre le lot :
+
+    loaded = load_sessions([(2026, 1, "R"), (2026, 1, "S"), (2026, 2, "R")])
+    for key, item in loaded.items():
+        if item.ok:
+            ...item.value...
+
+Le plafond par défaut vient de la variable d'environnement F1_LOAD_WORKERS
+(4 sinon) ; 1 = chargement séquentiel dans le thread courant.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterable
+
+WORKERS_ENV = "F1_LOAD_WORKERS"
+DEFAULT_WORKERS = 4
+
+
+@dataclass
+class Loaded:
+    """Résultat d'un élément : valeur, ou erreur capturée."""
+
+    key: Hashable
+    value: Any = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def default_workers() -> int:
+    try:
+        return max(1, int(os.environ.get(WORKERS_ENV, DEFAULT_WORKERS)))
+    except ValueError:
+        return DEFAULT_WORKERS
+
+
+def _call(loader: Callable[..., Any], key: Hashable) -> Loaded:
+    try:
+        args = key if isinstance(key, tuple) else (key,)
+        return Loaded(key, value=loader(*args))
+    except Exception as e:
+        return Loaded(key, error=e)
+
+
+def load_many(
+    keys: Iterable[Hashable],
+    loader: Callable[..., Any],
+    max_workers: int | None = None,
+) -> dict[Hashable, Loaded]:
+    """Appelle `loader(*key)` pour chaque clé, `max_workers` en parallèle au plus.
+
+    Retourne {clé: Loaded} dans l'ordre des clés (doublons chargés une fois).
+    """
+    keys = list(dict.fromkeys(keys))
+    workers = max_workers or default_workers()
+    if workers <= 1 or len(keys) <= 1:
+        return {key: _call(loader, key) for key in keys}
+    with ThreadPoolExecutor(max_workers=min(workers, len(keys))) as pool:
+        results = list(pool.map(lambda key: _call(loader, key), keys))
+    return {item.key: item for item in results}
+
+
+def load_sessions(
+    keys: Iterable[tuple[int, int, str]], max_workers: int | None = None
+) -> dict[tuple[int, int, str], Loaded]:
+    """Résultats de sessions (saison, round, code) via le store partagé."""
+    from projects.common.results_store import load_results  # import circulaire sinon
+
+    return load_many(keys, load_results, max_workers=max_workers)
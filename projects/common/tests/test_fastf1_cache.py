@@ -0,0 +1,55 @@
+"""Tests du cache FastF1 partagé (éviction LRU, stats, activation unique)."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from projects.common import fastf1_cache as fc
+
+
+def _session(root: Path, season: str, event: str, name: str, size: int, used: float) -> Path:
+    d = root / season / event / name
+    d.mkdir(parents=True)
+    f = d / "timing_app_data.ff1pkl"
+    f.write_bytes(b"x" * size)
+    os.utime(f, (used, used))
+    return d
+
+
+def test_evict_removes_least_recently_used_sessions(tmp_path: Path) -> None:
+    old = _session(tmp_path, "2024", "2024-03-02_Bahrain", "2024-03-02_Race", 400, 1_000)
+    mid = _session(tmp_path, "2025", "2025-03-16_Australia", "2025-03-16_Race", 400, 2_000)
+    new = _session(tmp_path, "2026", "2026-03-08_Australia", "2026-03-08_Race", 400, 3_000)
+    (tmp_path / fc.HTTP_CACHE_NAME).write_bytes(b"h" * 100)
+
+    evicted = fc.evict(tmp_path, max_bytes=800)
+
+    assert [e.path for e in evicted] == [old, mid]
+    assert not old.parent.exists()  # dossier GP vide supprimé
+    assert new.exists()
+    assert (tmp_path / fc.HTTP_CACHE_NAME).exists()  # cache HTTP jamais évincé
+    assert fc.evict(tmp_path, max_bytes=800) == []
+
+
+def test_stats_by_season(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv(fc.MAX_MB_ENV, "5")
+    _session(tmp_path, "2025", "2025-03-16_Australia", "2025-03-16_Race", 1_000_000, 1_000)
+    _session(tmp_path, "2026", "2026-03-08_Australia", "2026-03-07_Qualifying", 500_000, 2_000)
+    s = fc.stats(tmp_path)
+    assert s["sessions"] == 2
+    assert s["maxMb"] == 5
+    assert s["bySeasonMb"] == {"2025": 1.0, "2026": 0.5}
+    assert "2026 : 0.5 Mo" in fc.format_stats(s)
+
+
+def test_enable_cache_is_idempotent(tmp_path: Path, monkeypatch) -> None:
+    calls: list[str] = []
+    monkeypatch.setattr(fc.fastf1.Cache, "enable_cache", lambda path: calls.append(path))
+    monkeypatch.setattr(fc, "_enabled", None)
+    monkeypatch.setenv(fc.CACHE_ENV, str(tmp_path / "ff1"))
+
+    assert fc.enable_cache() == tmp_path / "ff1"
+    fc.enable_cache()
+    assert calls == [str(tmp_path / "ff1")]
+    assert (tmp_path / "ff1").is_dir()
@@ -0,0 +1,119 @@
+"""Tests du moteur de duels coéquipiers (pairings, changements de pilote, courses)."""
+
+from __future__ import annotations
+
+from projects.common.head_to_head import QUALIFYING, RACE, HeadToHead
+
+
+def _quali(name: str, team: str, best: float | None, pos: int, q3: bool = False) -> dict:
+    return {
+        "fullName": name,
+        "team": team,
+        "position": pos,
+        "bestTimeSec": best,
+        "bestTimeStr": None if best is None else f"{best:.3f}",
+        "q3": q3,
+    }
+
+
+def _session(rnd: int, stype: str, drivers: list[dict]) -> dict:
+    return {
+        "round": rnd,
+        "gp": f"GP {rnd}",
+        "shortName": f"R{rnd}",
+        "type": stype,
+        "drivers": drivers,
+    }
+
+
+# Red Bull remplace Lawson par Tsunoda au round 3 ; round 2 sans temps pour Verstappen
+SESSIONS = [
+    _session(
+        1,
+        "Q",
+        [
+            _quali("Max Verstappen", "Red Bull", 80.1, 1, q3=True),
+            _quali("Liam Lawson", "Red Bull", 80.9, 8, q3=True),
+            _quali("Lando Norris", "McLaren", 80.3, 2, q3=True),
+        ],
+    ),
+    _session(
+        2,
+        "SQ",
+        [
+            _quali("Liam Lawson", "Red Bull", 81.0, 5),
+            _quali("Max Verstappen", "Red Bull", None, 20),
+        ],
+    ),
+    _session(
+        3,
+        "Q",
+        [
+            _quali("Yuki Tsunoda", "Red Bull", 79.8, 1, q3=True),
+            _quali("Max Verstappen", "Red Bull", 79.9, 2, q3=True),
+        ],
+    ),
+]
+
+
+def test_driver_swap_opens_new_pairing() -> None:
+    teams = HeadToHead(QUALIFYING).extend(SESSIONS).to_json()
+    assert [(t["team"], t["drivers"]) for t in teams] == [
+        ("Red Bull", ["Liam Lawson", "Max Verstappen"]),
+        ("Red Bull", ["Max Verstappen", "Yuki Tsunoda"]),
+        ("McLaren", ["Lando Norris"]),  # seul pilote aligné : publié tel quel
+    ]
+    first, second, _ = teams
+    assert first["h2h"] == {"Q": {"Max Verstappen": 1}, "SQ": {}}
+    assert first["q3Count"] == {"Max Verstappen": 1, "Liam Lawson": 1}
+    assert [s["round"] for s in first["sessions"]] == [1]  # round 2 : pas de temps
+    assert first["sessions"][0]["gapSec"] == 0.8
+    assert second["h2h"]["Q"] == {"Yuki Tsunoda": 1}
+    assert second["sessions"][0]["timeA"] == "79.900"  # A = Verstappen (ordre alpha)
+
+
+def test_incremental_matches_batch() -> None:
+    h2h = HeadToHead(QUALIFYING).extend(SESSIONS[:2])
+    h2h.add_session(SESSIONS[2], SESSIONS[2]["drivers"])
+    assert h2h.to_json() == HeadToHead(QUALIFYING).extend(SESSIONS).to_json()
+
+
+def test_lone_driver_session_counts_in_pair() -> None:
+    alone = _session(1, "Q", [_quali("Max Verstappen", "Red Bull", 80.1, 1, q3=True)])
+    both = _session(
+        2,
+        "Q",
+        [
+            _quali("Max Verstappen", "Red Bull", 80.0, 1, q3=True),
+            _quali("Liam Lawson", "Red Bull", 80.4, 6, q3=True),
+        ],
+    )
+    later = _session(3, "Q", [_quali("Liam Lawson", "Red Bull", 81.0, 4, q3=True)])
+    (pair,) = HeadToHead(QUALIFYING).extend([alone, both, later]).to_json()
+    assert pair["drivers"] == ["Liam Lawson", "Max Verstappen"]
+    assert pair["q3Count"] == {"Max Verstappen": 2, "Liam Lawson": 2}
+    assert pair["h2h"]["Q"] == {"Max Verstappen": 1}
+
+
+def test_race_duels_compare_positions() -> None:
+    race = _session(
+        1,
+        "R",
+        [
+            {"fullName": "Lewis Hamilton", "team": "Ferrari", "position": 4, "points": 12},
+            {"fullName": "Charles Leclerc", "team": "Ferrari", "position": 2, "points": 18},
+        ],
+    )
+    (ferrari,) = HeadToHead(RACE).extend([race]).to_json()
+    assert ferrari["h2h"] == {"R": {"Charles Leclerc": 1}, "S": {}}
+    assert ferrari["sessions"][0] == {
+        "round": 1,
+        "gp": "GP 1",
+        "shortName": "R1",
+        "type": "R",
+        "ahead": "Charles Leclerc",
+        "posA": 2,
+        "posB": 4,
+        "pointsA": 18,
+        "pointsB": 12,
+    }
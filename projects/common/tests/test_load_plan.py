@@ -0,0 +1,58 @@
+"""Tests du plan de chargement (sessions et niveaux de données d'après le calendrier)."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from projects.common import load_plan as lp
+
+
+def _event(round_no: int, sprint: bool, race_day: str) -> dict:
+    race = pd.Timestamp(f"{race_day} 05:00")
+    day = pd.Timedelta(days=1)
+    names = ["Practice 1", "Practice 2", "Practice 3", "Qualifying", "Race"]
+    if sprint:
+        names = ["Practice 1", "Sprint Qualifying", "Sprint", "Qualifying", "Race"]
+    dates = [race - 2 * day, race - 2 * day, race - day, race - day, race]
+    event = {
+        "RoundNumber": round_no,
+        "EventFormat": "sprint_qualifying" if sprint else "conventional",
+    }
+    for i, (name, date) in enumerate(zip(names, dates), start=1):
+        event[f"Session{i}"] = name
+        event[f"Session{i}DateUtc"] = date
+    return event
+
+
+SCHEDULE = pd.DataFrame(
+    [_event(1, False, "2026-03-08"), _event(2, True, "2026-03-15"), _event(3, False, "2026-03-29")]
+)
+AFTER_R2 = datetime(2026, 3, 20, tzinfo=timezone.utc)
+
+
+def test_plan_only_contains_played_sessions_on_the_programme() -> None:
+    plan = lp.plan_sessions(SCHEDULE, builders=["race_chart"], now=AFTER_R2)
+    # Pas de Sprint tenté sur un week-end classique, pas de GP futur
+    assert [(p.round, p.code) for p in plan] == [(1, "R"), (2, "S"), (2, "R")]
+    assert {p.tier for p in plan} == {"results"}
+
+
+def test_tiers_follow_builder_needs() -> None:
+    plan = lp.plan_sessions(SCHEDULE, builders=["qualifying"], now=AFTER_R2)
+    tiers = {(p.round, p.code): p.tier for p in plan}
+    assert tiers == {(1, "Q"): "results", (2, "SQ"): "laps", (2, "Q"): "results"}
+    assert lp.session_tier("SQ") == "laps"
+    assert lp.session_tier("R") == "results"
+
+
+def test_stored_sessions_cost_nothing() -> None:
+    plan = lp.plan_sessions(
+        SCHEDULE, builders=["heatmap"], now=AFTER_R2, is_stored=lambda r, c: r == 1
+    )
+    mb = lp.ESTIMATED_MB["results"]
+    assert [p.estimated_mb for p in plan] == [0.0, mb, mb]
+    text = lp.format_plan(plan, 2026)
+    assert "2 à télécharger" in text
+    assert "1 déjà stockée" in text
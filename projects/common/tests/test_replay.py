@@ -0,0 +1,51 @@
+"""Tests du rejeu hors ligne (horloge figée, manifeste, mode offline de FastF1)."""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from projects.common import clock, replay
+from projects.common import fastf1_cache as fc
+
+
+def test_clock_frozen_by_env(monkeypatch) -> None:
+    monkeypatch.setenv(clock.NOW_ENV, "2026-07-28T12:00:00")
+    assert clock.now() == datetime(2026, 7, 28, 12, tzinfo=timezone.utc)
+    assert clock.today() == date(2026, 7, 28)
+    monkeypatch.delenv(clock.NOW_ENV)
+    assert clock.now().tzinfo is not None
+
+
+def test_record_then_replay_freezes_clock(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv(clock.NOW_ENV, "2026-07-28T12:00:00+00:00")
+    rec = replay.record_env(tmp_path / "snap", 2026)
+    manifest = json.loads((tmp_path / "snap" / replay.MANIFEST).read_text(encoding="utf-8"))
+    assert manifest["season"] == 2026
+    assert rec[fc.CACHE_ENV] == str(tmp_path / "snap")
+    assert fc.OFFLINE_ENV not in rec
+
+    env = replay.replay_env(tmp_path / "snap")
+    assert env[fc.OFFLINE_ENV] == "1"
+    assert env[clock.NOW_ENV] == "2026-07-28T12:00:00+00:00"
+
+
+def test_replay_without_manifest_and_missing_dir(tmp_path: Path) -> None:
+    assert clock.NOW_ENV not in replay.replay_env(tmp_path)
+    with pytest.raises(FileNotFoundError):
+        replay.replay_env(tmp_path / "absent")
+
+
+def test_enable_cache_offline(tmp_path: Path, monkeypatch) -> None:
+    calls: list[bool] = []
+    monkeypatch.setattr(fc.fastf1.Cache, "enable_cache", lambda path: None)
+    monkeypatch.setattr(fc.fastf1.Cache, "offline_mode", lambda enabled: calls.append(enabled))
+    monkeypatch.setattr(fc, "_enabled", None)
+    monkeypatch.setenv(fc.CACHE_ENV, str(tmp_path))
+    monkeypatch.setenv(fc.OFFLINE_ENV, "1")
+
+    fc.enable_cache()
+    assert calls == [True]
@@ -0,0 +1,166 @@
+"""Tests du store partagé des résultats de session (sans réseau)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from projects.common import results_store as rs
+
+
+def _fastf1_like_results() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "DriverNumber": ["1", "4"],
+            "Abbreviation": ["VER", "NOR"],
+            "FirstName": ["Max", "Lando"],
+            "LastName": ["Verstappen", "Norris"],
+            "FullName": ["Max Verstappen", "Lando Norris"],
+            "TeamName": ["Red Bull Racing", "McLaren"],
+            "HeadshotUrl": [None, "https://img/nor.png"],
+            "Position": [1.0, 2.0],
+            "GridPosition": [2.0, 1.0],
+            "Points": [25.0, 18.0],
+            "Q1": [pd.Timedelta(seconds=80.5), pd.NaT],
+            "Extra": ["ignored", "ignored"],
+        }
+    )
+
+
+def test_round_trip_keeps_types(tmp_path: Path) -> None:
+    df = rs.normalise_results(_fastf1_like_results())
+    path = rs.write_results(2026, 3, "R", df, store_dir=tmp_path)
+    assert path == tmp_path / "2026" / "r03_R.csv"
+
+    back = rs.read_results(2026, 3, "R", store_dir=tmp_path)
+    assert list(back.columns) == rs.COLUMNS
+    assert back["Points"].tolist() == [25.0, 18.0]
+    # Chaînes vides (et non NaN) pour les champs texte absents
+    assert back.loc[0, "HeadshotUrl"] == ""
+    assert back.loc[0, "Status"] == ""
+    # Temps restitués en Timedelta, comme FastF1
+    assert back.loc[0, "Q1"] == pd.Timedelta(seconds=80.5)
+    assert pd.isna(back.loc[1, "Q1"])
+    assert rs.read_results(2026, 4, "R", store_dir=tmp_path) is None
+
+
+def test_best_laps_are_mapped_by_abbreviation(tmp_path: Path) -> None:
+    df = rs.normalise_results(_fastf1_like_results(), best_laps={"NOR": 91.25})
+    rs.write_results(2026, 2, "SQ", df, store_dir=tmp_path)
+    back = rs.read_results(2026, 2, "SQ", store_dir=tmp_path)
+    assert back.loc[1, "BestLapTime"] == pd.Timedelta(seconds=91.25)
+    assert pd.isna(back.loc[0, "BestLapTime"])
+
+
+def test_load_results_reads_through_once(tmp_path: Path, monkeypatch) -> None:
+    calls: list[tuple] = []
+
+    def fake_fetch(season, round_no, session):
+        calls.append((season, round_no, session))
+        return rs.normalise_results(_fastf1_like_results())
+
+    monkeypatch.setattr(rs, "fetch_session_results", fake_fetch)
+    first = rs.load_results(2026, 1, "R", store_dir=tmp_path)
+    second = rs.load_results(2026, 1, "R", store_dir=tmp_path)
+    assert calls == [(2026, 1, "R")]
+    pd.testing.assert_frame_equal(first, second)
+
+    rs.load_results(2026, 1, "R", store_dir=tmp_path, refresh=True)
+    assert len(calls) == 2
+
+
+def _laps() -> pd.DataFrame:
+    s = pd.to_timedelta
+    return pd.DataFrame(
+        {
+            "Driver": ["VER", "VER", "VER", "NOR", "NOR", "PIA"],
+            "LapTime": s([92.4, 91.1, 90.8, 91.3, None, 95.0], unit="s"),
+            # Tour de 90.8 supprimé (limites de piste) : non retenu
+            "IsPersonalBest": [True, True, False, True, False, False],
+            "Deleted": [False, False, True, False, False, False],
+        }
+    )
+
+
+def test_best_lap_times_matches_pick_fastest() -> None:
+    from fastf1.core import Laps
+
+    laps = Laps(_laps())
+    expected = {}
+    for drv, grp in laps.groupby("Driver"):
+        fastest = grp.pick_fastest()
+        if fastest is not None and not pd.isna(fastest.get("LapTime")):
+            expected[str(drv)] = float(fastest["LapTime"].total_seconds())
+    assert rs.best_lap_times(laps) == expected == {"VER": 91.1, "NOR": 91.3}
+    assert rs.best_lap_times(pd.DataFrame(columns=["Driver", "LapTime"])) == {}
+
+
+RCM_DELETED = "CAR 1 (VER) TIME 1:30.800 DELETED - TRACK LIMITS AT TURN 4 LAP 3 14:02:11"
+
+
+def broken_messages(path):
+    raise ValueError("messages absents")
+
+
+def test_deleted_laps_from_race_control() -> None:
+    deleted = "CAR 4 (NOR) TIME 1:31.300 DELETED - TRACK LIMITS AT TURN 9 LAP 5 14:10:02"
+    reinstated = "CAR 4 (NOR) TIME 1:31.300 (DELETED AT 14:10) REINSTATED FOR LAP 5"
+    messages = [RCM_DELETED, deleted]
+    assert rs.deleted_laps(messages) == {("1", 90.8), ("4", 91.3)}
+    assert rs.deleted_laps([*messages, reinstated]) == {("1", 90.8)}
+
+
+def test_best_lap_times_skips_inaccurate_laps() -> None:
+    laps = _laps().assign(IsAccurate=[True, False, True, True, True, True])
+    assert rs.best_lap_times(laps) == {"VER": 92.4, "NOR": 91.3}
+
+
+class _FakeSession:
+    api_path = "/static/2026/sq/"
+
+    def __init__(self) -> None:
+        self.loads: list[dict] = []
+        self.results = _fastf1_like_results()
+        self.laps = _laps()
+
+    def load(self, **kwargs) -> None:
+        self.loads.append(kwargs)
+
+
+def test_sprint_qualifying_reads_timing_only(monkeypatch) -> None:
+    from fastf1 import api
+
+    ses = _FakeSession()
+    # Flux brut : ni Deleted ni IsAccurate, le 90.8 de VER reste marqué PB
+    timing = (
+        _laps()
+        .drop(columns="Deleted")
+        .assign(Driver=["1", "1", "1", "4", "4", "81"], IsPersonalBest=True)
+    )
+    messages = {"Message": [RCM_DELETED, "GREEN LIGHT - PIT EXIT OPEN"]}
+    monkeypatch.setattr(rs, "enable_cache", lambda: None)
+    monkeypatch.setattr(rs.fastf1, "get_session", lambda *a: ses)
+    monkeypatch.setattr(api, "timing_data", lambda path: (timing, None))
+    monkeypatch.setattr(api, "race_control_messages", lambda path: messages)
+
+    df = rs.fetch_session_results(2026, 2, "SQ")
+    assert ses.loads == [rs.LOAD_KWARGS["results"]]  # pas d'objet Laps construit
+    assert df["BestLapTime"].tolist() == [91.1, 91.3]
+
+    # Messages indisponibles : suppressions invérifiables, chargement complet
+    monkeypatch.setattr(api, "race_control_messages", broken_messages)
+    ses.loads.clear()
+    df = rs.fetch_session_results(2026, 2, "SQ")
+    assert ses.loads == [rs.LOAD_KWARGS["results"], rs.LOAD_KWARGS["laps"]]
+    assert rs.LOAD_KWARGS["laps"]["messages"]
+    assert df["BestLapTime"].tolist() == [91.1, 91.3]
+
+    def broken(path):
+        raise ValueError("flux absent")
+
+    ses.loads.clear()
+    monkeypatch.setattr(api, "timing_data", broken)
+    df = rs.fetch_session_results(2026, 2, "SQ")
+    assert ses.loads == [rs.LOAD_KWARGS["results"], rs.LOAD_KWARGS["laps"]]
+    assert df["BestLapTime"].tolist() == [91.1, 91.3]
@@ -0,0 +1,49 @@
+"""Tests des noyaux incrémentaux, comparés aux équivalents pandas."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from projects.common.rolling_stats import (
+    CumulativeRate,
+    RunningMean,
+    RunningMedian,
+    RunningSum,
+    WindowMean,
+)
+
+rng = np.random.default_rng(7)
+VALUES = pd.Series(rng.integers(1, 21, 200).astype(float))
+VALUES[rng.random(200) < 0.15] = np.nan
+
+
+def _stream(kernel, values: pd.Series) -> np.ndarray:
+    return np.array([kernel.push(x) for x in values])
+
+
+def test_running_kernels_match_pandas() -> None:
+    np.testing.assert_allclose(
+        _stream(RunningMean(), VALUES), VALUES.expanding().mean(), equal_nan=True
+    )
+    np.testing.assert_allclose(
+        _stream(RunningMedian(), VALUES), VALUES.expanding().median(), equal_nan=True
+    )
+    np.testing.assert_allclose(
+        _stream(WindowMean(5), VALUES),
+        VALUES.rolling(window=5, min_periods=1).mean(),
+        equal_nan=True,
+    )
+    np.testing.assert_allclose(_stream(RunningSum(), VALUES), VALUES.cumsum(), equal_nan=True)
+
+
+def test_cumulative_rate_counts_missing_steps() -> None:
+    podium = (VALUES <= 3).astype(float).where(VALUES.notna())
+    expected = podium.cumsum() / np.arange(1, len(VALUES) + 1)
+    np.testing.assert_allclose(_stream(CumulativeRate(), podium), expected, equal_nan=True)
+
+
+def test_running_median_small_cases() -> None:
+    median = RunningMedian()
+    assert np.isnan(median.value)
+    assert [median.push(x) for x in (3, 1, 2, 10)] == [3.0, 2.0, 2.0, 2.5]
@@ -0,0 +1,74 @@
+"""Tests de l'instrumentation des builders (compteurs HTTP, rapport JSON).
+
+Aucun appel réseau : les requêtes passent par un adapter requests factice.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import requests
+
+from projects.common import run_report as rr
+
+
+class _FakeAdapter(requests.adapters.BaseAdapter):
+    def send(self, request, **kwargs):
+        resp = requests.Response()
+        resp.status_code = 200
+        resp._content = b"{}"
+        resp.url = request.url
+        resp.request = request
+        return resp
+
+    def close(self) -> None:
+        pass
+
+
+def test_instrument_counts_http_requests() -> None:
+    session = requests.Session()
+    session.mount("http://", _FakeAdapter())
+    with rr.instrument("fetch") as m:
+        session.get("http://example.test/a")
+        session.get("http://example.test/b")
+    assert m["httpRequests"] == 2
+    assert m["httpCacheHits"] == 0
+    assert m["cacheHitRate"] == 0.0
+    assert m["sessionLoads"] == 0
+    assert m["wallSec"] >= 0 and m["cpuSec"] >= 0
+
+
+def test_instrument_without_requests_has_no_hit_rate() -> None:
+    with rr.instrument("idle") as m:
+        pass
+    assert m["httpRequests"] == 0
+    assert m["cacheHitRate"] is None
+
+
+def test_reported_writes_report_when_env_is_set(tmp_path: Path, monkeypatch) -> None:
+    report = tmp_path / "report.json"
+    monkeypatch.setenv(rr.REPORT_ENV, str(report))
+
+    @rr.reported("fake_builder")
+    def main() -> int:
+        (tmp_path / "out.txt").write_text("x" * 100, encoding="utf-8")
+        return 0
+
+    assert main() == 0
+    data = json.loads(report.read_text(encoding="utf-8"))
+    step = data["steps"][0]
+    assert step["name"] == "fake_builder"
+    assert step["ok"] is True
+    assert {"wallSec", "cpuSec", "peakRssMb", "bytesWritten"} <= step.keys()
+
+
+def test_reported_is_transparent_without_env(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv(rr.REPORT_ENV, raising=False)
+
+    @rr.reported("fake_builder")
+    def main(argv=None) -> int:
+        return 3
+
+    assert main([]) == 3
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,50 @@
+"""Tests du chargeur concurrent (ordre, plafond de threads, erreurs capturées)."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from projects.common import session_loader as sl
+
+
+def test_results_keep_key_order_and_capture_errors() -> None:
+    def loader(season: int, round_no: int, code: str) -> str:
+        if round_no == 2:
+            raise ValueError("session absente")
+        time.sleep(0.01 * (5 - round_no))  # les derniers finissent en premier
+        return f"{season}-{round_no}-{code}"
+
+    keys = [(2026, r, "R") for r in range(1, 5)]
+    loaded = sl.load_many(keys, loader, max_workers=4)
+
+    assert list(loaded) == keys
+    assert loaded[(2026, 1, "R")].value == "2026-1-R"
+    assert not loaded[(2026, 2, "R")].ok
+    assert isinstance(loaded[(2026, 2, "R")].error, ValueError)
+    assert loaded[(2026, 4, "R")].ok
+
+
+def test_concurrency_is_capped() -> None:
+    lock = threading.Lock()
+    active = {"now": 0, "max": 0}
+
+    def loader(key: int) -> int:
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(0.02)
+        with lock:
+            active["now"] -= 1
+        return key
+
+    loaded = sl.load_many(range(8), loader, max_workers=3)
+    assert [item.value for item in loaded.values()] == list(range(8))
+    assert 1 < active["max"] <= 3
+
+
+def test_single_worker_runs_in_calling_thread(monkeypatch) -> None:
+    monkeypatch.setenv(sl.WORKERS_ENV, "1")
+    threads = []
+    sl.load_many(["a", "b"], lambda key: threads.append(threading.current_thread()))
+    assert threads == [threading.current_thread()] * 2
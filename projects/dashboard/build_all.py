@@ -4,14 +4,50 @@ Usage :
     python projects/dashboard/build_all.py
     python projects/dashboard/build_all.py --skip-fetch   # n'appelle pas FastF1
     python projects/dashboard/build_all.py --season 2026  # par défaut
+    python projects/dashboard/build_all.py --jobs 1       # tout en séquentiel
+    python projects/dashboard/build_all.py --in-process   # builders importés une fois (runners.py)
+    python projects/dashboard/build_all.py --startup-report  # coût de démarrage des 2 modes
+    python projects/dashboard/build_all.py --force        # ignore build_state.json
+    python projects/dashboard/build_all.py --report run.json  # rapport d'instrumentation
+    python projects/dashboard/build_all.py --dry-run      # sessions FastF1 prévues + volume estimé
+    python projects/dashboard/build_all.py --record DIR   # enregistre les réponses FastF1/Ergast
+    python projects/dashboard/build_all.py --replay DIR   # rejoue DIR sans réseau (déterministe)
+    python projects/dashboard/build_all.py --offline      # cache FastF1 courant, sans réseau
 
-Étapes exécutées dans l'ordre :
-    1. race_chart_builder_fastf1.py        → outputs/f1_race_chart_fastf1_<season>.csv
-    2. copie vers web/data/                (consommé par la viz)
-    3. lead_main.py (heatmap leaders)      → outputs/f1_<season>_leaders_heatmap.csv
-    4. copie vers d3_dataviz/              (consommé par la viz)
-    5. build_dashboard_data.py             → docs/data/dashboard_<season>.json
-    6. sync_to_docs.py × 3                 (race_chart, heatmap, dashboard)
+Chaque étape déclare ses entrées et ses sorties ; l'ordre d'exécution est
+déduit de ce graphe (voir pipeline.py) et les étapes indépendantes tournent
+en parallèle (--jobs workers) :
+
+    results_store.py (sessions FastF1, chargées une fois) → projects/common/data/results/<season>/
+      └─ lu par race chart, heatmap leaders et qualifs
+    race_chart_builder_fastf1.py  → outputs/f1_race_chart_fastf1_<season>.csv
+      └─ copie vers web/data/     (consommé par la viz, le dashboard et les qualifs)
+           ├─ build_dashboard_data.py   → docs/data/<season>/dashboard.json
+           ├─ build_qualifying_data.py  → docs/data/<season>/qualifying.json
+           └─ sync race_chart
+    lead_main.py (heatmaps, un chargement) → outputs/f1_<season>_leaders_heatmap.csv
+                                           + outputs/f1_<season>_full_heatmap.csv
+      └─ copie vers d3_dataviz/    → sync heatmap
+    dashboard + qualifying         → sync dashboard
+
+Build incrémental (build_state.py) : une étape dont les entrées (fichiers,
+script, modules Python qu'il importe, résultats FastF1 attendus) n'ont pas
+changé depuis son dernier succès n'est pas relancée. Un refresh "sans nouveauté" ne fait donc que hasher
+quelques fichiers ; --force relance tout.
+
+Chaque run écrit un rapport JSON (reports/run_report.json par défaut) : par
+étape, temps réel / CPU, pic RSS, chargements de sessions FastF1, requêtes
+HTTP et taux de hit du cache, octets écrits (voir projects/common/run_report.py).
+
+Rejeu hors ligne (projects/common/replay.py) : --replay lit toutes les réponses
+FastF1/Ergast depuis un enregistrement et fige l'horloge des builders à sa date.
+Deux rejeux du même enregistrement produisent les mêmes fichiers : de quoi
+mesurer le coût CPU sans bruit réseau (combiner avec --force pour tout relancer),
+ou rafraîchir quand les API amont sont en panne.
+
+Saisons (seasons.py) : une saison passée déjà publiée dans data/<season>/ est
+figée et n'est plus reconstruite (sauf --force) ; seule la saison en cours
+(CURRENT_SEASON, défaut de --season) est rafraîchie.
 
 Le calendrier (calendar_<season>.json) n'est pas régénéré ici — il évolue
 rarement, lance fetch_calendar.py manuellement si besoin.
@@ -20,24 +56,56 @@ rarement, lance fetch_calendar.py manuellement si besoin.
 from __future__ import annotations
 
 import argparse
+import json
+import os
 import shutil
-import subprocess
 import sys
+import tempfile
+import time
+from datetime import date, timedelta
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[2]
 PYTHON = sys.executable
 
+# Assure que la racine du repo est sur sys.path (pour importer projects.*)
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-def run_step(label: str, cmd: list[str], cwd: Path | None = None) -> bool:
-    print(f"\n>>> {label}")
-    print(f"    $ {' '.join(str(c) for c in cmd)}")
-    if cwd:
-        print(f"    cwd={cwd}")
-    result = subprocess.run(cmd, cwd=cwd)
-    ok = result.returncode == 0
-    print(f"    {'[OK]' if ok else f'[ECHEC code={result.returncode}]'}")
-    return ok
+from projects.common import clock  # noqa: E402
+from projects.common.run_report import (  # noqa: E402
+    REPORT_ENV,
+    instrument,
+    read_report,
+    write_report,
+)
+from projects.dashboard import seasons  # noqa: E402
+from projects.dashboard.build_state import BuildState  # noqa: E402
+from projects.dashboard.check_should_refresh import LOOKBACK_DAYS  # noqa: E402
+from projects.dashboard.pipeline import OK, SKIPPED, UNCHANGED, Step, run_graph  # noqa: E402
+from projects.dashboard.runners import (  # noqa: E402
+    format_startup_report,
+    locked_output,
+    measure_startup,
+    run_inprocess,
+    run_subprocess,
+)
+
+# Largeur maximale du graphe : race chart ∥ heatmap, puis dashboard ∥ qualifs ∥ sync
+DEFAULT_JOBS = 3
+DEFAULT_REPORT = ROOT / "projects" / "dashboard" / "reports" / "run_report.json"
+
+
+def code_inputs(script: Path) -> list[Path]:
+    """Modules du projet dont dépend un script builder (hashés avec ses entrées).
+
+    Tout projects/common, le package du script et seasons.py : un correctif de
+    logique mergé relance l'étape même si les données n'ont pas bougé.
+    """
+    packages = (ROOT / "projects" / "common", script.parent)
+    modules = [p for pkg in packages for p in sorted(pkg.glob("*.py"))]
+    modules.append(ROOT / "projects" / "dashboard" / "seasons.py")
+    return list(dict.fromkeys(modules))
 
 
 def copy_file(src: Path, dst: Path) -> None:
@@ -49,88 +117,324 @@ def copy_file(src: Path, dst: Path) -> None:
     print(f"    [COPY] {src.relative_to(ROOT)} -> {dst.relative_to(ROOT)}")
 
 
+def fastf1_fingerprint(calendar_path: Path, today: date | None = None) -> str:
+    """Empreinte des résultats FastF1 attendus, calculée sans appel réseau.
+
+    = liste des rounds terminés d'après le calendrier. Tant que le dernier GP
+    date de moins de LOOKBACK_DAYS jours, FastF1 peut encore propager des
+    résultats (d'où le filet de sécurité du mardi) : la date du jour entre
+    alors dans l'empreinte, ce qui force un nouveau fetch à chaque run.
+    """
+    today = today or clock.today()
+    try:
+        rounds = json.loads(calendar_path.read_text(encoding="utf-8")).get("rounds", [])
+    except (OSError, json.JSONDecodeError):
+        return f"no-calendar:{today.isoformat()}"
+    played = []
+    for r in rounds:
+        try:
+            gp_date = date.fromisoformat(r.get("date", ""))
+        except ValueError:
+            continue
+        if gp_date < today:
+            played.append((r.get("round"), gp_date))
+    key = ",".join(f"{rnd}@{d.isoformat()}" for rnd, d in played)
+    if played and today - played[-1][1] <= timedelta(days=LOOKBACK_DAYS):
+        key += f"|settling:{today.isoformat()}"
+    return key
+
+
+def run_measured_subprocess(label: str, cmd: list[str], cwd, capture: bool, metrics: dict) -> bool:
+    """Lance un builder en sous-processus et récupère son rapport (F1_RUN_REPORT).
+
+    `processWallSec` (mesuré ici) inclut le démarrage de l'interpréteur, que
+    le rapport du builder lui-même ne voit pas.
+    """
+    fd, tmp = tempfile.mkstemp(prefix="f1_step_", suffix=".json")
+    os.close(fd)
+    os.unlink(tmp)  # le builder crée le fichier ; absent = builder non instrumenté
+    try:
+        t0 = time.perf_counter()
+        ok = run_subprocess(
+            label, cmd, cwd=cwd, capture=capture, env={**os.environ, REPORT_ENV: tmp}
+        )
+        child = read_report(tmp) or {}
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+    metrics.update(next(iter(child.get("steps", [])), {}))
+    metrics["processWallSec"] = round(time.perf_counter() - t0, 3)
+    return ok
+
+
+def build_steps(
+    season: int,
+    capture: bool = False,
+    in_process: bool = False,
+    metrics: dict[str, dict] | None = None,
+) -> list[Step]:
+    """Déclare les étapes de la pipeline avec leurs entrées / sorties.
+
+    `in_process=True` : les builders sont importés une fois et leur `main()`
+    appelé dans le process courant (voir runners.py) au lieu d'un sous-processus.
+    `metrics` : dict rempli, par nom d'étape, avec les mesures de run_report.
+    """
+    metrics = {} if metrics is None else metrics
+    rc_root = ROOT / "projects" / "race_chart_builder"
+    hm_root = ROOT / "projects" / "season_summary_heatmap"
+    db_root = ROOT / "projects" / "dashboard"
+    common_root = ROOT / "projects" / "common"
+
+    driver_images = db_root / "driver_images.json"
+    calendar = seasons.calendar_path(season)
+    store = common_root / "data" / "results" / str(season)
+    rc_csv = rc_root / "outputs" / f"f1_race_chart_fastf1_{season}.csv"
+    rc_web_csv = seasons.race_chart_csv(season)
+    hm_csv = hm_root / "outputs" / f"f1_{season}_leaders_heatmap.csv"
+    hm_web_csv = hm_root / "d3_dataviz" / f"f1_{season}_leaders_heatmap.csv"
+    hm_full_csv = hm_root / "outputs" / f"f1_{season}_full_heatmap.csv"
+    dashboard_json, _ = seasons.output_paths(season, "dashboard")
+    qualifying_json, _ = seasons.output_paths(season, "qualifying")
+
+    def results() -> str:
+        return fastf1_fingerprint(calendar)
+
+    def script_step(
+        name: str, label: str, path: Path, *args: str, cwd=None, inputs=(), **kw
+    ) -> Step:
+        def action() -> bool:
+            m = metrics.setdefault(name, {})
+            if in_process:
+                with instrument(name) as measured:
+                    ok = run_inprocess(label, path, list(args), capture=capture)
+                m.update(measured)
+                return ok
+            cmd = [PYTHON, str(path), *args]
+            return run_measured_subprocess(label, cmd, cwd, capture, m)
+
+        inputs = [*inputs, *code_inputs(path)]
+        return Step(name, label, action, script=path, inputs=inputs, **kw)
+
+    def copy_step(name: str, label: str, src: Path, dst: Path) -> Step:
+        def action() -> bool:
+            with instrument(name) as measured, locked_output():
+                print(f"\n>>> {label}")
+                copy_file(src, dst)
+            metrics.setdefault(name, {}).update(measured)
+            return True
+
+        return Step(name, label, action, inputs=[src], outputs=[dst])
+
+    return [
+        script_step(
+            "results_store",
+            "results_store (sessions FastF1)",
+            common_root / "results_store.py",
+            "--season",
+            str(season),
+            inputs=[calendar],
+            outputs=[store],
+            fetch=True,
+            fingerprint=results,
+        ),
+        script_step(
+            "race_chart",
+            "race_chart_builder_fastf1",
+            rc_root / "race_chart_builder_fastf1.py",
+            "--season",
+            str(season),
+            "--incremental",
+            cwd=rc_root,
+            inputs=[driver_images, calendar, store],
+            outputs=[rc_csv],
+            fetch=True,
+        ),
+        copy_step("race_chart_copy", "copie race_chart CSV vers web/data/", rc_csv, rc_web_csv),
+        script_step(
+            "heatmap",
+            "lead_main (heatmaps leaders + complète)",
+            hm_root / "lead_main.py",
+            "--season",
+            str(season),
+            "--flavors",
+            "leaders,full",
+            "--incremental",
+            cwd=hm_root,
+            inputs=[driver_images, calendar, store],
+            outputs=[hm_csv, hm_full_csv],
+            fetch=True,
+        ),
+        copy_step("heatmap_copy", "copie heatmap CSV vers d3_dataviz/", hm_csv, hm_web_csv),
+        script_step(
+            "dashboard",
+            "build_dashboard_data",
+            db_root / "build_dashboard_data.py",
+            "--season",
+            str(season),
+            "--patch",
+            "--compact",
+            inputs=[rc_web_csv, calendar],
+            outputs=[dashboard_json],
+        ),
+        script_step(
+            "qualifying",
+            "build_qualifying_data",
+            db_root / "build_qualifying_data.py",
+            "--season",
+            str(season),
+            inputs=[rc_web_csv, calendar, store],
+            outputs=[qualifying_json],
+            fetch=True,
+        ),
+        script_step(
+            "race_chart_sync",
+            "race_chart sync",
+            rc_root / "sync_to_docs.py",
+            inputs=[rc_root / "web", rc_web_csv],
+            outputs=[ROOT / "docs" / "race_chart_builder"],
+        ),
+        script_step(
+            "heatmap_sync",
+            "heatmap sync",
+            hm_root / "sync_to_docs.py",
+            inputs=[hm_root / "d3_dataviz", hm_web_csv],
+            outputs=[ROOT / "docs" / "season_summary_heatmap"],
+        ),
+        script_step(
+            "dashboard_sync",
+            "dashboard sync",
+            db_root / "sync_to_docs.py",
+            inputs=[db_root / "web", dashboard_json, qualifying_json],
+            outputs=[ROOT / "docs"],
+        ),
+    ]
+
+
+def builder_scripts(steps: list[Step]) -> list[Path]:
+    """Scripts Python lancés par la pipeline (ordre de déclaration, sans doublon)."""
+    return list(dict.fromkeys(s.script for s in steps if s.script is not None))
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("--season", type=int, default=2026)
+    parser.add_argument("--season", type=int, default=seasons.CURRENT_SEASON)
     parser.add_argument(
         "--skip-fetch",
         action="store_true",
-        help="Saute les builders qui interrogent FastF1 (étapes 1 et 3)",
+        help="Saute les builders qui interrogent FastF1 (race chart, heatmap, qualifs)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Nombre d'étapes lancées en parallèle (défaut : {DEFAULT_JOBS})",
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Importe chaque builder une fois et appelle son main() (pas de sous-processus)",
+    )
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="Mesure le coût de démarrage des builders (subprocess vs in-process) et quitte",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Relance toutes les étapes, même si leurs entrées n'ont pas changé",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        default=DEFAULT_REPORT,
+        help="Chemin du rapport JSON d'instrumentation (défaut : reports/run_report.json)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Affiche les sessions FastF1 à charger et le volume estimé, puis quitte",
+    )
+    network = parser.add_mutually_exclusive_group()
+    network.add_argument(
+        "--record",
+        type=Path,
+        metavar="DIR",
+        help="Utilise DIR comme cache FastF1 (sans éviction) et y écrit replay.json",
+    )
+    network.add_argument(
+        "--replay",
+        type=Path,
+        metavar="DIR",
+        help="Rejoue l'enregistrement DIR sans réseau, horloge figée à sa date",
+    )
+    network.add_argument(
+        "--offline",
+        action="store_true",
+        help="Aucun accès réseau : FastF1 ne lit que son cache courant",
     )
     args = parser.parse_args()
-    season = args.season
 
-    rc_root = ROOT / "projects" / "race_chart_builder"
-    hm_root = ROOT / "projects" / "season_summary_heatmap"
-    db_root = ROOT / "projects" / "dashboard"
+    # Avant tout import de builder : les réglages sont relus par enable_cache()
+    # et hérités par les sous-process.
+    if args.record or args.replay or args.offline:
+        from projects.common import replay
 
-    # 1) Race chart : fetch + génération CSV brut
-    if not args.skip_fetch:
-        ok = run_step(
-            "1/6 race_chart_builder_fastf1",
-            [PYTHON, str(rc_root / "race_chart_builder_fastf1.py"), "--season", str(season)],
-            cwd=rc_root,
-        )
-        if not ok:
+        try:
+            if args.record:
+                env = replay.record_env(args.record, args.season)
+            elif args.replay:
+                env = replay.replay_env(args.replay)
+            else:
+                env = replay.offline_env()
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[ERREUR] {e}", file=sys.stderr)
             return 1
-    else:
-        print("\n>>> 1/6 race_chart_builder_fastf1 (sauté via --skip-fetch)")
-
-    # 2) Copie vers web/data/
-    print("\n>>> 2/6 copie race_chart CSV vers web/data/")
-    copy_file(
-        rc_root / "outputs" / f"f1_race_chart_fastf1_{season}.csv",
-        rc_root / "web" / "data" / f"f1_race_chart_fastf1_{season}.csv",
-    )
+        os.environ.update(env)
+        print("[INFO] " + ", ".join(f"{k}={v}" for k, v in sorted(env.items())))
 
-    # 3) Heatmap : fetch + génération CSV leaders
-    if not args.skip_fetch:
-        ok = run_step(
-            "3/6 lead_main (heatmap leaders)",
-            [PYTHON, str(hm_root / "lead_main.py"), "--season", str(season)],
-            cwd=hm_root,
-        )
-        if not ok:
+    if args.dry_run:
+        # Import tardif : fastf1 n'est chargé que pour lire le calendrier
+        from projects.common.results_store import season_plan
+
+        try:
+            print(season_plan(args.season))
+        except Exception as e:
+            print(f"[ERREUR] Calendrier FastF1 indisponible : {e}", file=sys.stderr)
             return 1
-    else:
-        print("\n>>> 3/6 lead_main (sauté via --skip-fetch)")
-
-    # 4) Copie vers d3_dataviz/
-    print("\n>>> 4/6 copie heatmap CSV vers d3_dataviz/")
-    copy_file(
-        hm_root / "outputs" / f"f1_{season}_leaders_heatmap.csv",
-        hm_root / "d3_dataviz" / f"f1_{season}_leaders_heatmap.csv",
-    )
+        return 0
+
+    if seasons.is_frozen(args.season) and not args.force and not args.startup_report:
+        print(f"[SKIP] Saison {args.season} figée (archive publiée) : rien à reconstruire")
+        return 0
 
-    # 5) Dashboard JSON
-    ok = run_step(
-        "5/6 build_dashboard_data",
-        [PYTHON, str(db_root / "build_dashboard_data.py")],
+    metrics: dict[str, dict] = {}
+    steps = build_steps(
+        args.season, capture=args.jobs > 1, in_process=args.in_process, metrics=metrics
     )
-    if not ok:
-        return 1
+    if args.startup_report:
+        print(format_startup_report(measure_startup(builder_scripts(steps))))
+        return 0
 
-    # 5b) Qualifying JSON (duels coéquipiers)
-    if not args.skip_fetch:
-        ok = run_step(
-            "5b/6 build_qualifying_data",
-            [PYTHON, str(db_root / "build_qualifying_data.py")],
-        )
-        if not ok:
-            return 1
-    else:
-        print("\n>>> 5b/6 build_qualifying_data (sauté via --skip-fetch)")
-
-    # 6) Sync vers docs/ (les 3 projets)
-    for label, script in [
-        ("race_chart sync", rc_root / "sync_to_docs.py"),
-        ("heatmap sync", hm_root / "sync_to_docs.py"),
-        ("dashboard sync", db_root / "sync_to_docs.py"),
-    ]:
-        ok = run_step(f"6/6 {label}", [PYTHON, str(script)])
-        if not ok:
-            return 1
+    skip = {s.name for s in steps if s.fetch} if args.skip_fetch else set()
+    state = BuildState(force=args.force)
+    t0 = time.perf_counter()
+    status = run_graph(steps, jobs=args.jobs, skip=skip, state=state)
+    state.save()
+    write_report(
+        args.report,
+        [{**metrics.get(s.name, {}), "name": s.name, "status": status.get(s.name)} for s in steps],
+        season=args.season,
+        mode="in-process" if args.in_process else "subprocess",
+        jobs=args.jobs,
+        totalWallSec=round(time.perf_counter() - t0, 3),
+    )
+    print(f"\n[INFO] Rapport d'instrumentation : {args.report}")
 
+    if any(st not in (OK, SKIPPED, UNCHANGED) for st in status.values()):
+        failed = [name for name, st in status.items() if st not in (OK, SKIPPED, UNCHANGED)]
+        print(f"\n[ECHEC] Pipeline interrompue : {', '.join(failed)}", file=sys.stderr)
+        return 1
     print("\n[OK] Pipeline complète.")
     return 0
 
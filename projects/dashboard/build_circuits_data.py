@@ -1,30 +1,49 @@
-"""Construit circuits_2026.json : fiche par circuit pour le drill-down calendrier.
+"""Construit circuits.json d'une saison : fiche par circuit pour le drill-down calendrier.
 
-Pour chaque GP du calendrier 2026 :
+Pour chaque GP du calendrier de la saison :
     - tracé du circuit (télémétrie du meilleur tour d'une saison réelle récente),
     - longueur, nombre de virages, nombre de tours,
     - meilleur tour de la saison source (pilote + temps),
-    - vainqueurs des 3 dernières saisons (2023-2025).
+    - vainqueurs des 3 saisons précédentes (2023-2025 pour 2026).
 
 ⚠️ Builder LENT (chargement télémétrie de ~22 circuits). À lancer
 MANUELLEMENT, pas dans le workflow auto :
     python projects/dashboard/build_circuits_data.py
+    python projects/dashboard/build_circuits_data.py --season 2025
+    python projects/dashboard/build_circuits_data.py --processes 8   # 8 circuits à la fois
+    python projects/dashboard/build_circuits_data.py --resume        # reprend un run interrompu
+
+Un circuit par process (pool de `--processes`, parsing télémétrie surtout
+CPU). Chaque fiche terminée est écrite (atomiquement) comme checkpoint :
+
+    projects/dashboard/checkpoints/circuits/<season>/r<round:02d>.json
+
+circuits.json est ensuite assemblé depuis les checkpoints — et n'est pas
+réécrit si un circuit a échoué (le fichier publié reste complet). Avec --resume,
+seuls les circuits sans checkpoint, invalidés (entrée du calendrier, saisons
+d'historique ou format changés) ou incomplets (tracé non chargé alors que le
+circuit a un historique) sont reconstruits ; sans --resume, tout l'est.
 
 Les tracés et l'historique ne changent quasi jamais : un run en début de
-saison suffit. Le vainqueur 2026 d'un GP est pris côté front depuis le
-dashboard JSON (calendar[].winner), pas ici.
+saison suffit. Le vainqueur de la saison affichée est pris côté front depuis
+le dashboard JSON (calendar[].winner), pas ici.
 
-Sorties :
-    projects/dashboard/web/data/circuits_2026.json
-    docs/data/circuits_2026.json
+Sorties (chemins par saison : voir seasons.py) :
+    projects/dashboard/web/data/<season>/circuits.json
+    docs/data/<season>/circuits.json
 """
 
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
+import os
 import sys
-from datetime import date
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from typing import Callable
 
 import fastf1
 import numpy as np
@@ -32,18 +51,33 @@ import pandas as pd
 
 HERE = Path(__file__).resolve().parent
 ROOT = HERE.parents[1]
-CALENDAR_PATH = HERE / "calendar_2026.json"
-OUT_WEB = HERE / "web" / "data" / "circuits_2026.json"
-OUT_DOCS = ROOT / "docs" / "data" / "circuits_2026.json"
 
-SEASON = 2026
-# Saisons réelles d'où l'on tire le tracé et l'historique (la plus récente d'abord)
-HISTORY_YEARS = [2025, 2024, 2023]
+# Racine du repo sur sys.path (pour importer projects.common quand lancé en script)
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from projects.common import clock  # noqa: E402
+from projects.common.fastf1_cache import enable_cache  # noqa: E402
+from projects.common.run_report import reported  # noqa: E402
+from projects.dashboard import seasons  # noqa: E402
+
+# Nombre de saisons réelles d'où l'on tire le tracé et l'historique
+HISTORY_DEPTH = 3
 TRACK_POINTS = 120  # sous-échantillonnage du tracé
 
+CHECKPOINT_DIR = HERE / "checkpoints" / "circuits"
+# À incrémenter quand le contenu d'une fiche change : invalide tous les checkpoints
+CHECKPOINT_VERSION = 1
+DEFAULT_PROCESSES = 4
 
-def load_calendar() -> dict:
-    return json.loads(CALENDAR_PATH.read_text(encoding="utf-8"))
+
+def history_years(season: int) -> list[int]:
+    """Saisons précédant `season`, la plus récente d'abord (2026 → 2025, 2024, 2023)."""
+    return [season - k for k in range(1, HISTORY_DEPTH + 1)]
+
+
+def load_calendar(season: int) -> dict:
+    return json.loads(seasons.calendar_path(season).read_text(encoding="utf-8"))
 
 
 def format_lap(seconds: float | None) -> str | None:
@@ -161,7 +195,7 @@ def winner_for(year: int, gp_name: str) -> dict | None:
     }
 
 
-def build_circuit(gp: dict) -> dict:
+def build_circuit(gp: dict, years: list[int]) -> dict:
     name = gp["name"]
     print(f"  - {gp['shortName']} ({name})")
 
@@ -174,12 +208,12 @@ def build_circuit(gp: dict) -> dict:
     winners = []
     if fastf1_name:
         # Tracé : première saison réelle qui répond
-        for yr in HISTORY_YEARS:
+        for yr in years:
             track = build_track(yr, fastf1_name)
             if track:
                 break
         # Vainqueurs historiques (3 saisons)
-        for yr in HISTORY_YEARS:
+        for yr in years:
             w = winner_for(yr, fastf1_name)
             if w:
                 winners.append(w)
@@ -199,25 +233,181 @@ def build_circuit(gp: dict) -> dict:
     return circuit
 
 
-def main() -> int:
-    calendar = load_calendar()
-    rounds = calendar["rounds"]
+def checkpoint_key(gp: dict, years: list[int]) -> str:
+    """Empreinte des entrées d'une fiche : tout changement invalide le checkpoint."""
+    spec = {"version": CHECKPOINT_VERSION, "gp": gp, "years": years, "points": TRACK_POINTS}
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()[:16]
 
-    print(f"[INFO] Construction des fiches circuit pour {len(rounds)} GP…")
+
+def checkpoint_path(checkpoint_dir: Path, gp: dict) -> Path:
+    return checkpoint_dir / f"r{int(gp['round']):02d}.json"
+
+
+def is_complete(gp: dict, circuit: dict) -> bool:
+    """Tracé chargé, ou circuit sans historique FastF1 (fastf1Name: null)."""
+    return circuit.get("trackPath") is not None or not gp.get("fastf1Name", gp["name"])
+
+
+def read_checkpoint(checkpoint_dir: Path, gp: dict, years: list[int]) -> dict | None:
+    """Checkpoint valide de la fiche (None si absent, illisible ou invalidé)."""
+    try:
+        data = json.loads(checkpoint_path(checkpoint_dir, gp).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if data.get("key") != checkpoint_key(gp, years):
+        return None
+    return data
+
+
+def write_checkpoint(checkpoint_dir: Path, gp: dict, years: list[int], circuit: dict) -> Path:
+    """Écriture atomique : un process interrompu ne laisse pas de checkpoint tronqué."""
+    path = checkpoint_path(checkpoint_dir, gp)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "key": checkpoint_key(gp, years),
+        "complete": is_complete(gp, circuit),
+        "circuit": circuit,
+    }
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}_", suffix=".json")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+    return path
+
+
+def build_checkpoint(gp: dict, years: list[int], checkpoint_dir: Path) -> bool:
+    """Construit une fiche et l'écrit en checkpoint (exécuté dans un process du pool)."""
+    enable_cache()
+    circuit = build_circuit(gp, years)
+    write_checkpoint(checkpoint_dir, gp, years, circuit)
+    return is_complete(gp, circuit)
+
+
+def pending_circuits(
+    rounds: list[dict], years: list[int], checkpoint_dir: Path, resume: bool
+) -> list[dict]:
+    """GP à (re)construire : tous, ou avec --resume ceux sans checkpoint complet et valide."""
+    if not resume:
+        return list(rounds)
+    todo = []
+    for gp in rounds:
+        data = read_checkpoint(checkpoint_dir, gp, years)
+        if data is None or not data.get("complete"):
+            todo.append(gp)
+    return todo
+
+
+def run_circuits(
+    rounds: list[dict],
+    years: list[int],
+    checkpoint_dir: Path,
+    processes: int = DEFAULT_PROCESSES,
+    resume: bool = False,
+    build: Callable[[dict, list[int], Path], bool] = build_checkpoint,
+) -> dict[str, int]:
+    """Construit les fiches en attente, un process par circuit ; chacune laisse son checkpoint."""
+    todo = pending_circuits(rounds, years, checkpoint_dir, resume)
+    skipped = len(rounds) - len(todo)
+    if skipped:
+        print(f"  [SKIP] {skipped} circuit(s) repris des checkpoints")
+
+    failed = 0
+
+    def done(gp: dict, complete: bool | None, error: Exception | None) -> None:
+        nonlocal failed
+        if error is not None:
+            failed += 1
+            print(f"  [ERREUR {gp['name']}] {error}", file=sys.stderr)
+        elif not complete:
+            print(f"  [INFO {gp['shortName']}] tracé indisponible, à reprendre (--resume)")
+
+    if processes <= 1 or len(todo) <= 1:
+        for gp in todo:
+            try:
+                done(gp, build(gp, years, checkpoint_dir), None)
+            except Exception as e:
+                done(gp, None, e)
+    else:
+        with ProcessPoolExecutor(max_workers=min(processes, len(todo))) as pool:
+            futures = {pool.submit(build, gp, years, checkpoint_dir): gp for gp in todo}
+            for future in as_completed(futures):
+                gp = futures[future]
+                try:
+                    done(gp, future.result(), None)
+                except Exception as e:
+                    done(gp, None, e)
+
+    return {"built": len(todo) - failed, "skipped": skipped, "failed": failed}
+
+
+def assemble(rounds: list[dict], years: list[int], checkpoint_dir: Path) -> dict[str, dict]:
+    """Fiches des checkpoints valides, dans l'ordre du calendrier."""
     circuits = {}
     for gp in rounds:
-        circuits[gp["name"]] = build_circuit(gp)
+        data = read_checkpoint(checkpoint_dir, gp, years)
+        if data is not None:
+            circuits[gp["name"]] = data["circuit"]
+    return circuits
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Construit data/<season>/circuits.json.")
+    parser.add_argument("--season", type=int, default=seasons.CURRENT_SEASON)
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=DEFAULT_PROCESSES,
+        help=f"Circuits construits en parallèle (défaut : {DEFAULT_PROCESSES})",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reprend les checkpoints valides ; ne reconstruit que les circuits manquants",
+    )
+    return parser.parse_args(argv)
+
+
+@reported("build_circuits_data")
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    season = args.season
+    calendar = load_calendar(season)
+    years = history_years(season)
+    rounds = calendar["rounds"]
+    checkpoint_dir = CHECKPOINT_DIR / str(season)
+
+    print(f"[INFO] Construction des fiches circuit pour {len(rounds)} GP…")
+    counts = run_circuits(
+        rounds, years, checkpoint_dir, processes=args.processes, resume=args.resume
+    )
+    circuits = assemble(rounds, years, checkpoint_dir)
+    summary = (
+        f"{counts['built']} circuit(s) construit(s), {counts['skipped']} repris, "
+        f"{counts['failed']} en échec — checkpoints : {checkpoint_dir.relative_to(ROOT)}"
+    )
+    missing = [gp["shortName"] for gp in rounds if gp["name"] not in circuits]
+    if counts["failed"] or missing:
+        # Fichier publié laissé intact : il ne perd pas silencieusement des circuits
+        print(
+            f"[ERREUR] {summary} ; fiches manquantes : {', '.join(missing) or '—'}. "
+            "circuits.json non réécrit, relancer avec --resume",
+            file=sys.stderr,
+        )
+        return 1
 
     payload = {
-        "season": SEASON,
-        "generatedAt": date.today().isoformat(),
+        "season": season,
+        "generatedAt": clock.today().isoformat(),
         "circuits": circuits,
     }
     text = json.dumps(payload, ensure_ascii=False, indent=2) + "\n"
-    for target in (OUT_WEB, OUT_DOCS):
+    for target in seasons.output_paths(season, "circuits"):
         target.parent.mkdir(parents=True, exist_ok=True)
         target.write_text(text, encoding="utf-8")
         print(f"[OK] {target.relative_to(ROOT)}")
+    seasons.write_index()
+    print(f"[OK] {summary}")
     return 0
 
 
@@ -1,50 +1,52 @@
-"""Construit dashboard_2026.json à partir du CSV race_chart + du calendrier 2026.
+"""Construit dashboard.json d'une saison à partir du CSV race_chart + du calendrier.
 
 Lance :
     python projects/dashboard/build_dashboard_data.py
+    python projects/dashboard/build_dashboard_data.py --season 2025
+    python projects/dashboard/build_dashboard_data.py --patch [--check] [--compact]
 
-Sorties :
-    projects/dashboard/web/data/dashboard_2026.json   (source canonique)
-    docs/data/dashboard_2026.json                     (mirror servi par GitHub Pages)
+`--patch` repart du JSON existant et n'y ajoute que le dernier GP du CSV
+(reconstruction complète si le JSON ne correspond pas au CSV moins ce GP) ;
+`--check` vérifie que le résultat est identique à une reconstruction complète ;
+`--compact` écrit le schéma compact (voir `encode_compact`).
+
+Sorties (chemins par saison : voir seasons.py) :
+    projects/dashboard/web/data/<season>/dashboard.json   (source canonique)
+    docs/data/<season>/dashboard.json                     (mirror servi par GitHub Pages)
 
 La donnée brute (cumul de points par GP × pilote) est lue depuis le builder
-race_chart_builder. Le calendrier 2026 est statique (calendar_2026.json).
+race_chart_builder. Le calendrier est statique (calendar_<season>.json).
 """
 
 from __future__ import annotations
 
+import argparse
 import csv
 import json
 import sys
+from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable
+
+import numpy as np
 
 HERE = Path(__file__).resolve().parent
 ROOT = HERE.parents[1]
-CSV_SRC = (
-    ROOT / "projects" / "race_chart_builder" / "web" / "data" / "f1_race_chart_fastf1_2026.csv"
-)
-CALENDAR_PATH = HERE / "calendar_2026.json"
-OUT_WEB = HERE / "web" / "data" / "dashboard_2026.json"
-OUT_DOCS = ROOT / "docs" / "data" / "dashboard_2026.json"
 
-META_COLS = {"Pilote", "image", "team", "start"}
+# Racine du repo sur sys.path (pour importer projects.common quand lancé en script)
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
+from projects.common import clock  # noqa: E402
+from projects.common.run_report import reported  # noqa: E402
+from projects.dashboard import seasons  # noqa: E402
 
-def load_calendar() -> dict:
-    return json.loads(CALENDAR_PATH.read_text(encoding="utf-8"))
+META_COLS = {"Pilote", "image", "team", "start"}
 
 
-def load_drivers(csv_path: Path) -> tuple[list[dict], list[str]]:
-    """Retourne (rows, gp_columns)."""
-    with csv_path.open(encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-        if not rows:
-            raise ValueError(f"CSV vide : {csv_path}")
-        gp_columns = [c for c in reader.fieldnames or [] if c not in META_COLS]
-    return rows, gp_columns
+def load_calendar(season: int = seasons.CURRENT_SEASON) -> dict:
+    return json.loads(seasons.calendar_path(season).read_text(encoding="utf-8"))
 
 
 def to_float(v: str | None) -> float:
@@ -54,54 +56,105 @@ def to_float(v: str | None) -> float:
         return 0.0
 
 
-def compute_kpis(rows: list[dict], gp_columns: list[str]) -> tuple[dict, str]:
-    """Renvoie (kpis, last_gp_name)."""
-    if not gp_columns:
-        raise ValueError("Aucune colonne de GP dans le CSV")
+@dataclass
+class PointsMatrix:
+    """Cumuls du CSV race chart : matrice pilotes × GP (float64), lue une seule fois.
 
-    last_gp = gp_columns[-1]
-    prev_gp = gp_columns[-2] if len(gp_columns) >= 2 else None
+    Lignes dans l'ordre du CSV (les égalités se départagent par cet ordre),
+    colonnes dans l'ordre des GP courus. Toutes les dérivées (gains par GP,
+    rangs, vainqueurs, agrégats constructeurs) sont calculées sur ce tableau.
+    """
 
-    standings = sorted(
-        (
-            {"name": r["Pilote"], "team": r.get("team", ""), "points": to_float(r[last_gp])}
-            for r in rows
-        ),
-        key=lambda d: d["points"],
-        reverse=True,
+    drivers: list[str]
+    teams: list[str]
+    images: list[str]
+    rounds: list[str]
+    cumulative: np.ndarray
+
+    @property
+    def gains(self) -> np.ndarray:
+        """Points marqués à chaque GP (différence avec le cumul précédent)."""
+        return np.diff(self.cumulative, axis=1, prepend=0.0)
+
+    @property
+    def last(self) -> np.ndarray:
+        return self.cumulative[:, -1]
+
+    @property
+    def prev(self) -> np.ndarray:
+        if len(self.rounds) < 2:
+            return np.zeros(len(self.drivers))
+        return self.cumulative[:, -2]
+
+    def ranking(self, points: np.ndarray) -> np.ndarray:
+        """Indices des pilotes par points décroissants (tri stable : ordre CSV aux égalités)."""
+        return np.argsort(-points, kind="stable")
+
+    def round_winners(self) -> list[int | None]:
+        """Par GP, premier pilote (ordre CSV) au plus gros gain ; None si aucun gain > -1."""
+        if not self.drivers:
+            return [None] * len(self.rounds)
+        gains = self.gains
+        best = gains.argmax(axis=0)
+        return [int(i) if gains[i, j] > -1 else None for j, i in enumerate(best)]
+
+
+def load_points(csv_path: Path) -> PointsMatrix:
+    """Lit le CSV race chart (cumul par GP × pilote) en une passe."""
+    with csv_path.open(encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+        if not rows:
+            raise ValueError(f"CSV vide : {csv_path}")
+        gp_columns = [c for c in reader.fieldnames or [] if c not in META_COLS]
+    cumulative = np.array(
+        [[to_float(r[gp]) for gp in gp_columns] for r in rows], dtype=np.float64
+    ).reshape(len(rows), len(gp_columns))
+    return PointsMatrix(
+        drivers=[r["Pilote"] for r in rows],
+        teams=[r.get("team", "") or "" for r in rows],
+        images=[r.get("image", "") or "" for r in rows],
+        rounds=gp_columns,
+        cumulative=cumulative,
     )
-    leader = standings[0]
-    second = standings[1] if len(standings) > 1 else {"name": "—", "team": "", "points": 0.0}
-    leader_gap = int(leader["points"] - second["points"])
 
-    if prev_gp is not None:
-        gains = [
-            {
-                "name": r["Pilote"],
-                "team": r.get("team", ""),
-                "gain": to_float(r[last_gp]) - to_float(r[prev_gp]),
-            }
-            for r in rows
-        ]
-        winner = max(gains, key=lambda d: d["gain"])
+
+def compute_kpis(points: PointsMatrix) -> tuple[dict, str]:
+    """Renvoie (kpis, last_gp_name)."""
+    if not points.rounds:
+        raise ValueError("Aucune colonne de GP dans le CSV")
+
+    last_gp = points.rounds[-1]
+    order = points.ranking(points.last)
+    leader = int(order[0])
+    leader_pts = float(points.last[leader])
+    if len(order) > 1:
+        second = int(order[1])
+        second_info = {"name": points.drivers[second], "team": points.teams[second]}
+        second_pts = float(points.last[second])
     else:
-        winner = {"name": leader["name"], "team": leader["team"], "gain": leader["points"]}
+        second_info, second_pts = {"name": "—", "team": ""}, 0.0
+
+    if len(points.rounds) >= 2:
+        winner = int(np.argmax(points.last - points.prev))
+    else:
+        winner = leader
 
     return (
         {
             "leader": {
-                "name": leader["name"],
-                "team": leader["team"],
-                "points": int(leader["points"]),
+                "name": points.drivers[leader],
+                "team": points.teams[leader],
+                "points": int(leader_pts),
             },
-            "second": {
-                "name": second["name"],
-                "team": second["team"],
-                "points": int(second["points"]),
+            "second": {**second_info, "points": int(second_pts)},
+            "leaderGap": int(leader_pts - second_pts),
+            "lastWinner": {
+                "name": points.drivers[winner],
+                "team": points.teams[winner],
+                "gp": last_gp,
             },
-            "leaderGap": leader_gap,
-            "lastWinner": {"name": winner["name"], "team": winner["team"], "gp": last_gp},
-            "raceCount": len(gp_columns),
+            "raceCount": len(points.rounds),
         },
         last_gp,
     )
@@ -114,68 +167,72 @@ def short_name(full: str) -> str:
     return f"{parts[0][0]}. {' '.join(parts[1:])}"
 
 
-def compute_standings(
-    rows: list[dict], gp_columns: list[str], short_names: dict[str, str] | None = None
-) -> dict:
+def compute_standings(points: PointsMatrix, short_names: dict[str, str] | None = None) -> dict:
     """Standings pilotes et constructeurs avec rang, points, delta dernier GP, écart leader."""
-    if not gp_columns:
+    if not points.rounds:
         return {"drivers": [], "constructors": []}
 
-    last_gp = gp_columns[-1]
-    prev_gp = gp_columns[-2] if len(gp_columns) >= 2 else None
     short_names = short_names or {}
+    gp_short = [short_names.get(gp, gp) for gp in points.rounds]
+    # Entiers tronqués (comme int()) : gains et cumuls par GP
+    gains = points.gains.astype(np.int64).tolist()
+    cumuls = points.cumulative.astype(np.int64).tolist()
+
+    def progress(i: int) -> list[dict]:
+        return [
+            {"gp": gp, "shortName": short, "gain": gain, "cumulative": cum}
+            for gp, short, gain, cum in zip(points.rounds, gp_short, gains[i], cumuls[i])
+        ]
 
-    def progress_for(r: dict) -> list[dict]:
-        """Retourne pour chaque GP joué : nom, gain au GP, cumul à la fin du GP."""
-        out = []
-        prev = 0.0
-        for gp in gp_columns:
-            cum = to_float(r[gp])
-            out.append(
-                {
-                    "gp": gp,
-                    "shortName": short_names.get(gp, gp),
-                    "gain": int(cum - prev),
-                    "cumulative": int(cum),
-                }
-            )
-            prev = cum
-        return out
+    return rank_standings(points, progress)
 
-    # Pilotes
-    drivers = [
-        {
-            "name": r["Pilote"],
-            "shortName": short_name(r["Pilote"]),
-            "team": r.get("team", ""),
-            "image": r.get("image", ""),
-            "points": int(to_float(r[last_gp])),
-            "deltaLastGp": int(to_float(r[last_gp]) - (to_float(r[prev_gp]) if prev_gp else 0.0)),
-            "progress": progress_for(r),
-        }
-        for r in rows
-    ]
-    drivers.sort(key=lambda d: d["points"], reverse=True)
-    leader_pts = drivers[0]["points"] if drivers else 0
-    for i, d in enumerate(drivers):
-        d["rank"] = i + 1
-        d["leaderGap"] = d["points"] - leader_pts  # 0 ou négatif
-
-    # Constructeurs : agrégation par écurie
-    teams: dict[str, dict] = {}
-    for d in drivers:
-        t = d["team"]
-        if not t:
-            continue
-        bucket = teams.setdefault(t, {"team": t, "points": 0, "deltaLastGp": 0})
-        bucket["points"] += d["points"]
-        bucket["deltaLastGp"] += d["deltaLastGp"]
-
-    constructors = sorted(teams.values(), key=lambda x: x["points"], reverse=True)
-    leader_team_pts = constructors[0]["points"] if constructors else 0
-    for i, c in enumerate(constructors):
-        c["rank"] = i + 1
-        c["leaderGap"] = c["points"] - leader_team_pts
+
+def rank_standings(points: PointsMatrix, progress: Callable[[int], list[dict]]) -> dict:
+    """Classe pilotes et constructeurs sur le dernier GP ; `progress(i)` = historique du pilote i."""
+    # Entiers tronqués (comme int()) : points affichés, deltas
+    totals = points.last.astype(np.int64)
+    deltas = (points.last - points.prev).astype(np.int64)
+
+    order = points.ranking(totals)
+    leader_pts = int(totals[order[0]]) if len(order) else 0
+    drivers = []
+    for rank, i in enumerate(order.tolist(), start=1):
+        drivers.append(
+            {
+                "name": points.drivers[i],
+                "shortName": short_name(points.drivers[i]),
+                "team": points.teams[i],
+                "image": points.images[i],
+                "points": int(totals[i]),
+                "deltaLastGp": int(deltas[i]),
+                "progress": progress(i),
+                "rank": rank,
+                "leaderGap": int(totals[i]) - leader_pts,  # 0 ou négatif
+            }
+        )
+    # Constructeurs : agrégation par écurie (ordre de première apparition au classement)
+    team_names = list(dict.fromkeys(points.teams[i] for i in order.tolist() if points.teams[i]))
+    team_index = {t: k for k, t in enumerate(team_names)}
+    team_of = np.array([team_index.get(t, -1) for t in points.teams])
+    scored = team_of >= 0
+    team_pts = np.zeros(len(team_names), dtype=np.int64)
+    team_delta = np.zeros(len(team_names), dtype=np.int64)
+    np.add.at(team_pts, team_of[scored], totals[scored])
+    np.add.at(team_delta, team_of[scored], deltas[scored])
+
+    constructors = []
+    team_order = np.argsort(-team_pts, kind="stable").tolist()
+    leader_team_pts = int(team_pts[team_order[0]]) if team_order else 0
+    for rank, k in enumerate(team_order, start=1):
+        constructors.append(
+            {
+                "team": team_names[k],
+                "points": int(team_pts[k]),
+                "deltaLastGp": int(team_delta[k]),
+                "rank": rank,
+                "leaderGap": int(team_pts[k]) - leader_team_pts,
+            }
+        )
 
     return {"drivers": drivers, "constructors": constructors}
 
@@ -187,40 +244,34 @@ def find_round(rounds: Iterable[dict], gp_name: str) -> dict | None:
     return None
 
 
-def build(today: date | None = None) -> dict:
-    rows, gp_columns = load_drivers(CSV_SRC)
-    calendar = load_calendar()
+def winner_entry(points: PointsMatrix, i: int) -> dict:
+    return {
+        "name": points.drivers[i],
+        "team": points.teams[i],
+        "shortName": short_name(points.drivers[i]),
+    }
+
+
+def assemble(
+    points: PointsMatrix,
+    calendar: dict,
+    standings: dict,
+    winners_by_gp: dict[str, dict],
+    today: date | None = None,
+) -> dict:
+    """Payload complet : KPIs, dernier / prochain GP et calendrier autour des standings."""
     rounds = calendar["rounds"]
     total_races = calendar.get("totalRaces", len(rounds))
 
-    kpis, last_gp_name = compute_kpis(rows, gp_columns)
+    kpis, last_gp_name = compute_kpis(points)
     last_round = find_round(rounds, last_gp_name) or {}
     last_round_idx = next((i for i, r in enumerate(rounds) if r["name"] == last_gp_name), -1)
     next_round = rounds[last_round_idx + 1] if 0 <= last_round_idx < len(rounds) - 1 else None
 
     kpis["totalRaces"] = total_races
-    short_names_by_gp = {r["name"]: r.get("shortName", r["name"]) for r in rounds}
-    standings = compute_standings(rows, gp_columns, short_names_by_gp)
 
     # Calendrier enrichi : status (played / next / upcoming) + winner si dispo
-    played_set = set(gp_columns)
-    winners_by_gp = {}
-    if rows and gp_columns:
-        for gpi, gp in enumerate(gp_columns):
-            prev = gp_columns[gpi - 1] if gpi > 0 else None
-            best = None
-            best_gain = -1
-            for r in rows:
-                gain = to_float(r[gp]) - (to_float(r[prev]) if prev else 0.0)
-                if gain > best_gain:
-                    best_gain = gain
-                    best = r
-            if best is not None:
-                winners_by_gp[gp] = {
-                    "name": best["Pilote"],
-                    "team": best.get("team", ""),
-                    "shortName": short_name(best["Pilote"]),
-                }
+    played_set = set(points.rounds)
     calendar_out = []
     for r in rounds:
         is_played = r["name"] in played_set
@@ -239,7 +290,7 @@ def build(today: date | None = None) -> dict:
 
     return {
         "season": calendar["season"],
-        "generatedAt": (today or date.today()).isoformat(),
+        "generatedAt": (today or clock.today()).isoformat(),
         "lastGp": {
             "name": last_gp_name,
             "shortName": last_round.get("shortName", last_gp_name),
@@ -263,21 +314,267 @@ def build(today: date | None = None) -> dict:
     }
 
 
-def write_outputs(payload: dict) -> None:
-    text = json.dumps(payload, ensure_ascii=False, indent=2) + "\n"
-    for target in (OUT_WEB, OUT_DOCS):
+def build(today: date | None = None, season: int = seasons.CURRENT_SEASON) -> dict:
+    points = load_points(seasons.race_chart_csv(season))
+    calendar = load_calendar(season)
+    short_names_by_gp = {r["name"]: r.get("shortName", r["name"]) for r in calendar["rounds"]}
+    standings = compute_standings(points, short_names_by_gp)
+    winners_by_gp = {
+        gp: winner_entry(points, best)
+        for gp, best in zip(points.rounds, points.round_winners())
+        if best is not None
+    }
+    return assemble(points, calendar, standings, winners_by_gp, today)
+
+
+def patch(
+    previous: dict, points: PointsMatrix, calendar: dict, today: date | None = None
+) -> dict | None:
+    """Ajoute le dernier GP du CSV à un payload existant, sans recalculer l'historique.
+
+    Les `progress` des pilotes sont repris tels quels et prolongés d'une entrée ;
+    rangs, écarts, constructeurs, KPIs et statuts du calendrier sont recalculés
+    sur les deux dernières colonnes. Renvoie None si le payload précédent ne
+    correspond pas au CSV moins son dernier GP (saison, pilotes, GP, calendrier,
+    gains / cumuls d'un GP antérieur ou vainqueurs différents) : reconstruire
+    alors avec `build()`.
+    """
+    if len(points.rounds) < 2 or previous.get("season") != calendar.get("season"):
+        return None
+    done = points.rounds[:-1]
+    history = {d["name"]: d["progress"] for d in previous["standings"]["drivers"]}
+    if set(history) != set(points.drivers) or len(history) != len(points.drivers):
+        return None
+    if any([p["gp"] for p in progress] != done for progress in history.values()):
+        return None
+    if [c["name"] for c in previous["calendar"]] != [r["name"] for r in calendar["rounds"]]:
+        return None
+    # Historique repris tel quel : il doit coïncider avec le CSV (pénalité ou
+    # reclassement d'un GP antérieur => reconstruction complète)
+    old_gains = points.gains[:, :-1].astype(np.int64).tolist()
+    old_cumuls = points.cumulative[:, :-1].astype(np.int64).tolist()
+    for i, name in enumerate(points.drivers):
+        stored = [(p["gain"], p["cumulative"]) for p in history[name]]
+        if stored != list(zip(old_gains[i], old_cumuls[i])):
+            return None
+    previous_winners = {c["name"]: c.get("winner") for c in previous["calendar"]}
+    for gp, best in zip(done, points.round_winners()[:-1]):
+        expected = winner_entry(points, best) if best is not None else None
+        if previous_winners.get(gp) != expected:
+            return None
+
+    new_gp = points.rounds[-1]
+    new_short = (find_round(calendar["rounds"], new_gp) or {}).get("shortName", new_gp)
+    gains = (points.last - points.prev).astype(np.int64)
+    cumuls = points.last.astype(np.int64)
+
+    def progress(i: int) -> list[dict]:
+        entry = {
+            "gp": new_gp,
+            "shortName": new_short,
+            "gain": int(gains[i]),
+            "cumulative": int(cumuls[i]),
+        }
+        return history[points.drivers[i]] + [entry]
+
+    standings = rank_standings(points, progress)
+    winners_by_gp = {
+        c["name"]: c["winner"] for c in previous["calendar"] if c["name"] in done and c["winner"]
+    }
+    best = points.round_winners()[-1]
+    if best is not None:
+        winners_by_gp[new_gp] = winner_entry(points, best)
+    return assemble(points, calendar, standings, winners_by_gp, today)
+
+
+def diff_payloads(a, b, path: str = "$") -> list[str]:
+    """Chemins où deux payloads JSON diffèrent (vide si identiques)."""
+    if isinstance(a, dict) and isinstance(b, dict):
+        if list(a) != list(b):
+            return [f"{path} (clés)"]
+        return [d for k in a for d in diff_payloads(a[k], b[k], f"{path}.{k}")]
+    if isinstance(a, list) and isinstance(b, list):
+        if len(a) != len(b):
+            return [f"{path} (longueur {len(a)} ≠ {len(b)})"]
+        return [
+            d for i, (x, y) in enumerate(zip(a, b)) for d in diff_payloads(x, y, f"{path}[{i}]")
+        ]
+    return [] if a == b and type(a) is type(b) else [path]
+
+
+def build_or_patch(
+    previous: dict | None,
+    today: date | None = None,
+    check: bool = False,
+    season: int = seasons.CURRENT_SEASON,
+) -> tuple[dict, bool]:
+    """Payload patché depuis `previous` si possible, sinon reconstruit ; (payload, patché ?).
+
+    `check` reconstruit aussi le payload complet et lève ValueError au moindre écart.
+    """
+    payload = None
+    if previous is not None:
+        points = load_points(seasons.race_chart_csv(season))
+        payload = patch(previous, points, load_calendar(season), today)
+    if payload is None:
+        return build(today, season), False
+    if check:
+        diffs = diff_payloads(payload, build(today, season))
+        if diffs:
+            raise ValueError(f"patch ≠ reconstruction complète : {', '.join(diffs[:5])}")
+    return payload, True
+
+
+# ---------- Schéma compact (dictionnaires + tableaux d'entiers) ----------
+
+COMPACT_SCHEMA = 2
+
+
+def encode_compact(payload: dict) -> dict:
+    """Schéma compact : chaque GP, écurie et pilote n'est écrit qu'une fois.
+
+    `rounds` (GP courus) et `teams` sont des tables ; `drivers` reprend les
+    standings pilotes avec l'index de l'écurie et `gains` / `cumulative` en
+    tableaux d'entiers alignés sur `rounds` ; constructeurs et vainqueurs du
+    calendrier référencent ces tables par index. `decode_compact` (et
+    `decodeDashboard` côté front) restituent le payload d'origine.
+    """
+    standings = payload["standings"]
+    drivers = standings["drivers"]
+    rounds = [[p["gp"], p["shortName"]] for p in drivers[0]["progress"]] if drivers else []
+    teams = list(
+        dict.fromkeys([d["team"] for d in drivers] + [c["team"] for c in standings["constructors"]])
+    )
+    team_idx = {t: i for i, t in enumerate(teams)}
+    driver_idx = {d["name"]: i for i, d in enumerate(drivers)}
+    return {
+        "schema": COMPACT_SCHEMA,
+        **{k: v for k, v in payload.items() if k not in ("standings", "calendar")},
+        "rounds": rounds,
+        "teams": teams,
+        "drivers": [
+            {
+                "name": d["name"],
+                "shortName": d["shortName"],
+                "team": team_idx[d["team"]],
+                "image": d["image"],
+                "points": d["points"],
+                "deltaLastGp": d["deltaLastGp"],
+                "rank": d["rank"],
+                "leaderGap": d["leaderGap"],
+                "gains": [p["gain"] for p in d["progress"]],
+                "cumulative": [p["cumulative"] for p in d["progress"]],
+            }
+            for d in drivers
+        ],
+        "constructors": [{**c, "team": team_idx[c["team"]]} for c in standings["constructors"]],
+        "calendar": [
+            {**c, "winner": driver_idx[c["winner"]["name"]] if c["winner"] else None}
+            for c in payload["calendar"]
+        ],
+    }
+
+
+def decode_compact(payload: dict) -> dict:
+    """Inverse de `encode_compact` ; un payload déjà développé est renvoyé tel quel."""
+    if payload.get("schema") != COMPACT_SCHEMA:
+        return payload
+    teams, drivers = payload["teams"], payload["drivers"]
+
+    def winner(i: int | None) -> dict | None:
+        if i is None:
+            return None
+        d = drivers[i]
+        return {"name": d["name"], "team": teams[d["team"]], "shortName": d["shortName"]}
+
+    head = {
+        k: v
+        for k, v in payload.items()
+        if k not in ("schema", "rounds", "teams", "drivers", "constructors", "calendar")
+    }
+    return {
+        **head,
+        "standings": {
+            "drivers": [
+                {
+                    "name": d["name"],
+                    "shortName": d["shortName"],
+                    "team": teams[d["team"]],
+                    "image": d["image"],
+                    "points": d["points"],
+                    "deltaLastGp": d["deltaLastGp"],
+                    "progress": [
+                        {"gp": gp, "shortName": short, "gain": gain, "cumulative": cum}
+                        for (gp, short), gain, cum in zip(
+                            payload["rounds"], d["gains"], d["cumulative"]
+                        )
+                    ],
+                    "rank": d["rank"],
+                    "leaderGap": d["leaderGap"],
+                }
+                for d in drivers
+            ],
+            "constructors": [{**c, "team": teams[c["team"]]} for c in payload["constructors"]],
+        },
+        "calendar": [{**c, "winner": winner(c["winner"])} for c in payload["calendar"]],
+    }
+
+
+def write_outputs(payload: dict, compact: bool = False) -> None:
+    """Écrit le payload dans data/<season>/dashboard.json (web/ + docs/) et l'index des saisons."""
+    if compact:
+        text = json.dumps(encode_compact(payload), ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = json.dumps(payload, ensure_ascii=False, indent=2)
+    text += "\n"
+    for target in seasons.output_paths(payload["season"], "dashboard"):
         target.parent.mkdir(parents=True, exist_ok=True)
         target.write_text(text, encoding="utf-8")
         print(f"[OK] {target.relative_to(ROOT)}")
+    seasons.write_index()
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Construit data/<season>/dashboard.json.")
+    parser.add_argument("--season", type=int, default=seasons.CURRENT_SEASON)
+    parser.add_argument(
+        "--patch",
+        action="store_true",
+        help="Repartir du JSON existant et n'y ajouter que le dernier GP du CSV",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Écrire le schéma compact (tables GP / écuries / pilotes, JSON minifié)",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Avec --patch : comparer au payload reconstruit, échec au moindre écart",
+    )
+    return parser.parse_args(argv)
+
+
+def load_previous(path: Path) -> dict | None:
+    try:
+        return decode_compact(json.loads(path.read_text(encoding="utf-8")))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
 
 
-def main() -> int:
+@reported("build_dashboard_data")
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    web_json, _ = seasons.output_paths(args.season, "dashboard")
+    previous = load_previous(web_json) if args.patch else None
     try:
-        payload = build()
-    except FileNotFoundError as e:
+        payload, patched = build_or_patch(previous, check=args.check, season=args.season)
+    except (FileNotFoundError, ValueError) as e:
         print(f"[ERREUR] {e}", file=sys.stderr)
         return 1
-    write_outputs(payload)
+    if args.patch:
+        print("[INFO] payload patché (dernier GP)" if patched else "[INFO] reconstruction complète")
+    write_outputs(payload, compact=args.compact)
     return 0
 
 
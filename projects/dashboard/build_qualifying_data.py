@@ -1,4 +1,4 @@
-"""Construit qualifying_2026.json : duels en qualif entre coéquipiers.
+"""Construit qualifying.json d'une saison : duels en qualif entre coéquipiers.
 
 Pour chaque GP joué de la saison, charge la session Qualifying via FastF1 et
 calcule, pour chaque paire de coéquipiers :
@@ -9,35 +9,56 @@ calcule, pour chaque paire de coéquipiers :
 Le "temps de référence" d'un pilote = son meilleur temps (Q3 si disponible,
 sinon Q2, sinon Q1), c'est-à-dire le temps qui a déterminé sa position.
 
-Sorties :
-    projects/dashboard/web/data/qualifying_2026.json
-    docs/data/qualifying_2026.json
+Sorties (chemins par saison : voir seasons.py) :
+    projects/dashboard/web/data/<season>/qualifying.json          résumé
+    projects/dashboard/web/data/<season>/qualifying/r<NN>.json    sessions du GP NN
+    (mêmes fichiers sous docs/data/<season>/)
+
+Le résumé ne porte que ce que l'onglet Coéquipiers affiche d'emblée (duels
+agrégés `teammates` + index `rounds`) ; les classements complets de chaque
+session (tous les pilotes) sont dans un fichier par GP, chargé par le front
+seulement quand on ouvre ce GP. Le résumé ne grossit plus avec les
+classements bruts.
 
 Lance :
     python projects/dashboard/build_qualifying_data.py
+    python projects/dashboard/build_qualifying_data.py --season 2025
+    python projects/dashboard/build_qualifying_data.py --refresh-round 12   # recharge le GP 12
+    python projects/dashboard/build_qualifying_data.py --full               # recharge tout
+
+Incrémental par défaut : les sessions déjà présentes dans le fichier existant
+sont reprises telles quelles ; seules les sessions absentes, celles des GP
+courus depuis moins de REFRESH_DAYS jours (résultats encore en propagation)
+et celles des GP demandés par --refresh-round sont chargées (via le store de
+résultats). Les sessions forcées par --refresh-round / --full contournent aussi
+le store : elles sont rechargées depuis FastF1. Le coût du run hebdomadaire ne
+dépend plus du nombre de GP courus.
 """
 
 from __future__ import annotations
 
+import argparse
 import json
 import sys
-from collections import defaultdict
-from datetime import date
+from datetime import date, timedelta
 from pathlib import Path
+from typing import Iterable
 
-import fastf1
 import pandas as pd
 
 HERE = Path(__file__).resolve().parent
 ROOT = HERE.parents[1]
-CALENDAR_PATH = HERE / "calendar_2026.json"
-RACE_CHART_CSV = (
-    ROOT / "projects" / "race_chart_builder" / "web" / "data" / "f1_race_chart_fastf1_2026.csv"
-)
-OUT_WEB = HERE / "web" / "data" / "qualifying_2026.json"
-OUT_DOCS = ROOT / "docs" / "data" / "qualifying_2026.json"
 
-SEASON = 2026
+# Racine du repo sur sys.path (pour importer projects.common quand lancé en script)
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from projects.common import clock  # noqa: E402
+from projects.common.head_to_head import QUALIFYING, HeadToHead  # noqa: E402
+from projects.common.results_store import REFRESH_DAYS, load_results  # noqa: E402
+from projects.common.run_report import reported  # noqa: E402
+from projects.common.session_loader import load_many  # noqa: E402
+from projects.dashboard import seasons  # noqa: E402
 
 
 def to_seconds(td) -> float | None:
@@ -67,40 +88,32 @@ def best_time_for_driver(row: pd.Series) -> tuple[float | None, bool]:
     return best, q3 is not None
 
 
-def load_round_session(year: int, gp_name: str, session_code: str) -> list[dict] | None:
+def load_round_session(
+    year: int, round_no: int, gp_name: str, session_code: str, refresh: bool = False
+) -> list[dict] | None:
     """Charge une session ('Q' ou 'SQ') et retourne la liste pilotes avec leur temps de référence.
 
-    Pour SQ, Ergast n'a pas les données : on utilise le meilleur tour de chaque pilote
-    via session.laps (donc on charge les laps dans ce cas-là).
+    Lecture via le store partagé (projects/common/results_store.py) ; `refresh`
+    ignore le CSV stocké et recharge la session depuis FastF1. Pour SQ, Ergast
+    n'a pas les données : le store retient le meilleur tour de chaque pilote
+    (colonne BestLapTime, calculée au remplissage depuis le chronométrage).
     """
-    needs_laps = session_code == "SQ"
     try:
-        session = fastf1.get_session(year, gp_name, session_code)
-        session.load(laps=needs_laps, telemetry=False, weather=False, messages=False)
+        results = load_results(year, round_no, session_code, refresh=refresh)
     except Exception as e:
         print(f"  [SKIP {gp_name} {session_code}] impossible de charger : {e}", file=sys.stderr)
         return None
 
-    results = session.results
     if results is None or results.empty:
         return None
 
-    # Pour SQ, on calcule le meilleur temps par pilote depuis les laps
-    best_lap_by_driver = {}
-    if needs_laps and session.laps is not None and not session.laps.empty:
-        for drv, grp in session.laps.groupby("Driver"):
-            fastest = grp.pick_fastest()
-            if fastest is not None and not pd.isna(fastest.get("LapTime")):
-                best_lap_by_driver[str(drv)] = to_seconds(fastest["LapTime"])
-
     out = []
     for _, row in results.iterrows():
         if session_code == "Q":
             best, did_q3 = best_time_for_driver(row)
         else:
-            # SQ : meilleur tour via les laps, indexé par Abbreviation (DriverCode)
-            abbr = str(row.get("Abbreviation", ""))
-            best = best_lap_by_driver.get(abbr)
+            # SQ : meilleur tour via les laps
+            best = to_seconds(row.get("BestLapTime"))
             did_q3 = False  # Q3 ne s'applique qu'aux Q régulières
         out.append(
             {
@@ -116,24 +129,40 @@ def load_round_session(year: int, gp_name: str, session_code: str) -> list[dict]
     return out
 
 
-def load_calendar() -> dict:
-    return json.loads(CALENDAR_PATH.read_text(encoding="utf-8"))
+def load_calendar(season: int) -> dict:
+    return json.loads(seasons.calendar_path(season).read_text(encoding="utf-8"))
 
 
-def load_previous_sessions() -> dict[tuple[int, str], dict]:
-    """Retourne les sessions du fichier existant, indexées par (round, type).
+def shard_name(round_no: int) -> str:
+    """Nom (pour seasons.output_paths) du fichier des sessions d'un GP."""
+    return f"qualifying/r{int(round_no):02d}"
 
-    Sert de fallback : si un chargement FastF1 échoue au run courant mais
-    qu'on avait déjà la session, on la préserve au lieu d'écraser avec du vide.
-    """
-    if not OUT_WEB.exists():
-        return {}
+
+def _read_json(path: Path) -> dict | None:
     try:
-        prev = json.loads(OUT_WEB.read_text(encoding="utf-8"))
+        return json.loads(path.read_text(encoding="utf-8"))
     except (OSError, json.JSONDecodeError):
+        return None
+
+
+def load_previous_sessions(season: int) -> dict[tuple[int, str], dict]:
+    """Retourne les sessions déjà publiées (fichiers par GP), indexées par (round, type).
+
+    Reprises telles quelles en mode incrémental ; sert aussi de fallback : si
+    un chargement échoue au run courant mais qu'on avait déjà la session, on la
+    préserve au lieu d'écraser avec du vide. Un ancien qualifying.json (toutes
+    les sessions dans `sessions`) est encore lu.
+    """
+    web_json, _ = seasons.output_paths(season, "qualifying")
+    prev = _read_json(web_json) if web_json.exists() else None
+    if prev is None:
         return {}
+    sessions = prev.get("sessions", [])
+    for r in prev.get("rounds", []):
+        shard = _read_json(seasons.output_paths(season, r.get("shard", ""))[0])
+        sessions += (shard or {}).get("sessions", [])
     out: dict[tuple[int, str], dict] = {}
-    for s in prev.get("sessions", []):
+    for s in sessions:
         try:
             out[(int(s["round"]), s["type"])] = s
         except (KeyError, TypeError, ValueError):
@@ -141,103 +170,130 @@ def load_previous_sessions() -> dict[tuple[int, str], dict]:
     return out
 
 
-def load_played_gp_names() -> list[str]:
+def sessions_to_load(
+    rounds: list[dict],
+    previous: dict[tuple[int, str], dict],
+    today: date,
+    full: bool = False,
+    refresh_rounds: Iterable[int] = (),
+) -> set[tuple[int, str]]:
+    """(round, type) à charger ; les autres sessions sont reprises du fichier précédent.
+
+    Chargées : toutes si `full`, sinon les sessions absentes de `previous`,
+    celles des GP courus depuis moins de REFRESH_DAYS jours et celles des
+    rounds de `refresh_rounds`.
+    """
+    refresh = set(refresh_rounds)
+    recent = today - timedelta(days=REFRESH_DAYS)
+    keys = set()
+    for r in rounds:
+        types = ("Q", "SQ") if r.get("isSprint", False) else ("Q",)
+        stale = full or r["round"] in refresh or date.fromisoformat(r["date"]) >= recent
+        for stype in types:
+            if stale or (r["round"], stype) not in previous:
+                keys.add((r["round"], stype))
+    return keys
+
+
+def load_played_gp_names(season: int) -> list[str]:
     """Liste des GP déjà courus, lue depuis le CSV race_chart (col names hors meta)."""
     META = {"Pilote", "image", "team", "start"}
-    df = pd.read_csv(RACE_CHART_CSV, encoding="utf-8-sig")
+    df = pd.read_csv(seasons.race_chart_csv(season), encoding="utf-8-sig")
     return [c for c in df.columns if c not in META]
 
 
 def build_teammate_pairs(sessions_data: list[dict]) -> list[dict]:
-    """Pour chaque écurie, agrège les duels coéquipier sur Q + SQ.
+    """Duels coéquipiers sur Q + SQ, un pairing par (écurie, paire de pilotes).
 
-    Entrée : liste de dicts { round, gp, shortName, type ('Q'|'SQ'), drivers: [...] }
+    Entrée : liste de dicts { round, gp, shortName, type ('Q'|'SQ'), drivers: [...] }.
+    Une écurie qui change de pilote en cours de saison a un pairing par duo.
     """
-    # team -> list[(session_meta, drivers_in_session)]
-    by_team = defaultdict(list)
+    return HeadToHead(QUALIFYING).extend(sessions_data).to_json()
+
+
+def split_payload(
+    season: int, generated_at: str, sessions_data: list[dict], teammates: list[dict]
+) -> tuple[dict, dict[int, dict]]:
+    """(résumé, {round: fichier du GP}) à partir des sessions et des duels agrégés."""
+    shards: dict[int, dict] = {}
     for s in sessions_data:
-        team_map = defaultdict(list)
-        for d in s["drivers"]:
-            if d["team"]:
-                team_map[d["team"]].append(d)
-        for team, drvs in team_map.items():
-            by_team[team].append((s, drvs))
-
-    teams_out = []
-    for team, items in by_team.items():
-        # Pilotes "titulaires" (apparaissent au moins une fois) — ordre alpha
-        names_set = set()
-        for _, drvs in items:
-            for d in drvs:
-                names_set.add(d["fullName"])
-        names = sorted(names_set)
-
-        h2h = {"Q": defaultdict(int), "SQ": defaultdict(int)}
-        q3_count = defaultdict(int)
-        sessions_out = []
-
-        for meta, drvs in items:
-            stype = meta["type"]
-            # Compteur Q3 (sessions Q uniquement — Q3 n'existe pas en SQ)
-            if stype == "Q":
-                for d in drvs:
-                    if d["q3"]:
-                        q3_count[d["fullName"]] += 1
-
-            # Duel : exactement 2 pilotes du team, deux temps présents
-            if (
-                len(drvs) == 2
-                and drvs[0]["bestTimeSec"] is not None
-                and drvs[1]["bestTimeSec"] is not None
-            ):
-                d0, d1 = drvs[0], drvs[1]
-                # On normalise par ordre alpha pour stabiliser timeA / timeB
-                if d0["fullName"] not in names or d1["fullName"] not in names:
-                    continue
-                if names.index(d0["fullName"]) > names.index(d1["fullName"]):
-                    d0, d1 = d1, d0
-                # Sécurité : ne traite que les 2 pilotes "titulaires"
-                if d0["fullName"] != names[0] or d1["fullName"] != names[1]:
-                    continue
-                tA = d0["bestTimeSec"]
-                tB = d1["bestTimeSec"]
-                fastest = d0["fullName"] if tA < tB else d1["fullName"]
-                gap = abs(tA - tB)
-                h2h[stype][fastest] += 1
-                sessions_out.append(
-                    {
-                        "round": meta["round"],
-                        "gp": meta["gp"],
-                        "shortName": meta["shortName"],
-                        "type": stype,
-                        "fastest": fastest,
-                        "gapSec": round(gap, 3),
-                        "timeA": d0["bestTimeStr"],
-                        "timeB": d1["bestTimeStr"],
-                        "posA": d0["position"],
-                        "posB": d1["position"],
-                    }
-                )
-
-        teams_out.append(
+        shard = shards.setdefault(
+            s["round"],
             {
-                "team": team,
-                "drivers": names,
-                "h2h": {k: dict(v) for k, v in h2h.items()},
-                "q3Count": dict(q3_count),
-                "sessions": sessions_out,
-            }
+                "season": season,
+                "round": s["round"],
+                "gp": s["gp"],
+                "shortName": s["shortName"],
+                "sessions": [],
+            },
         )
-    return teams_out
-
-
-def main() -> int:
-    cal = load_calendar()
-    played = set(load_played_gp_names())
+        shard["sessions"].append(s)
+    rounds = [
+        {
+            "round": rnd,
+            "gp": shard["gp"],
+            "shortName": shard["shortName"],
+            "types": [s["type"] for s in shard["sessions"]],
+            "shard": shard_name(rnd),
+        }
+        for rnd, shard in shards.items()
+    ]
+    summary = {
+        "season": season,
+        "generatedAt": generated_at,
+        "rounds": rounds,
+        "teammates": teammates,
+    }
+    return summary, shards
+
+
+def write_outputs(season: int, summary: dict, shards: dict[int, dict]) -> None:
+    """Écrit le résumé et les fichiers par GP (web/ puis docs/) ; retire les GP disparus."""
+    files = {"qualifying": summary, **{shard_name(r): shard for r, shard in shards.items()}}
+    for name, payload in files.items():
+        text = json.dumps(payload, ensure_ascii=False, indent=2) + "\n"
+        for target in seasons.output_paths(season, name):
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(text, encoding="utf-8")
+    for target in seasons.output_paths(season, "qualifying"):
+        keep = {f"r{r:02d}.json" for r in shards}
+        shard_dir = target.with_suffix("")
+        for stale in shard_dir.glob("r[0-9][0-9].json"):  # pas les copies hashées
+            if stale.name not in keep:
+                stale.unlink()
+        print(f"[OK] {target.relative_to(ROOT)} (+ {len(shards)} GP dans {shard_dir.name}/)")
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Construit data/<season>/qualifying.json.")
+    parser.add_argument("--season", type=int, default=seasons.CURRENT_SEASON)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--refresh-round",
+        type=int,
+        action="append",
+        default=[],
+        metavar="N",
+        help="Recharge les sessions du GP N même si elles sont déjà stockées (répétable)",
+    )
+    mode.add_argument(
+        "--full",
+        action="store_true",
+        help="Recharge toutes les sessions courues (ignore le fichier existant)",
+    )
+    return parser.parse_args(argv)
+
+
+@reported("build_qualifying_data")
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    season = args.season
+    cal = load_calendar(season)
+    played = set(load_played_gp_names(season))
     rounds_in_scope = [r for r in cal["rounds"] if r["name"] in played]
     print(f"[INFO] {len(rounds_in_scope)} GP joués détectés")
 
-    previous_sessions = load_previous_sessions()
+    previous_sessions = load_previous_sessions(season)
 
     def append_or_fallback(sessions_data: list, meta: dict, drivers: list | None) -> None:
         """Ajoute la session ou, si le chargement a échoué, réutilise la précédente."""
@@ -260,6 +316,37 @@ def main() -> int:
                 file=sys.stderr,
             )
 
+    # Chargement concurrent des seules sessions à (re)charger (Q + SQ des week-ends sprint)
+    to_load = sessions_to_load(
+        rounds_in_scope,
+        previous_sessions,
+        clock.today(),
+        full=args.full,
+        refresh_rounds=args.refresh_round,
+    )
+    print(f"[INFO] {len(to_load)} session(s) à charger, les autres reprises du fichier existant")
+    keys = []
+    for r in rounds_in_scope:
+        for stype in ("Q", "SQ"):
+            if (r["round"], stype) in to_load:
+                keys.append((season, r["round"], r["name"], stype))
+    # --full / --refresh-round : rechargées depuis FastF1, pas relues dans le store
+    forced = set(args.refresh_round)
+
+    def load(year: int, round_no: int, gp_name: str, stype: str) -> list[dict] | None:
+        refresh = args.full or round_no in forced
+        return load_round_session(year, round_no, gp_name, stype, refresh=refresh)
+
+    loaded = load_many(keys, load) if keys else {}
+
+    def session(r: dict, meta: dict) -> None:
+        key = (season, r["round"], r["name"], meta["type"])
+        if key in loaded:
+            print(f"  - {r['shortName']} ({meta['type']})")
+            append_or_fallback(sessions_data, meta, loaded[key].value)
+        else:
+            sessions_data.append(previous_sessions[(r["round"], meta["type"])])
+
     sessions_data: list[dict] = []
     for r in rounds_in_scope:
         is_sprint = bool(r.get("isSprint", False))
@@ -270,27 +357,16 @@ def main() -> int:
             "type": "Q",
         }
         # Session principale : Qualifying
-        print(f"  - {r['shortName']} (Q)")
-        append_or_fallback(sessions_data, meta_q, load_round_session(SEASON, r["name"], "Q"))
+        session(r, meta_q)
         # Sprint Qualifying (uniquement week-ends sprint)
         if is_sprint:
-            meta_sq = {**meta_q, "type": "SQ"}
-            print(f"  - {r['shortName']} (SQ)")
-            append_or_fallback(sessions_data, meta_sq, load_round_session(SEASON, r["name"], "SQ"))
+            session(r, {**meta_q, "type": "SQ"})
 
     teammates = build_teammate_pairs(sessions_data)
 
-    payload = {
-        "season": SEASON,
-        "generatedAt": date.today().isoformat(),
-        "sessions": sessions_data,
-        "teammates": teammates,
-    }
-    text = json.dumps(payload, ensure_ascii=False, indent=2) + "\n"
-    for target in (OUT_WEB, OUT_DOCS):
-        target.parent.mkdir(parents=True, exist_ok=True)
-        target.write_text(text, encoding="utf-8")
-        print(f"[OK] {target.relative_to(ROOT)}")
+    summary, shards = split_payload(season, clock.today().isoformat(), sessions_data, teammates)
+    write_outputs(season, summary, shards)
+    seasons.write_index()
     return 0
 
 
@@ -0,0 +1,111 @@
+"""État de build incrémental : saute les étapes dont les entrées n'ont pas changé.
+
+Pour chaque étape, on calcule une clé = hash du contenu de ses entrées
+(fichiers ou dossiers), du script builder et d'une empreinte optionnelle
+pour les données hors fichiers (résultats FastF1). Après un succès, la clé et
+le hash des fichiers produits sont enregistrés dans build_state.json.
+
+Au run suivant, une étape est "inchangée" (non relancée) si :
+    - sa clé est identique à celle enregistrée,
+    - toutes ses sorties existent et les fichiers n'ont pas été modifiés depuis.
+
+On hashe le contenu et non les mtimes : le workflow repart d'un checkout git
+neuf à chaque run (les mtimes ne sont pas conservés), l'état est committé
+avec les données.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parents[1]
+STATE_PATH = HERE / "build_state.json"
+STATE_VERSION = 1
+
+_IGNORED_DIRS = {"__pycache__", ".pytest_cache"}
+
+
+def hash_path(path: Path) -> str | None:
+    """sha256 du contenu d'un fichier, ou d'un dossier (chemins relatifs + contenus).
+
+    Retourne None si le chemin n'existe pas.
+    """
+    h = hashlib.sha256()
+    if path.is_file():
+        h.update(path.read_bytes())
+        return h.hexdigest()
+    if path.is_dir():
+        for p in sorted(path.rglob("*")):
+            if not p.is_file() or _IGNORED_DIRS & set(p.relative_to(path).parts):
+                continue
+            h.update(p.relative_to(path).as_posix().encode("utf-8"))
+            h.update(b"\0")
+            h.update(p.read_bytes())
+            h.update(b"\0")
+        return h.hexdigest()
+    return None
+
+
+def _rel(path: Path) -> str:
+    try:
+        return path.resolve().relative_to(ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+class BuildState:
+    def __init__(self, path: Path = STATE_PATH, force: bool = False):
+        self.path = path
+        self.force = force
+        self.steps: dict[str, dict] = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                if data.get("version") == STATE_VERSION:
+                    self.steps = data.get("steps", {})
+            except (OSError, json.JSONDecodeError):
+                self.steps = {}
+
+    def key(self, step) -> str:
+        """Clé de contenu des entrées d'une étape (entrées + script + empreinte)."""
+        h = hashlib.sha256()
+        sources = list(step.inputs)
+        if step.script is not None:
+            sources.append(step.script)
+        for src in sources:
+            h.update(_rel(src).encode("utf-8"))
+            h.update(b"=")
+            h.update((hash_path(src) or "absent").encode("ascii"))
+            h.update(b"\n")
+        if step.fingerprint is not None:
+            h.update(b"fingerprint=")
+            h.update(step.fingerprint().encode("utf-8"))
+        return h.hexdigest()
+
+    def is_fresh(self, step, key: str) -> bool:
+        """True si l'étape peut être sautée (mêmes entrées, sorties intactes)."""
+        if self.force:
+            return False
+        entry = self.steps.get(step.name)
+        if not entry or entry.get("key") != key:
+            return False
+        recorded = entry.get("outputs", {})
+        for out in step.outputs:
+            if not out.exists():
+                return False
+            if out.is_file() and recorded.get(_rel(out)) != hash_path(out):
+                return False
+        return True
+
+    def record(self, step, key: str) -> None:
+        self.steps[step.name] = {
+            "key": key,
+            "outputs": {_rel(o): hash_path(o) for o in step.outputs if o.is_file()},
+        }
+
+    def save(self) -> None:
+        payload = {"version": STATE_VERSION, "steps": dict(sorted(self.steps.items()))}
+        self.path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
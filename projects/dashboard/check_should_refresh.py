@@ -1,7 +1,8 @@
 """Décide si la pipeline de refresh doit tourner aujourd'hui.
 
-Lit calendar_<season>.json et regarde si un GP a eu lieu dans les 2 derniers
-jours (cron du lundi + filet de sécurité du mardi).
+Lit calendar_<season>.json (saison en cours, voir seasons.py) et regarde si un
+GP a eu lieu dans les 2 derniers jours (cron du lundi + filet de sécurité du
+mardi). Les saisons passées sont figées : elles ne déclenchent jamais de refresh.
 
 Le script ne s'arrête JAMAIS avec un code d'erreur — il écrit simplement la
 décision dans la variable de sortie GitHub Actions :
@@ -9,12 +10,13 @@ décision dans la variable de sortie GitHub Actions :
     should-refresh=false  → on saute
 
 Utilisation locale (debug) :
-    python projects/dashboard/check_should_refresh.py
+    python projects/dashboard/check_should_refresh.py [--season 2026]
         → affiche la décision sur stdout
 """
 
 from __future__ import annotations
 
+import argparse
 import json
 import os
 import sys
@@ -22,16 +24,29 @@ from datetime import date, timedelta
 from pathlib import Path
 
 HERE = Path(__file__).resolve().parent
-CALENDAR_PATH = HERE / "calendar_2026.json"
+ROOT = HERE.parents[1]
+
+# Racine du repo sur sys.path (pour importer projects.dashboard quand lancé en script)
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from projects.common import clock  # noqa: E402
+from projects.dashboard import seasons  # noqa: E402
+
 LOOKBACK_DAYS = 2  # accepte les GP de J-1 et J-2 (lundi + mardi en filet)
 
 
-def should_refresh(today: date | None = None) -> tuple[bool, str]:
-    today = today or date.today()
-    if not CALENDAR_PATH.exists():
-        return False, f"calendar introuvable ({CALENDAR_PATH})"
+def should_refresh(
+    today: date | None = None, season: int = seasons.CURRENT_SEASON
+) -> tuple[bool, str]:
+    today = today or clock.today()
+    if seasons.is_frozen(season):
+        return False, f"saison {season} figée (archive)"
+    calendar_path = seasons.calendar_path(season)
+    if not calendar_path.exists():
+        return False, f"calendar introuvable ({calendar_path})"
 
-    data = json.loads(CALENDAR_PATH.read_text(encoding="utf-8"))
+    data = json.loads(calendar_path.read_text(encoding="utf-8"))
     window = {today - timedelta(days=d) for d in range(1, LOOKBACK_DAYS + 1)}
 
     for r in data.get("rounds", []):
@@ -48,8 +63,10 @@ def should_refresh(today: date | None = None) -> tuple[bool, str]:
     return False, f"aucun GP dans les {LOOKBACK_DAYS} derniers jours (today={today.isoformat()})"
 
 
-def main() -> int:
-    ok, reason = should_refresh()
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Décide si la pipeline doit tourner.")
+    parser.add_argument("--season", type=int, default=seasons.CURRENT_SEASON)
+    ok, reason = should_refresh(season=parser.parse_args(argv).season)
     print(f"should-refresh={'true' if ok else 'false'} — {reason}")
 
     gh_out = os.environ.get("GITHUB_OUTPUT")
@@ -1,4 +1,6 @@
-"""Régénère calendar_2026.json depuis FastF1.
+"""Régénère calendar_<season>.json depuis FastF1 (saison en cours par défaut).
+
+    python projects/dashboard/fetch_calendar.py [--season 2027]
 
 À lancer ponctuellement (idéalement une seule fois en début de saison, et si le
 calendrier officiel évolue). Le fichier produit est ensuite consommé par
@@ -11,6 +13,7 @@ Convention des noms de GP : alignée sur race_chart_builder._col_name :
 
 from __future__ import annotations
 
+import argparse
 import json
 import sys
 from pathlib import Path
@@ -18,8 +21,14 @@ from pathlib import Path
 import fastf1
 
 HERE = Path(__file__).resolve().parent
-OUT = HERE / "calendar_2026.json"
-SEASON = 2026
+ROOT = HERE.parents[1]
+
+# Racine du repo sur sys.path (pour importer projects.common quand lancé en script)
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from projects.common.fastf1_cache import enable_cache  # noqa: E402
+from projects.dashboard import seasons  # noqa: E402
 
 DUAL_LOCATION_COUNTRIES = {"United States", "USA", "Italy"}
 
@@ -58,8 +67,12 @@ def short_name(name: str, location: str) -> str:
     return SHORT_NAMES.get(name) or location or name
 
 
-def main() -> int:
-    schedule = fastf1.get_event_schedule(SEASON, include_testing=False)
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Régénère calendar_<season>.json.")
+    parser.add_argument("--season", type=int, default=seasons.CURRENT_SEASON)
+    season = parser.parse_args(argv).season
+    enable_cache()
+    schedule = fastf1.get_event_schedule(season, include_testing=False)
     rounds = []
     for _, row in schedule.iterrows():
         country = str(row.get("Country", ""))
@@ -76,12 +89,13 @@ def main() -> int:
         )
 
     payload = {
-        "season": SEASON,
+        "season": season,
         "totalRaces": len(rounds),
         "rounds": rounds,
     }
-    OUT.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
-    print(f"[OK] {OUT.relative_to(HERE.parents[1])} ({len(rounds)} GP)")
+    out = seasons.calendar_path(season)
+    out.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    print(f"[OK] {out.relative_to(ROOT)} ({len(rounds)} GP)")
     return 0
 
 
@@ -0,0 +1,149 @@
+"""Ordonnanceur de la pipeline : graphe d'étapes déclarant entrées et sorties.
+
+Chaque étape (`Step`) déclare les fichiers qu'elle lit (`inputs`) et ceux
+qu'elle produit (`outputs`). Une étape B dépend d'une étape A dès qu'une entrée
+de B est une sortie de A ; une entrée produite par aucune étape est externe
+(calendrier, driver_images.json…) et n'impose aucun ordre.
+
+`run_graph` lance en parallèle, dans la limite de `jobs` workers, toutes les
+étapes dont les dépendances sont satisfaites. Au premier échec, plus aucune
+étape n'est démarrée (comportement historique de build_all.py) : celles déjà
+en cours se terminent, les autres sont marquées "blocked".
+
+Avec un `state` (voir build_state.py), une étape dont les entrées n'ont pas
+changé depuis le dernier succès n'est pas relancée (statut "unchanged").
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+# Statuts possibles d'une étape à l'issue de run_graph
+OK = "ok"
+FAILED = "failed"
+SKIPPED = "skipped"
+UNCHANGED = "unchanged"
+BLOCKED = "blocked"
+
+
+@dataclass
+class Step:
+    name: str
+    label: str
+    action: Callable[[], bool]
+    inputs: list[Path] = field(default_factory=list)
+    outputs: list[Path] = field(default_factory=list)
+    fetch: bool = False  # interroge FastF1 (sautée par --skip-fetch)
+    script: Path | None = None  # script builder lancé par l'étape, le cas échéant
+    # Empreinte des entrées hors fichiers (ex. rounds FastF1 terminés), pour build_state
+    fingerprint: Callable[[], str] | None = None
+
+
+def resolve_dependencies(steps: Iterable[Step]) -> dict[str, set[str]]:
+    """Retourne { nom d'étape : noms des étapes qui produisent ses entrées }."""
+    steps = list(steps)
+    producers: dict[Path, str] = {}
+    for s in steps:
+        for out in s.outputs:
+            if out in producers:
+                raise ValueError(
+                    f"Sortie produite par deux étapes ({producers[out]}, {s.name}) : {out}"
+                )
+            producers[out] = s.name
+
+    deps: dict[str, set[str]] = {}
+    for s in steps:
+        deps[s.name] = {producers[i] for i in s.inputs if i in producers and producers[i] != s.name}
+    return deps
+
+
+def topological_order(steps: Iterable[Step]) -> list[str]:
+    """Ordre d'exécution séquentiel valide (stable vis-à-vis de la déclaration).
+
+    Lève ValueError si le graphe contient un cycle.
+    """
+    steps = list(steps)
+    deps = resolve_dependencies(steps)
+    done: list[str] = []
+    remaining = [s.name for s in steps]
+    while remaining:
+        ready = [n for n in remaining if deps[n] <= set(done)]
+        if not ready:
+            raise ValueError(f"Cycle dans le graphe d'étapes : {', '.join(remaining)}")
+        done.append(ready[0])
+        remaining.remove(ready[0])
+    return done
+
+
+def run_graph(
+    steps: Iterable[Step], jobs: int = 1, skip: Iterable[str] = (), state=None
+) -> dict[str, str]:
+    """Exécute le graphe et retourne { nom d'étape : statut }.
+
+    `skip` : étapes à ne pas exécuter ; leurs sorties sont supposées déjà
+    présentes sur disque, les étapes dépendantes tournent donc normalement.
+    `state` : BuildState optionnel. La clé d'entrées d'une étape est calculée
+    au moment de la lancer (ses dépendances ont alors produit leurs sorties) ;
+    elle n'est enregistrée qu'en cas de succès.
+    """
+    steps = list(steps)
+    by_name = {s.name: s for s in steps}
+    deps = resolve_dependencies(steps)
+    order = topological_order(steps)
+    skip = set(skip)
+
+    status: dict[str, str] = {}
+    pending = list(order)
+    running: dict = {}
+    keys: dict[str, str] = {}
+    failed = False
+
+    def satisfied(name: str) -> bool:
+        return all(status.get(d) in (OK, SKIPPED, UNCHANGED) for d in deps[name])
+
+    def launch_ready(pool: ThreadPoolExecutor) -> None:
+        # Boucle : une étape sautée peut débloquer immédiatement ses dépendantes
+        progressed = True
+        while progressed:
+            progressed = False
+            for name in [n for n in pending if satisfied(n)]:
+                progressed = True
+                pending.remove(name)
+                step = by_name[name]
+                if name in skip:
+                    print(f"\n>>> {step.label} (sauté)")
+                    status[name] = SKIPPED
+                    continue
+                if state is not None:
+                    keys[name] = state.key(step)
+                    if state.is_fresh(step, keys[name]):
+                        print(f"\n>>> {step.label} (entrées inchangées)")
+                        status[name] = UNCHANGED
+                        continue
+                running[pool.submit(step.action)] = name
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while True:
+            if not failed:
+                launch_ready(pool)
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                name = running.pop(fut)
+                try:
+                    ok = bool(fut.result())
+                except Exception as e:
+                    print(f"    [ECHEC {name}] {e}")
+                    ok = False
+                status[name] = OK if ok else FAILED
+                failed = failed or not ok
+                if ok and state is not None:
+                    state.record(by_name[name], keys[name])
+
+    for name in pending:
+        status[name] = BLOCKED
+    return status
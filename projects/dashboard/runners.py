@@ -0,0 +1,246 @@
+"""Exécution d'un builder de la pipeline : sous-processus ou in-process.
+
+Deux modes :
+    - subprocess (historique) : un `sys.executable` par étape. Isolation
+      totale, mais chaque étape ré-importe pandas / fastf1 et ré-ouvre le
+      cache FastF1 (plusieurs secondes par étape sur les runners).
+    - in-process : chaque script builder est importé UNE fois (module mis en
+      cache) puis sa fonction `main()` est appelée directement. Un échec
+      (exception, SystemExit ≠ 0) est capturé et n'interrompt que l'étape.
+
+`measure_startup` compare le coût de démarrage des deux modes (rapport
+`python projects/dashboard/build_all.py --startup-report`).
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import inspect
+import io
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from pathlib import Path
+from types import ModuleType
+from typing import Iterator
+
+PYTHON = sys.executable
+
+_print_lock = threading.Lock()
+_load_lock = threading.Lock()
+_modules: dict[Path, ModuleType] = {}
+
+
+class _ThreadLocalStream(io.TextIOBase):
+    """Proxy de sys.stdout / sys.stderr : redirige vers un buffer propre au thread.
+
+    Permet de bufferiser la sortie d'un builder in-process lancé dans un worker
+    sans toucher aux autres threads (contextlib.redirect_stdout est global).
+    """
+
+    def __init__(self, default):
+        self._default = default
+        self._local = threading.local()
+
+    def set_buffer(self, buf: io.StringIO | None) -> None:
+        self._local.buf = buf
+
+    def write(self, s: str) -> int:
+        target = getattr(self._local, "buf", None) or self._default
+        return target.write(s)
+
+    def flush(self) -> None:
+        target = getattr(self._local, "buf", None) or self._default
+        target.flush()
+
+
+def _install_thread_streams() -> tuple[_ThreadLocalStream, _ThreadLocalStream]:
+    with _load_lock:
+        if not isinstance(sys.stdout, _ThreadLocalStream):
+            sys.stdout = _ThreadLocalStream(sys.stdout)
+        if not isinstance(sys.stderr, _ThreadLocalStream):
+            sys.stderr = _ThreadLocalStream(sys.stderr)
+    return sys.stdout, sys.stderr
+
+
+@contextmanager
+def locked_output() -> Iterator[None]:
+    """Bloc de sortie atomique : les autres étapes (threads) n'impriment qu'après lui."""
+    with _print_lock:
+        yield
+
+
+def _print_block(header: list[str], output: str, ok: bool, code: int) -> None:
+    with _print_lock:
+        print("\n".join(header))
+        if output:
+            print(output.rstrip("\n"))
+        print(f"    {'[OK]' if ok else f'[ECHEC code={code}]'}")
+
+
+def run_subprocess(
+    label: str,
+    cmd: list[str],
+    cwd: Path | None = None,
+    capture: bool = False,
+    env: dict[str, str] | None = None,
+) -> bool:
+    """Lance un builder en sous-processus.
+
+    `capture=True` (mode parallèle) : la sortie est bufferisée puis affichée
+    d'un bloc à la fin de l'étape, pour ne pas entrelacer les logs.
+    """
+    header = [f"\n>>> {label}", f"    $ {' '.join(str(c) for c in cmd)}"]
+    if cwd:
+        header.append(f"    cwd={cwd}")
+    if not capture:
+        print("\n".join(header))
+        result = subprocess.run(cmd, cwd=cwd, env=env)
+        _print_block([], "", result.returncode == 0, result.returncode)
+        return result.returncode == 0
+
+    with _print_lock:
+        print(f"\n>>> {label} (démarrée)")
+    result = subprocess.run(cmd, cwd=cwd, env=env, capture_output=True, text=True)
+    output = (result.stdout or "") + (result.stderr or "")
+    _print_block(header, output, result.returncode == 0, result.returncode)
+    return result.returncode == 0
+
+
+def load_builder(path: Path) -> ModuleType:
+    """Importe un script builder une seule fois (cache par chemin).
+
+    Le dossier du script est ajouté à sys.path : certains builders importent
+    leurs voisins à plat (ex. lead_main.py → `from exporter_lead import ...`).
+    Le nom de module est préfixé par le projet pour éviter les collisions
+    (trois `sync_to_docs.py` coexistent).
+    """
+    path = Path(path).resolve()
+    with _load_lock:
+        if path in _modules:
+            return _modules[path]
+        if str(path.parent) not in sys.path:
+            sys.path.insert(0, str(path.parent))
+        name = f"_builder_{path.parent.name}_{path.stem}"
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+        _modules[path] = module
+        return module
+
+
+def call_main(module: ModuleType, argv: list[str]) -> int:
+    """Appelle `module.main(argv)` et ramène le résultat à un code retour.
+
+    Les `main()` sans paramètre (dashboard, sync…) sont appelés sans argument ;
+    les autres reçoivent toujours `argv`, même vide, pour ne jamais relire le
+    sys.argv de build_all.py.
+    """
+    takes_argv = bool(inspect.signature(module.main).parameters)
+    try:
+        rc = module.main(argv) if takes_argv else module.main()
+    except SystemExit as e:
+        rc = e.code
+    if rc is None:
+        return 0
+    return rc if isinstance(rc, int) else 1
+
+
+def run_inprocess(
+    label: str, path: Path, argv: list[str] | None = None, capture: bool = False
+) -> bool:
+    """Exécute le `main()` d'un builder dans le process courant.
+
+    Toute exception (import compris) est capturée : l'étape échoue, la
+    pipeline continue de gérer le graphe normalement.
+    """
+    argv = list(argv or [])
+    header = [f"\n>>> {label}", f"    [in-process] {path.name} {' '.join(argv)}".rstrip()]
+    buf = None
+    if capture:
+        with _print_lock:
+            print(f"\n>>> {label} (démarrée)")
+        out, err = _install_thread_streams()
+        buf = io.StringIO()
+        out.set_buffer(buf)
+        err.set_buffer(buf)
+    else:
+        print("\n".join(header))
+
+    try:
+        code = call_main(load_builder(path), argv)
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        if capture:
+            out.set_buffer(None)
+            err.set_buffer(None)
+
+    ok = code == 0
+    if capture:
+        _print_block(header, buf.getvalue(), ok, code)
+    else:
+        _print_block([], "", ok, code)
+    return ok
+
+
+def measure_startup(scripts: list[Path]) -> list[dict]:
+    """Mesure le coût de démarrage de chaque builder dans les deux modes.
+
+    - subprocess : nouvel interpréteur + exécution du module (imports compris,
+      sans appeler main) — coût payé à CHAQUE étape ;
+    - in-process : import du module dans le process courant — les dépendances
+      lourdes (pandas, fastf1) ne sont payées qu'au premier builder qui les
+      importe.
+    """
+    rows = []
+    for path in scripts:
+        path = Path(path).resolve()
+        code = (
+            f"import runpy, sys; sys.path.insert(0, {str(path.parent)!r}); "
+            f"runpy.run_path({str(path)!r}, run_name='__startup__')"
+        )
+        t0 = time.perf_counter()
+        proc = subprocess.run([PYTHON, "-c", code], capture_output=True)
+        sub_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        try:
+            load_builder(path)
+            inproc_s = time.perf_counter() - t0
+        except Exception:
+            inproc_s = None
+        rows.append(
+            {
+                "builder": f"{path.parent.name}/{path.name}",
+                "subprocessSec": round(sub_s, 3) if proc.returncode == 0 else None,
+                "inProcessSec": round(inproc_s, 3) if inproc_s is not None else None,
+            }
+        )
+    return rows
+
+
+def format_startup_report(rows: list[dict]) -> str:
+    def fmt(v: float | None) -> str:
+        return f"{v:8.3f}s" if v is not None else "   échec"
+
+    lines = [f"{'builder':<48} {'subprocess':>10} {'in-process':>10}"]
+    for r in rows:
+        lines.append(
+            f"{r['builder']:<48} {fmt(r['subprocessSec']):>10} {fmt(r['inProcessSec']):>10}"
+        )
+    total_sub = sum(r["subprocessSec"] or 0.0 for r in rows)
+    total_in = sum(r["inProcessSec"] or 0.0 for r in rows)
+    lines.append(f"{'TOTAL':<48} {fmt(total_sub):>10} {fmt(total_in):>10}")
+    if total_in > 0:
+        lines.append(f"Gain in-process : x{total_sub / total_in:.1f} sur le démarrage")
+    return "\n".join(lines)
@@ -0,0 +1,92 @@
+"""Saisons du dashboard : chemins par saison, saison en cours, index publié.
+
+Chaque builder prend une saison (`--season`, défaut CURRENT_SEASON) et lit /
+écrit :
+
+    projects/dashboard/calendar_<season>.json                 calendrier
+    projects/race_chart_builder/web/data/f1_race_chart_fastf1_<season>.csv
+    projects/dashboard/web/data/<season>/<nom>.json           source canonique
+    docs/data/<season>/<nom>.json                             copie publiée
+
+`data/seasons.json` (web/ et docs/) liste les saisons publiées et leurs
+fichiers ; le front y lit la saison à afficher (`?season=2025` pour une
+archive). Une saison passée déjà publiée est figée : build_all.py ne la
+reconstruit plus (sauf --force), seule la saison en cours est rafraîchie —
+le coût d'un refresh ne dépend pas du nombre de saisons archivées.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parents[1]
+
+# Saison rafraîchie par la pipeline (à incrémenter avec calendar_<season>.json)
+CURRENT_SEASON = 2026
+
+WEB_DATA = HERE / "web" / "data"
+DOCS_DATA = ROOT / "docs" / "data"
+INDEX_NAME = "seasons.json"
+
+
+def calendar_path(season: int) -> Path:
+    return HERE / f"calendar_{season}.json"
+
+
+def race_chart_csv(season: int) -> Path:
+    return (
+        ROOT
+        / "projects"
+        / "race_chart_builder"
+        / "web"
+        / "data"
+        / f"f1_race_chart_fastf1_{season}.csv"
+    )
+
+
+def output_paths(season: int, name: str) -> tuple[Path, Path]:
+    """(source canonique web/, copie docs/) du fichier `name` de la saison."""
+    return (WEB_DATA / str(season) / f"{name}.json", DOCS_DATA / str(season) / f"{name}.json")
+
+
+def published_seasons() -> list[int]:
+    """Saisons ayant au moins un fichier dans web/data/<season>/."""
+    if not WEB_DATA.is_dir():
+        return []
+    return sorted(
+        int(p.name)
+        for p in WEB_DATA.iterdir()
+        if p.is_dir() and p.name.isdigit() and any(p.iterdir())
+    )
+
+
+def is_frozen(season: int) -> bool:
+    """Saison passée déjà publiée : plus jamais reconstruite par la pipeline."""
+    return season < CURRENT_SEASON and season in published_seasons()
+
+
+def build_index() -> dict:
+    seasons = published_seasons()
+    return {
+        "current": CURRENT_SEASON,
+        "seasons": [
+            {
+                "season": s,
+                "frozen": s < CURRENT_SEASON,
+                "files": sorted(p.stem for p in (WEB_DATA / str(s)).glob("*.json")),
+            }
+            for s in sorted(seasons, reverse=True)
+        ],
+    }
+
+
+def write_index() -> dict:
+    """Réécrit `seasons.json` (web/ et docs/) d'après les dossiers de saison de web/data/."""
+    index = build_index()
+    text = json.dumps(index, ensure_ascii=False, indent=2) + "\n"
+    for data_dir in (WEB_DATA, DOCS_DATA):
+        data_dir.mkdir(parents=True, exist_ok=True)
+        (data_dir / INDEX_NAME).write_text(text, encoding="utf-8")
+    return index
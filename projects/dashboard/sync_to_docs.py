@@ -8,18 +8,90 @@ Cible publique  : docs/   (à la racine, car la dashboard est la home page)
 
 Copie additive : ne supprime rien dans docs/ — préserve les autres viz
 (race_chart_builder/, season_summary_heatmap/, ...).
+
+Publication des données : chaque `data/**/*.json` est aussi écrit minifié sous
+un nom contenant son empreinte (`2026/dashboard.<hash>.json`), avec ses
+variantes précompressées `.gz` et `.br` (module `brotli`, dans requirements.txt).
+`assets/manifest.json` (côté docs/) reçoit la table `data` nom canonique →
+nom hashé, que `fetchJson` utilise pour résoudre les URLs : un fichier hashé
+ne change jamais de contenu et peut être mis en cache sans revalidation. Les
+anciennes copies hashées d'un même fichier sont supprimées.
 """
 
 from __future__ import annotations
 
+import gzip
+import hashlib
+import json
+import re
 import shutil
 import sys
 from pathlib import Path
 
+import brotli
+
 HERE = Path(__file__).resolve().parent
 SRC = HERE / "web"
 DST = HERE.parents[1] / "docs"
 
+DATA_DIR = "data"
+MANIFEST = Path("assets") / "manifest.json"
+HASH_LEN = 10
+# Lu en parallèle du manifest (il donne la saison à afficher) : jamais hashé
+UNHASHED = {"seasons.json"}
+
+
+def minify(path: Path) -> bytes:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def hashed_name(path: Path, body: bytes) -> str:
+    return f"{path.stem}.{hashlib.sha256(body).hexdigest()[:HASH_LEN]}{path.suffix}"
+
+
+def _is_hashed(name: str) -> bool:
+    return re.search(rf"\.[0-9a-f]{{{HASH_LEN}}}\.json(\.gz|\.br)?$", name) is not None
+
+
+def write_artifacts(path: Path) -> str:
+    """Écrit la copie minifiée hashée de `path` et ses variantes compressées ; renvoie son nom."""
+    body = minify(path)
+    name = hashed_name(path, body)
+    for old in path.parent.glob(f"{path.stem}.*"):
+        if _is_hashed(old.name) and not old.name.startswith(name):
+            old.unlink()
+
+    target = path.with_name(name)
+    target.write_bytes(body)
+    # mtime=0 : .gz identique d'un run à l'autre (pas de diff sans changement de contenu)
+    target.with_name(name + ".gz").write_bytes(gzip.compress(body, compresslevel=9, mtime=0))
+    target.with_name(name + ".br").write_bytes(brotli.compress(body, quality=11))
+    return name
+
+
+def publish_data(root: Path) -> dict[str, str]:
+    """Artefacts hashés de `root/data/**/*.json` + table `data` de `root/assets/manifest.json`."""
+    data_dir = root / DATA_DIR
+    if not data_dir.is_dir():
+        return {}
+    table = {}
+    for path in sorted(data_dir.rglob("*.json")):
+        if _is_hashed(path.name) or path.name in UNHASHED:
+            continue
+        hashed = path.with_name(write_artifacts(path))
+        table[path.relative_to(root).as_posix()] = hashed.relative_to(root).as_posix()
+
+    manifest_path = root / MANIFEST
+    manifest = (
+        json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.is_file() else {}
+    )
+    manifest["data"] = table
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", "utf-8")
+    print(f"[OK] {len(table)} fichier(s) de données publiés (minifiés, hashés, .gz, .br)")
+    return table
+
 
 def main() -> int:
     if not SRC.is_dir():
@@ -40,6 +112,7 @@ def main() -> int:
 
     print(f"[OK] {copied} fichier(s) synchronisé(s)")
     print(f"     {SRC} -> {DST}")
+    publish_data(DST)
     return 0
 
 
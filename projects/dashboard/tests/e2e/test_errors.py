@@ -10,7 +10,7 @@ pytestmark = pytest.mark.e2e
 
 def test_missing_required_resource_shows_banner(page, base_url):
     # Simule l'indisponibilité d'une ressource REQUISE
-    page.route("**/dashboard_2026.json", lambda route: route.abort())
+    page.route("**/dashboard*.json", lambda route: route.abort())
     page.goto(base_url)
     banner = page.locator("#dash-error-banner")
     banner.wait_for(state="visible", timeout=10000)
@@ -19,7 +19,7 @@ def test_missing_required_resource_shows_banner(page, base_url):
 
 def test_missing_optional_resource_degrades_gracefully(page, base_url):
     # Une ressource OPTIONNELLE manquante ne doit PAS bloquer le rendu ni afficher la bannière
-    page.route("**/qualifying_2026.json", lambda route: route.abort())
+    page.route("**/qualifying*.json", lambda route: route.abort())
     page.goto(base_url)
     page.wait_for_selector(".dash-kpi")
     assert page.locator(".dash-kpi").count() == 4
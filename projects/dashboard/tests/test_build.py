@@ -9,6 +9,7 @@ import json
 from datetime import date
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 from projects.dashboard import build_dashboard_data as bd
@@ -27,9 +28,19 @@ def fake_csv(tmp_path: Path) -> Path:
     return p
 
 
+def use_csv(monkeypatch: pytest.MonkeyPatch, csv_path: Path) -> None:
+    monkeypatch.setattr(bd.seasons, "race_chart_csv", lambda season: csv_path)
+
+
+def use_data_dirs(monkeypatch: pytest.MonkeyPatch, root: Path) -> None:
+    monkeypatch.setattr(bd.seasons, "WEB_DATA", root / "web")
+    monkeypatch.setattr(bd.seasons, "DOCS_DATA", root / "docs")
+    monkeypatch.setattr(bd, "ROOT", root)
+
+
 def test_compute_kpis(fake_csv: Path) -> None:
-    rows, gps = bd.load_drivers(fake_csv)
-    kpis, last_gp = bd.compute_kpis(rows, gps)
+    points = bd.load_points(fake_csv)
+    kpis, last_gp = bd.compute_kpis(points)
     assert last_gp == "United States - Miami Gardens"
     assert kpis["leader"]["name"] == "Kimi Antonelli"
     assert kpis["leader"]["points"] == 100
@@ -42,7 +53,7 @@ def test_compute_kpis(fake_csv: Path) -> None:
 
 
 def test_build_payload_shape(fake_csv: Path, monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr(bd, "CSV_SRC", fake_csv)
+    use_csv(monkeypatch, fake_csv)
     payload = bd.build(today=date(2026, 5, 8))
     assert payload["season"] == 2026
     assert payload["generatedAt"] == "2026-05-08"
@@ -54,7 +65,7 @@ def test_build_payload_shape(fake_csv: Path, monkeypatch: pytest.MonkeyPatch) ->
 
 
 def test_payload_is_json_serialisable(fake_csv: Path, monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr(bd, "CSV_SRC", fake_csv)
+    use_csv(monkeypatch, fake_csv)
     payload = bd.build()
     json.dumps(payload, ensure_ascii=False)
 
@@ -63,8 +74,8 @@ def test_payload_is_json_serialisable(fake_csv: Path, monkeypatch: pytest.Monkey
 
 
 def test_compute_standings_drivers_ranked_and_gapped(fake_csv: Path) -> None:
-    rows, gps = bd.load_drivers(fake_csv)
-    standings = bd.compute_standings(rows, gps)
+    points = bd.load_points(fake_csv)
+    standings = bd.compute_standings(points)
     drivers = standings["drivers"]
     # Trois pilotes, triés par points décroissants
     assert [d["name"] for d in drivers] == [
@@ -83,8 +94,8 @@ def test_compute_standings_drivers_ranked_and_gapped(fake_csv: Path) -> None:
 
 
 def test_compute_standings_delta_last_gp(fake_csv: Path) -> None:
-    rows, gps = bd.load_drivers(fake_csv)
-    drivers = bd.compute_standings(rows, gps)["drivers"]
+    points = bd.load_points(fake_csv)
+    drivers = bd.compute_standings(points)["drivers"]
     by_name = {d["name"]: d for d in drivers}
     # Antonelli : 100 - 72 = 28 ; Russell : 80 - 60 = 20 ; Leclerc : 59 - 50 = 9
     assert by_name["Kimi Antonelli"]["deltaLastGp"] == 28
@@ -93,8 +104,8 @@ def test_compute_standings_delta_last_gp(fake_csv: Path) -> None:
 
 
 def test_compute_standings_constructors_aggregated(fake_csv: Path) -> None:
-    rows, gps = bd.load_drivers(fake_csv)
-    constructors = bd.compute_standings(rows, gps)["constructors"]
+    points = bd.load_points(fake_csv)
+    constructors = bd.compute_standings(points)["constructors"]
     by_team = {c["team"]: c for c in constructors}
     # Mercedes = Antonelli (100) + Russell (80) = 180 ; Ferrari = Leclerc (59)
     assert by_team["Mercedes"]["points"] == 180
@@ -105,8 +116,8 @@ def test_compute_standings_constructors_aggregated(fake_csv: Path) -> None:
 
 
 def test_compute_standings_progress_cumulative(fake_csv: Path) -> None:
-    rows, gps = bd.load_drivers(fake_csv)
-    drivers = bd.compute_standings(rows, gps)["drivers"]
+    points = bd.load_points(fake_csv)
+    drivers = bd.compute_standings(points)["drivers"]
     leader = drivers[0]  # Antonelli
     cumuls = [p["cumulative"] for p in leader["progress"]]
     gains = [p["gain"] for p in leader["progress"]]
@@ -115,14 +126,24 @@ def test_compute_standings_progress_cumulative(fake_csv: Path) -> None:
 
 
 def test_compute_standings_empty_gp_columns() -> None:
-    assert bd.compute_standings([], []) == {"drivers": [], "constructors": []}
+    empty = bd.PointsMatrix([], [], [], [], np.zeros((0, 0)))
+    assert bd.compute_standings(empty) == {"drivers": [], "constructors": []}
+
+
+def test_points_matrix_round_winners(fake_csv: Path) -> None:
+    points = bd.load_points(fake_csv)
+    assert points.cumulative.shape == (len(points.drivers), len(points.rounds))
+    np.testing.assert_array_equal(points.gains.cumsum(axis=1), points.cumulative)
+    winners = [points.drivers[i] for i in points.round_winners()]
+    assert len(winners) == len(points.rounds)
+    assert winners[-1] == bd.compute_kpis(points)[0]["lastWinner"]["name"]
 
 
 # ---------- Calendrier & collision "Spain" ----------
 
 
 def test_calendar_status_and_winner(fake_csv: Path, monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr(bd, "CSV_SRC", fake_csv)
+    use_csv(monkeypatch, fake_csv)
     payload = bd.build(today=date(2026, 5, 8))
     cal = {c["name"]: c for c in payload["calendar"]}
     # Les 4 GP du CSV sont "played" avec un vainqueur
@@ -138,7 +159,7 @@ def test_spain_collision_two_distinct_rounds(
     fake_csv: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
     """Les deux GP espagnols (Barcelone r7 / Madrid r14) doivent rester distincts."""
-    monkeypatch.setattr(bd, "CSV_SRC", fake_csv)
+    use_csv(monkeypatch, fake_csv)
     payload = bd.build(today=date(2026, 5, 8))
     spain_entries = [c for c in payload["calendar"] if c["name"].startswith("Spain")]
     # Deux entrées distinctes, jamais fusionnées
@@ -152,9 +173,107 @@ def test_spain_collision_two_distinct_rounds(
 
 
 def test_calendar_covers_full_season(fake_csv: Path, monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr(bd, "CSV_SRC", fake_csv)
+    use_csv(monkeypatch, fake_csv)
     payload = bd.build(today=date(2026, 5, 8))
     assert len(payload["calendar"]) == payload["kpis"]["totalRaces"]
     # Rounds uniques et séquentiels
     rounds = sorted(c["round"] for c in payload["calendar"])
     assert rounds == list(range(1, len(rounds) + 1))
+
+
+# ---------- Patch incrémental ----------
+
+
+def test_patch_matches_full_rebuild(fake_csv: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    lines = fake_csv.read_text(encoding="utf-8").splitlines()
+    before = fake_csv.parent / "before.csv"
+    before.write_text("\n".join(line.rsplit(",", 1)[0] for line in lines) + "\n", encoding="utf-8")
+    use_csv(monkeypatch, before)
+    previous = bd.build(today=date(2026, 5, 8))
+
+    use_csv(monkeypatch, fake_csv)
+    payload, patched = bd.build_or_patch(previous, today=date(2026, 5, 8), check=True)
+    assert patched
+    assert payload == bd.build(today=date(2026, 5, 8))
+    assert payload["calendar"][3]["status"] == "played"
+
+
+def test_patch_falls_back_when_history_differs(
+    fake_csv: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    use_csv(monkeypatch, fake_csv)
+    current = bd.build(today=date(2026, 5, 8))
+    # Même CSV : aucun GP à ajouter → reconstruction complète
+    assert bd.patch(current, bd.load_points(fake_csv), bd.load_calendar()) is None
+    payload, patched = bd.build_or_patch(current, today=date(2026, 5, 8))
+    assert not patched and payload == current
+
+
+def test_patch_falls_back_when_earlier_round_corrected(
+    fake_csv: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Payload publié avant une pénalité : Leclerc avait 10 pts de plus dès la Chine
+    before = fake_csv.parent / "before.csv"
+    before.write_text(
+        "Pilote,image,team,start,Australia,China,Japan\n"
+        "Kimi Antonelli,img,Mercedes,0,18.0,47.0,72.0\n"
+        "George Russell,img,Mercedes,0,15.0,40.0,60.0\n"
+        "Charles Leclerc,img,Ferrari,0,12.0,40.0,60.0\n",
+        encoding="utf-8",
+    )
+    use_csv(monkeypatch, before)
+    previous = bd.build(today=date(2026, 5, 8))
+
+    use_csv(monkeypatch, fake_csv)
+    points = bd.load_points(fake_csv)
+    assert bd.patch(previous, points, bd.load_calendar()) is None
+    payload, patched = bd.build_or_patch(previous, today=date(2026, 5, 8))
+    assert not patched and payload == bd.build(today=date(2026, 5, 8))
+
+    # Historique juste mais vainqueur d'un GP antérieur altéré : pas de patch non plus
+    good_before = fake_csv.parent / "good_before.csv"
+    lines = fake_csv.read_text(encoding="utf-8").splitlines()
+    good_before.write_text(
+        "\n".join(line.rsplit(",", 1)[0] for line in lines) + "\n", encoding="utf-8"
+    )
+    use_csv(monkeypatch, good_before)
+    previous = bd.build(today=date(2026, 5, 8))
+    assert bd.patch(previous, points, bd.load_calendar()) is not None
+    previous["calendar"][0]["winner"] = {"name": "George Russell", "team": "Mercedes"}
+    assert bd.patch(previous, points, bd.load_calendar()) is None
+
+
+def test_diff_payloads_reports_paths() -> None:
+    a = {"kpis": {"leaderGap": 3}, "calendar": [{"status": "next"}]}
+    b = {"kpis": {"leaderGap": 4}, "calendar": [{"status": "next"}]}
+    assert bd.diff_payloads(a, a) == []
+    assert bd.diff_payloads(a, b) == ["$.kpis.leaderGap"]
+
+
+# ---------- Schéma compact ----------
+
+
+def test_compact_schema_round_trip(fake_csv: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    use_csv(monkeypatch, fake_csv)
+    payload = bd.build(today=date(2026, 5, 8))
+    compact = bd.encode_compact(payload)
+    assert compact["schema"] == bd.COMPACT_SCHEMA
+    assert compact["rounds"][0] == ["Australia", "Australia"]
+    assert compact["drivers"][0]["cumulative"] == [18, 47, 72, 100]
+    assert compact["teams"] == ["Mercedes", "Ferrari"]
+    assert bd.decode_compact(compact) == payload
+    assert bd.decode_compact(payload) is payload
+    assert len(json.dumps(compact)) < len(json.dumps(payload))
+
+
+def test_patch_from_compact_output(
+    fake_csv: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    use_csv(monkeypatch, fake_csv)
+    use_data_dirs(monkeypatch, tmp_path)
+    assert bd.main(["--compact"]) == 0
+    web_json = tmp_path / "web" / "2026" / "dashboard.json"
+    text = web_json.read_text(encoding="utf-8")
+    assert "\n" not in text.rstrip("\n")
+    previous = bd.load_previous(web_json)
+    assert previous["standings"]["drivers"][0]["progress"][-1]["cumulative"] == 100
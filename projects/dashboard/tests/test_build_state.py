@@ -0,0 +1,112 @@
+"""Tests du build incrémental (hash des entrées, étapes inchangées, --force)."""
+
+from __future__ import annotations
+
+import json
+from datetime import date
+from pathlib import Path
+
+from projects.dashboard import build_all
+from projects.dashboard import build_state as bs
+from projects.dashboard import pipeline as pl
+
+
+def _copy_step(src: Path, dst: Path, calls: list[str]) -> pl.Step:
+    def action() -> bool:
+        calls.append("copy")
+        dst.write_text(src.read_text(encoding="utf-8"), encoding="utf-8")
+        return True
+
+    return pl.Step("copy", "copy", action, inputs=[src], outputs=[dst])
+
+
+def test_hash_path_directory_depends_on_content(tmp_path: Path) -> None:
+    d = tmp_path / "web"
+    (d / "data").mkdir(parents=True)
+    (d / "data" / "a.json").write_text("{}", encoding="utf-8")
+    h1 = bs.hash_path(d)
+    (d / "data" / "a.json").write_text('{"x": 1}', encoding="utf-8")
+    assert bs.hash_path(d) != h1
+    assert bs.hash_path(tmp_path / "absent") is None
+
+
+def test_unchanged_inputs_skip_the_step(tmp_path: Path) -> None:
+    src, dst = tmp_path / "src.csv", tmp_path / "dst.csv"
+    src.write_text("a,b\n1,2\n", encoding="utf-8")
+    calls: list[str] = []
+    state_path = tmp_path / "state.json"
+
+    state = bs.BuildState(state_path)
+    assert pl.run_graph([_copy_step(src, dst, calls)], state=state) == {"copy": pl.OK}
+    state.save()
+
+    # Second run : mêmes entrées → étape non relancée
+    state = bs.BuildState(state_path)
+    assert pl.run_graph([_copy_step(src, dst, calls)], state=state) == {"copy": pl.UNCHANGED}
+    assert calls == ["copy"]
+
+    # Entrée modifiée → relance
+    src.write_text("a,b\n1,3\n", encoding="utf-8")
+    assert pl.run_graph([_copy_step(src, dst, calls)], state=state) == {"copy": pl.OK}
+    assert calls == ["copy", "copy"]
+
+
+def test_tampered_or_missing_output_forces_rebuild(tmp_path: Path) -> None:
+    src, dst = tmp_path / "src.csv", tmp_path / "dst.csv"
+    src.write_text("x\n", encoding="utf-8")
+    calls: list[str] = []
+    state = bs.BuildState(tmp_path / "state.json")
+    pl.run_graph([_copy_step(src, dst, calls)], state=state)
+
+    dst.write_text("edited by hand\n", encoding="utf-8")
+    assert pl.run_graph([_copy_step(src, dst, calls)], state=state) == {"copy": pl.OK}
+    dst.unlink()
+    assert pl.run_graph([_copy_step(src, dst, calls)], state=state) == {"copy": pl.OK}
+    assert len(calls) == 3
+
+
+def test_force_ignores_state(tmp_path: Path) -> None:
+    src, dst = tmp_path / "src.csv", tmp_path / "dst.csv"
+    src.write_text("x\n", encoding="utf-8")
+    calls: list[str] = []
+    state = bs.BuildState(tmp_path / "state.json")
+    pl.run_graph([_copy_step(src, dst, calls)], state=state)
+    state.force = True
+    assert pl.run_graph([_copy_step(src, dst, calls)], state=state) == {"copy": pl.OK}
+
+
+# ---------- Empreinte FastF1 (sans réseau) ----------
+
+
+def _calendar(tmp_path: Path) -> Path:
+    p = tmp_path / "calendar.json"
+    p.write_text(
+        json.dumps(
+            {
+                "rounds": [
+                    {"round": 1, "date": "2026-03-08"},
+                    {"round": 2, "date": "2026-03-15"},
+                    {"round": 3, "date": "2026-03-29"},
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    return p
+
+
+def test_fingerprint_stable_between_races(tmp_path: Path) -> None:
+    cal = _calendar(tmp_path)
+    # Aucun GP dans la fenêtre de propagation : même empreinte d'un jour à l'autre
+    a = build_all.fastf1_fingerprint(cal, today=date(2026, 3, 20))
+    b = build_all.fastf1_fingerprint(cal, today=date(2026, 3, 24))
+    assert a == b
+    # Un nouveau GP couru change l'empreinte
+    assert build_all.fastf1_fingerprint(cal, today=date(2026, 4, 5)) != a
+
+
+def test_fingerprint_changes_daily_while_results_settle(tmp_path: Path) -> None:
+    cal = _calendar(tmp_path)
+    monday = build_all.fastf1_fingerprint(cal, today=date(2026, 3, 16))
+    tuesday = build_all.fastf1_fingerprint(cal, today=date(2026, 3, 17))
+    assert monday != tuesday
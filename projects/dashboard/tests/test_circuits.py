@@ -0,0 +1,96 @@
+"""Tests du builder circuits (checkpoints, reprise, pool de process) sans FastF1."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from projects.dashboard import build_circuits_data as bc
+
+YEARS = [2025, 2024, 2023]
+ROUNDS = [
+    {"round": 1, "name": "Australia", "shortName": "Australia"},
+    {"round": 2, "name": "China", "shortName": "China", "isSprint": True},
+    {"round": 3, "name": "Madrid", "shortName": "Madrid", "fastf1Name": None},
+]
+
+
+def fake_build(gp: dict, years: list[int], checkpoint_dir: Path) -> bool:
+    """Builder factice (module-level : picklable pour le pool de process)."""
+    if gp["name"] == "China":
+        raise RuntimeError("télémétrie indisponible")
+    track = None if gp.get("fastf1Name", gp["name"]) is None else [[0.0, 0.0], [1.0, 1.0]]
+    circuit = {"gpName": gp["name"], "round": gp["round"], "trackPath": track}
+    bc.write_checkpoint(checkpoint_dir, gp, years, circuit)
+    return bc.is_complete(gp, circuit)
+
+
+def test_checkpoints_resume_and_assemble(tmp_path: Path) -> None:
+    counts = bc.run_circuits(ROUNDS, YEARS, tmp_path, processes=1, build=fake_build)
+    assert counts == {"built": 2, "skipped": 0, "failed": 1}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["r01.json", "r03.json"]
+    assert list(bc.assemble(ROUNDS, YEARS, tmp_path)) == ["Australia", "Madrid"]
+
+    # Reprise : seul le circuit en échec est relancé
+    built: list[str] = []
+
+    def record(gp: dict, years: list[int], checkpoint_dir: Path) -> bool:
+        built.append(gp["name"])
+        bc.write_checkpoint(checkpoint_dir, gp, years, {"gpName": gp["name"], "trackPath": []})
+        return True
+
+    counts = bc.run_circuits(ROUNDS, YEARS, tmp_path, processes=1, resume=True, build=record)
+    assert built == ["China"] and counts["skipped"] == 2
+    assert list(bc.assemble(ROUNDS, YEARS, tmp_path)) == ["Australia", "China", "Madrid"]
+
+    # Entrée de calendrier modifiée ou autre historique : checkpoint invalidé
+    moved = [{**ROUNDS[0], "fastf1Name": "Melbourne"}, *ROUNDS[1:]]
+    assert bc.pending_circuits(moved, YEARS, tmp_path, resume=True) == moved[:1]
+    assert bc.pending_circuits(ROUNDS, [2024, 2023, 2022], tmp_path, resume=True) == ROUNDS
+    assert bc.pending_circuits(ROUNDS, YEARS, tmp_path, resume=False) == ROUNDS
+
+
+def test_incomplete_circuit_is_rebuilt_on_resume(tmp_path: Path) -> None:
+    gp = ROUNDS[0]
+    bc.write_checkpoint(tmp_path, gp, YEARS, {"gpName": gp["name"], "trackPath": None})
+    assert bc.pending_circuits(ROUNDS[:1], YEARS, tmp_path, resume=True) == [gp]
+    # Pas d'historique FastF1 : fiche sans tracé complète
+    madrid = ROUNDS[2]
+    bc.write_checkpoint(tmp_path, madrid, YEARS, {"gpName": "Madrid", "trackPath": None})
+    assert bc.pending_circuits([madrid], YEARS, tmp_path, resume=True) == []
+
+
+def test_circuits_process_pool(tmp_path: Path) -> None:
+    counts = bc.run_circuits(ROUNDS, YEARS, tmp_path, processes=2, build=fake_build)
+    assert counts == {"built": 2, "skipped": 0, "failed": 1}
+    assert list(bc.assemble(ROUNDS, YEARS, tmp_path)) == ["Australia", "Madrid"]
+
+
+def test_failed_circuit_keeps_published_file(tmp_path: Path, monkeypatch) -> None:
+    calendar = tmp_path / "calendar.json"
+    calendar.write_text(json.dumps({"season": 2026, "rounds": ROUNDS}), encoding="utf-8")
+    monkeypatch.setattr(bc.seasons, "calendar_path", lambda season: calendar)
+    monkeypatch.setattr(bc.seasons, "WEB_DATA", tmp_path / "web")
+    monkeypatch.setattr(bc.seasons, "DOCS_DATA", tmp_path / "docs")
+    monkeypatch.setattr(bc, "ROOT", tmp_path)
+    monkeypatch.setattr(bc, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+    monkeypatch.setattr(bc, "enable_cache", lambda: None)
+    published, _ = bc.seasons.output_paths(2026, "circuits")
+    published.parent.mkdir(parents=True)
+    published.write_text('{"circuits": "complet"}', encoding="utf-8")
+
+    def build_circuit(gp: dict, years: list[int]) -> dict:
+        if gp["name"] == "China":
+            raise RuntimeError("télémétrie indisponible")
+        return {"gpName": gp["name"], "trackPath": [[0.0, 0.0]]}
+
+    monkeypatch.setattr(bc, "build_circuit", build_circuit)
+    assert bc.main(["--processes", "1"]) == 1
+    assert published.read_text(encoding="utf-8") == '{"circuits": "complet"}'
+
+    # Reprise après retour des données : seul China est reconstruit, fichier écrit
+    monkeypatch.setattr(bc, "build_circuit", lambda gp, years: {"gpName": gp["name"]})
+    assert bc.main(["--processes", "1", "--resume"]) == 0
+    circuits = json.loads(published.read_text(encoding="utf-8"))["circuits"]
+    assert list(circuits) == ["Australia", "China", "Madrid"]
+    assert circuits["Australia"]["trackPath"] == [[0.0, 0.0]]
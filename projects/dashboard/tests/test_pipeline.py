@@ -0,0 +1,129 @@
+"""Tests de l'ordonnanceur de pipeline (graphe d'étapes entrées / sorties).
+
+Aucun builder réel n'est lancé : les actions sont des fonctions Python qui
+enregistrent leur ordre d'exécution.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from projects.dashboard import build_all
+from projects.dashboard import pipeline as pl
+
+
+def _step(name: str, inputs=(), outputs=(), action=None, log=None, fetch=False) -> pl.Step:
+    def default_action() -> bool:
+        log.append(name)
+        return True
+
+    return pl.Step(
+        name,
+        name,
+        action or default_action,
+        inputs=[Path(p) for p in inputs],
+        outputs=[Path(p) for p in outputs],
+        fetch=fetch,
+    )
+
+
+# ---------- resolve_dependencies / topological_order ----------
+
+
+def test_dependencies_deduced_from_inputs_outputs() -> None:
+    steps = [
+        _step("copy", inputs=["a.csv"], outputs=["web/a.csv"]),
+        _step("fetch", inputs=["images.json"], outputs=["a.csv"]),
+    ]
+    deps = pl.resolve_dependencies(steps)
+    assert deps == {"copy": {"fetch"}, "fetch": set()}
+    # L'ordre séquentiel respecte la dépendance malgré l'ordre de déclaration
+    assert pl.topological_order(steps) == ["fetch", "copy"]
+
+
+def test_cycle_is_rejected() -> None:
+    steps = [
+        _step("a", inputs=["b.out"], outputs=["a.out"]),
+        _step("b", inputs=["a.out"], outputs=["b.out"]),
+    ]
+    with pytest.raises(ValueError, match="Cycle"):
+        pl.topological_order(steps)
+
+
+def test_same_output_from_two_steps_is_rejected() -> None:
+    steps = [_step("a", outputs=["x.csv"]), _step("b", outputs=["x.csv"])]
+    with pytest.raises(ValueError, match="deux étapes"):
+        pl.resolve_dependencies(steps)
+
+
+# ---------- run_graph ----------
+
+
+def test_independent_steps_run_concurrently() -> None:
+    # Les deux actions attendent l'une l'autre : ne termine que si elles tournent en même temps
+    barrier = threading.Barrier(2, timeout=5)
+
+    def action() -> bool:
+        barrier.wait()
+        return True
+
+    steps = [
+        _step("race_chart", outputs=["rc.csv"], action=action),
+        _step("heatmap", outputs=["hm.csv"], action=action),
+    ]
+    status = pl.run_graph(steps, jobs=2)
+    assert status == {"race_chart": pl.OK, "heatmap": pl.OK}
+
+
+def test_failure_blocks_dependents() -> None:
+    log: list[str] = []
+    steps = [
+        _step("fetch", outputs=["a.csv"], action=lambda: False),
+        _step("copy", inputs=["a.csv"], outputs=["web/a.csv"], log=log),
+    ]
+    status = pl.run_graph(steps, jobs=2)
+    assert status == {"fetch": pl.FAILED, "copy": pl.BLOCKED}
+    assert log == []
+
+
+def test_skipped_steps_unblock_dependents() -> None:
+    log: list[str] = []
+    steps = [
+        _step("fetch", outputs=["a.csv"], log=log, fetch=True),
+        _step("copy", inputs=["a.csv"], outputs=["web/a.csv"], log=log),
+    ]
+    status = pl.run_graph(steps, jobs=1, skip={"fetch"})
+    assert status == {"fetch": pl.SKIPPED, "copy": pl.OK}
+    assert log == ["copy"]
+
+
+# ---------- Graphe réel de build_all ----------
+
+
+def test_build_all_graph_shape() -> None:
+    deps = pl.resolve_dependencies(build_all.build_steps(2026))
+    # Les sessions FastF1 sont chargées une fois, dans le store partagé
+    assert deps["results_store"] == set()
+    assert deps["race_chart"] == {"results_store"}
+    assert deps["heatmap"] == {"results_store"}
+    # Dashboard : CSV race chart copié dans web/data/ ; qualifs : + store
+    assert deps["dashboard"] == {"race_chart_copy"}
+    assert deps["qualifying"] == {"race_chart_copy", "results_store"}
+    assert deps["dashboard_sync"] == {"dashboard", "qualifying"}
+    assert deps["heatmap_sync"] == {"heatmap_copy"}
+
+
+def test_script_steps_hash_imported_modules() -> None:
+    steps = {s.name: s for s in build_all.build_steps(2026)}
+    common = build_all.ROOT / "projects" / "common"
+    seasons_py = build_all.ROOT / "projects" / "dashboard" / "seasons.py"
+    heatmap = steps["heatmap"].inputs
+    assert common / "results_store.py" in heatmap and seasons_py in heatmap
+    assert steps["heatmap"].script.parent / "engine.py" in heatmap
+    assert common / "head_to_head.py" in steps["qualifying"].inputs
+    assert steps["race_chart"].script.parent / "points_matrix.py" in steps["race_chart"].inputs
+    # Modules de code : ni produits ni tests, le graphe ne change pas
+    assert not any("tests" in p.parts for s in steps.values() for p in s.inputs)
@@ -1,11 +1,18 @@
 """Tests des fonctions pures du builder qualifying (duels coéquipiers).
 
-On ne touche pas au réseau (FastF1) : on teste le formatage des temps et la
-logique d'agrégation des duels `build_teammate_pairs` sur des données simulées.
+On ne touche pas au réseau (FastF1) : on teste le formatage des temps, la
+logique d'agrégation des duels `build_teammate_pairs` et le mode incrémental
+sur des données simulées.
 """
 
 from __future__ import annotations
 
+import json
+from datetime import date
+from pathlib import Path
+
+import pytest
+
 from projects.dashboard import build_qualifying_data as bq
 
 # ---------- format_lap / to_seconds ----------
@@ -118,3 +125,137 @@ def test_build_teammate_pairs_sprint_quali_no_q3() -> None:
     assert team["q3Count"] == {}
     assert team["sessions"][0]["type"] == "SQ"
     assert team["h2h"]["SQ"]["George Russell"] == 1
+
+
+# ---------- Mode incrémental ----------
+
+ROUNDS = [
+    {"round": 1, "name": "Australia", "shortName": "Australia", "date": "2026-03-08"},
+    {
+        "round": 2,
+        "name": "China",
+        "shortName": "China",
+        "date": "2026-03-15",
+        "isSprint": True,
+    },
+    {"round": 3, "name": "Japan", "shortName": "Japan", "date": "2026-03-29"},
+]
+
+
+def test_sessions_to_load_skips_stored_rounds() -> None:
+    previous = {(1, "Q"): {}, (2, "Q"): {}, (2, "SQ"): {}}
+    today = date(2026, 3, 30)  # lendemain du GP 3 : seul le GP 3 est chargé
+    assert bq.sessions_to_load(ROUNDS, previous, today) == {(3, "Q")}
+    assert bq.sessions_to_load(ROUNDS, previous, today, refresh_rounds=[2]) == {
+        (2, "Q"),
+        (2, "SQ"),
+        (3, "Q"),
+    }
+    assert len(bq.sessions_to_load(ROUNDS, previous, today, full=True)) == 4
+    # Session absente du fichier précédent (échec d'un run antérieur) : rechargée
+    assert bq.sessions_to_load(ROUNDS, {(1, "Q"): {}, (2, "Q"): {}}, date(2026, 5, 1)) == {
+        (2, "SQ"),
+        (3, "Q"),
+    }
+
+
+def test_main_incremental_matches_full(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calendar = tmp_path / "calendar.json"
+    calendar.write_text(json.dumps({"season": 2026, "rounds": ROUNDS}), encoding="utf-8")
+    csv_path = tmp_path / "race_chart.csv"
+    csv_path.write_text("Pilote,image,team,start,Australia,China,Japan\n", encoding="utf-8")
+    monkeypatch.setattr(bq.seasons, "calendar_path", lambda season: calendar)
+    monkeypatch.setattr(bq.seasons, "race_chart_csv", lambda season: csv_path)
+    monkeypatch.setattr(bq.seasons, "WEB_DATA", tmp_path / "web")
+    monkeypatch.setattr(bq.seasons, "DOCS_DATA", tmp_path / "docs")
+    monkeypatch.setattr(bq, "ROOT", tmp_path)
+    monkeypatch.setenv("F1_NOW", "2026-05-01T12:00:00+00:00")
+
+    loads: list[tuple] = []
+    refreshed: list[tuple] = []  # sessions rechargées en contournant le store
+
+    def fake_load(year: int, round_no: int, gp: str, stype: str, refresh: bool) -> list[dict]:
+        loads.append((round_no, stype))
+        if refresh:
+            refreshed.append((round_no, stype))
+        return [
+            _driver("George Russell", "Mercedes", 80.0 + round_no, pos=1),
+            _driver("Kimi Antonelli", "Mercedes", 80.5 + round_no, pos=2),
+        ]
+
+    monkeypatch.setattr(bq, "load_round_session", fake_load)
+    out = tmp_path / "web" / "2026" / "qualifying.json"
+
+    assert bq.main(["--full"]) == 0
+    full = out.read_text(encoding="utf-8")
+    assert len(loads) == 4 and sorted(refreshed) == sorted(loads)
+
+    loads.clear()
+    refreshed.clear()
+    assert bq.main([]) == 0
+    assert loads == [] and out.read_text(encoding="utf-8") == full
+
+    assert bq.main(["--refresh-round", "2"]) == 0
+    assert sorted(loads) == sorted(refreshed) == [(2, "Q"), (2, "SQ")]
+    assert out.read_text(encoding="utf-8") == full
+
+
+# ---------- Résumé + fichiers par GP ----------
+
+
+def test_summary_and_round_shards(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(bq.seasons, "WEB_DATA", tmp_path / "web")
+    monkeypatch.setattr(bq.seasons, "DOCS_DATA", tmp_path / "docs")
+    monkeypatch.setattr(bq, "ROOT", tmp_path)
+    drivers = [
+        _driver("George Russell", "Mercedes", 80.1, pos=1),
+        _driver("Kimi Antonelli", "Mercedes", 80.4, pos=2),
+    ]
+    sessions = [
+        _session(1, "Australia", "Australia", "Q", drivers),
+        _session(2, "China", "China", "Q", drivers),
+        _session(2, "China", "China", "SQ", drivers),
+    ]
+    summary, shards = bq.split_payload(2026, "2026-03-16", sessions, [])
+    assert "sessions" not in summary
+    assert summary["rounds"][1] == {
+        "round": 2,
+        "gp": "China",
+        "shortName": "China",
+        "types": ["Q", "SQ"],
+        "shard": "qualifying/r02",
+    }
+    assert [s["type"] for s in shards[2]["sessions"]] == ["Q", "SQ"]
+
+    bq.write_outputs(2026, summary, shards)
+    for root in ("web", "docs"):
+        assert sorted(p.name for p in (tmp_path / root / "2026" / "qualifying").iterdir()) == [
+            "r01.json",
+            "r02.json",
+        ]
+    previous = bq.load_previous_sessions(2026)
+    assert sorted(previous) == [(1, "Q"), (2, "Q"), (2, "SQ")]
+    assert previous[(2, "SQ")] == sessions[2]
+
+    # GP disparu du résumé : son fichier est retiré
+    summary, shards = bq.split_payload(2026, "2026-03-16", sessions[:1], [])
+    bq.write_outputs(2026, summary, shards)
+    assert not (tmp_path / "web" / "2026" / "qualifying" / "r02.json").exists()
+
+    # Ancien format (toutes les sessions dans qualifying.json) encore lu
+    legacy, _ = bq.seasons.output_paths(2026, "qualifying")
+    legacy.write_text(json.dumps({"season": 2026, "sessions": sessions}), encoding="utf-8")
+    assert sorted(bq.load_previous_sessions(2026)) == [(1, "Q"), (2, "Q"), (2, "SQ")]
+
+
+def test_forced_round_bypasses_store(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[tuple] = []
+
+    def fake_load_results(season: int, round_no: int, code: str, refresh: bool = False):
+        calls.append((round_no, code, refresh))
+        return None
+
+    monkeypatch.setattr(bq, "load_results", fake_load_results)
+    bq.load_round_session(2026, 3, "Japan", "Q")
+    bq.load_round_session(2026, 3, "Japan", "Q", refresh=True)
+    assert calls == [(3, "Q", False), (3, "Q", True)]
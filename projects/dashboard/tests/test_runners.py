@@ -0,0 +1,60 @@
+"""Tests du runner in-process (import unique des builders + isolation des échecs).
+
+Les builders sont simulés par de petits scripts écrits dans tmp_path.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from projects.dashboard import runners
+
+
+def _script(tmp_path: Path, name: str, body: str) -> Path:
+    p = tmp_path / name
+    p.write_text(body, encoding="utf-8")
+    return p
+
+
+def test_load_builder_imports_once(tmp_path: Path) -> None:
+    path = _script(tmp_path, "counter_builder.py", "LOADS = []\nLOADS.append(1)\n")
+    first = runners.load_builder(path)
+    second = runners.load_builder(path)
+    assert first is second
+    assert first.LOADS == [1]
+
+
+def test_run_inprocess_passes_argv(tmp_path: Path) -> None:
+    path = _script(
+        tmp_path,
+        "argv_builder.py",
+        "SEEN = []\ndef main(argv=None):\n    SEEN.append(argv)\n    return 0\n",
+    )
+    assert runners.run_inprocess("argv", path, ["--season", "2026"]) is True
+    assert runners.load_builder(path).SEEN == [["--season", "2026"]]
+
+
+def test_run_inprocess_isolates_exceptions(tmp_path: Path) -> None:
+    path = _script(tmp_path, "boom_builder.py", "def main():\n    raise RuntimeError('boom')\n")
+    assert runners.run_inprocess("boom", path) is False
+
+
+def test_run_inprocess_honours_exit_codes(tmp_path: Path) -> None:
+    exit_path = _script(tmp_path, "exit_builder.py", "import sys\ndef main():\n    sys.exit(3)\n")
+    none_path = _script(tmp_path, "none_builder.py", "def main():\n    return None\n")
+    assert runners.run_inprocess("exit", exit_path) is False
+    assert runners.run_inprocess("none", none_path) is True
+
+
+def test_run_inprocess_capture_buffers_output(tmp_path: Path, capsys) -> None:
+    path = _script(tmp_path, "chatty_builder.py", "def main():\n    print('hello builder')\n")
+    assert runners.run_inprocess("chatty", path, capture=True) is True
+    out = capsys.readouterr().out
+    # La sortie du builder est restituée d'un bloc, après l'en-tête de l'étape
+    assert out.index("[in-process] chatty_builder.py") < out.index("hello builder")
+
+
+def test_locked_output_holds_print_lock() -> None:
+    with runners.locked_output():
+        assert runners._print_lock.locked()
+    assert not runners._print_lock.locked()
@@ -0,0 +1,89 @@
+"""Tests du découpage par saison : chemins, index publié, saisons figées."""
+
+from __future__ import annotations
+
+import json
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from projects.dashboard import build_circuits_data as bc
+from projects.dashboard import check_should_refresh as csr
+from projects.dashboard import seasons
+from projects.race_chart_builder import race_chart_builder_fastf1 as rc
+from projects.season_summary_heatmap import lead_main
+
+
+@pytest.fixture
+def data_dirs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(seasons, "WEB_DATA", tmp_path / "web")
+    monkeypatch.setattr(seasons, "DOCS_DATA", tmp_path / "docs")
+    return tmp_path
+
+
+def _publish(season: int, *names: str) -> None:
+    for name in names:
+        web, _ = seasons.output_paths(season, name)
+        web.parent.mkdir(parents=True, exist_ok=True)
+        web.write_text("{}", encoding="utf-8")
+
+
+def test_output_paths_per_season(data_dirs: Path) -> None:
+    web, docs = seasons.output_paths(2025, "dashboard")
+    assert web == data_dirs / "web" / "2025" / "dashboard.json"
+    assert docs == data_dirs / "docs" / "2025" / "dashboard.json"
+    assert seasons.calendar_path(2025).name == "calendar_2025.json"
+
+
+def test_index_lists_published_seasons(data_dirs: Path) -> None:
+    _publish(2024, "dashboard")
+    _publish(seasons.CURRENT_SEASON, "dashboard", "qualifying")
+    (data_dirs / "web" / "2023").mkdir()  # dossier vide : pas publié
+
+    index = seasons.write_index()
+    assert index["current"] == seasons.CURRENT_SEASON
+    assert [s["season"] for s in index["seasons"]] == [seasons.CURRENT_SEASON, 2024]
+    assert index["seasons"][0] == {
+        "season": seasons.CURRENT_SEASON,
+        "frozen": False,
+        "files": ["dashboard", "qualifying"],
+    }
+    docs_index = json.loads((data_dirs / "docs" / seasons.INDEX_NAME).read_text(encoding="utf-8"))
+    assert docs_index == index
+
+
+def test_past_published_season_is_frozen(data_dirs: Path) -> None:
+    assert not seasons.is_frozen(2024)  # pas encore archivée : premier build autorisé
+    _publish(2024, "dashboard")
+    _publish(seasons.CURRENT_SEASON, "dashboard")
+    assert seasons.is_frozen(2024)
+    assert not seasons.is_frozen(seasons.CURRENT_SEASON)
+
+    ok, reason = csr.should_refresh(today=date(2024, 12, 9), season=2024)
+    assert not ok and "figée" in reason
+
+
+def test_refresh_decision_follows_frozen_clock(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calendar = tmp_path / "calendar.json"
+    rounds = [{"round": 1, "shortName": "Australia", "date": "2026-03-08"}]
+    calendar.write_text(json.dumps({"rounds": rounds}), encoding="utf-8")
+    monkeypatch.setattr(seasons, "calendar_path", lambda season: calendar)
+    # Lendemain du GP figé par F1_NOW : même décision qu'au run enregistré
+    monkeypatch.setenv("F1_NOW", "2026-03-09T06:00:00+00:00")
+    assert csr.should_refresh(season=seasons.CURRENT_SEASON)[0]
+    monkeypatch.setenv("F1_NOW", "2026-03-20T06:00:00+00:00")
+    ok, reason = csr.should_refresh(season=seasons.CURRENT_SEASON)
+    assert not ok and "today=2026-03-20" in reason
+
+
+def test_circuit_history_follows_season() -> None:
+    assert bc.history_years(2026) == [2025, 2024, 2023]
+    assert bc.history_years(2022) == [2021, 2020, 2019]
+
+
+def test_builders_default_to_current_season() -> None:
+    assert rc._parse_args([]).season == seasons.CURRENT_SEASON
+    assert lead_main.parse_args([]).season == seasons.CURRENT_SEASON
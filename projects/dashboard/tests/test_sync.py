@@ -6,8 +6,12 @@ modules ES6 (assets/modules/*.js) seront bien propagés vers docs/.
 
 from __future__ import annotations
 
+import gzip
+import json
 from pathlib import Path
 
+import brotli
+
 from projects.dashboard import sync_to_docs as sync
 
 
@@ -68,3 +72,35 @@ def test_sync_missing_source_returns_error(tmp_path: Path, monkeypatch) -> None:
     monkeypatch.setattr(sync, "SRC", tmp_path / "does_not_exist")
     monkeypatch.setattr(sync, "DST", tmp_path / "docs")
     assert sync.main() == 1
+
+
+def test_publish_data_hashed_artifacts_and_manifest(tmp_path: Path) -> None:
+    _make_tree(
+        tmp_path,
+        {
+            "data/dashboard_2026.json": '{\n  "season": 2026\n}\n',
+            "assets/manifest.json": '{"items": [{"id": "dashboard"}]}',
+        },
+    )
+    table = sync.publish_data(tmp_path)
+    hashed = tmp_path / table["data/dashboard_2026.json"]
+    assert hashed.read_bytes() == b'{"season":2026}'
+    assert (
+        gzip.decompress(hashed.with_name(hashed.name + ".gz").read_bytes()) == hashed.read_bytes()
+    )
+    assert (
+        brotli.decompress(hashed.with_name(hashed.name + ".br").read_bytes()) == b'{"season":2026}'
+    )
+    manifest = json.loads((tmp_path / "assets/manifest.json").read_text(encoding="utf-8"))
+    assert manifest["items"] == [{"id": "dashboard"}]
+    assert manifest["data"] == table
+
+    # Même contenu : même nom ; contenu modifié : nouveau nom, ancienne copie supprimée
+    assert sync.publish_data(tmp_path) == table
+    (tmp_path / "data/dashboard_2026.json").write_text('{"season": 2027}', encoding="utf-8")
+    new = sync.publish_data(tmp_path)["data/dashboard_2026.json"]
+    assert new != table["data/dashboard_2026.json"]
+    published = (p.name for p in (tmp_path / "data").iterdir())
+    assert sorted(published) == sorted(
+        ["dashboard_2026.json", Path(new).name, Path(new).name + ".gz", Path(new).name + ".br"]
+    )
@@ -6,8 +6,16 @@
  */
 
 import { setI18n, t, LANG, applyStaticI18n, setupLangSwitcher } from "./modules/i18n.js";
-import { shortName, formatDate, formatCountdown, fetchJson } from "./modules/utils.js";
-import { initStandings } from "./modules/render/standings.js";
+import {
+  shortName,
+  formatDate,
+  formatCountdown,
+  fetchJson,
+  pickSeason,
+  seasonDataUrl,
+  setDataManifest,
+} from "./modules/utils.js";
+import { decodeDashboard, initStandings } from "./modules/render/standings.js";
 import { initDuel } from "./modules/render/duel.js";
 import { initTeammates } from "./modules/render/teammates.js";
 import { initCalendar, scrollCalendarToNext } from "./modules/render/calendar.js";
@@ -17,12 +25,20 @@ import { initEmbed } from "./modules/render/embed.js";
   // Chargement initial : uniquement le strict nécessaire à la première vue (onglet Pilotes).
   // Les données lourdes (circuits, historique, qualifs) sont chargées à la demande par
   // leurs modules respectifs au premier affichage de l'onglet concerné.
-  const [dashRes, teamsRes, manifestRes, i18nRes] = await Promise.all([
-    fetchJson("data/dashboard_2026.json", { required: true }),
+  // Le manifest (non hashé) d'abord : il donne les URLs hashées des fichiers de données ;
+  // l'index des saisons donne la saison à afficher (data/<season>/...).
+  const [manifestRes, seasonIndex] = await Promise.all([
+    fetchJson("assets/manifest.json", { required: true, cache: "no-cache" }),
+    fetchJson("data/seasons.json", { cache: "no-cache" }),
+  ]);
+  setDataManifest(manifestRes);
+  const season = pickSeason(seasonIndex);
+  const [dashRaw, teamsRes, i18nRes] = await Promise.all([
+    fetchJson(seasonDataUrl(season, "dashboard"), { required: true }),
     fetchJson("assets/teams.json", { required: true }),
-    fetchJson("assets/manifest.json", { required: true }),
     fetchJson("assets/i18n.json", { fallback: {} }),
   ]);
+  const dashRes = decodeDashboard(dashRaw);
 
   setI18n(i18nRes);
   document.documentElement.lang = LANG;
@@ -1,5 +1,8 @@
 /* Beautiful F1 — Dashboard : constantes partagées. */
 
+// Saison affichée si data/seasons.json est indisponible (= seasons.CURRENT_SEASON côté Python).
+export const DEFAULT_SEASON = 2026;
+
 // Mapping nom de GP (calendrier) -> circuitId Ergast (clé de gp_history.json).
 // À étendre au fur et à mesure que des circuits sont couverts par le builder.
 export const GP_TO_CIRCUIT = {
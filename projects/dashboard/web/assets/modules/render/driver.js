@@ -2,6 +2,17 @@
 
 import { t } from "../i18n.js";
 
+// Schéma compact : `gains` / `cumulative` sont des tableaux d'entiers alignés sur
+// la table `rounds` ([gp, shortName]) du payload. Restitue `progress`.
+export function decodeProgress(entry, rounds) {
+  return rounds.map(([gp, shortName], i) => ({
+    gp,
+    shortName,
+    gain: entry.gains[i],
+    cumulative: entry.cumulative[i],
+  }));
+}
+
 export function renderDriverDetail(driver, teamColor) {
   const color = teamColor(driver.team);
   const progress = driver.progress || [];
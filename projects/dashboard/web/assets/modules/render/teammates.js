@@ -1,7 +1,7 @@
 /* Beautiful F1 — Dashboard : onglet Coéquipiers (duels qualif). */
 
 import { t } from "../i18n.js";
-import { shortName, escapeAttr, fetchJson } from "../utils.js";
+import { shortName, escapeAttr, fetchJson, seasonDataUrl } from "../utils.js";
 
 export function renderTeammateView(team, filter, teamColor) {
   const color = teamColor(team.team);
@@ -57,11 +57,11 @@ export function renderTeammateView(team, filter, teamColor) {
       const info = escapeAttr(buildTooltipPayload(p, dA, dB, color));
       if (p.type === "Q") {
         // Cercle plein pour Qualifs
-        return `<circle cx="${cx}" cy="${cy}" r="6.5" fill="${color}" stroke="${color}" stroke-width="1.5" class="dash-tl-dot" data-info="${info}"/>`;
+        return `<circle cx="${cx}" cy="${cy}" r="6.5" fill="${color}" stroke="${color}" stroke-width="1.5" class="dash-tl-dot" data-info="${info}" data-round="${p.round}" data-type="${p.type}"/>`;
       }
       // Losange creux pour Sprint Qualifs (via polygon — pas de rotate, plus fiable)
       const s = 7.5;
-      return `<polygon points="${cx},${cy - s} ${cx + s},${cy} ${cx},${cy + s} ${cx - s},${cy}" fill="none" stroke="${color}" stroke-width="2.2" class="dash-tl-dot" data-info="${info}"/>`;
+      return `<polygon points="${cx},${cy - s} ${cx + s},${cy} ${cx},${cy + s} ${cx - s},${cy}" fill="none" stroke="${color}" stroke-width="2.2" class="dash-tl-dot" data-info="${info}" data-round="${p.round}" data-type="${p.type}"/>`;
     })
     .join("");
 
@@ -127,10 +127,78 @@ export function renderTeammateView(team, filter, teamColor) {
       </div>
 
       <div id="dash-tl-tooltip" class="dash-tl-tooltip"></div>
+      <div id="dash-tl-round" class="dash-tl-round" aria-live="polite">
+        <p class="dash-tl-hint">${t("tm.roundHint")}</p>
+      </div>
     </div>
   `;
 }
 
+// Classements complets d'un GP : un fichier par GP (data/<season>/qualifying/rNN.json),
+// chargé au premier clic sur un point de ce GP puis gardé en mémoire.
+const roundShards = new Map();
+
+function loadRoundSessions(qualiRes, round) {
+  if (qualiRes.sessions) {
+    // Ancien format : toutes les sessions dans qualifying.json
+    return Promise.resolve(qualiRes.sessions.filter((s) => s.round === round));
+  }
+  const entry = (qualiRes.rounds || []).find((r) => r.round === round);
+  if (!entry) return Promise.resolve([]);
+  const url = seasonDataUrl(qualiRes.season, entry.shard);
+  if (!roundShards.has(url)) {
+    roundShards.set(
+      url,
+      fetchJson(url).then((shard) => {
+        if (!shard) roundShards.delete(url); // échec : nouvel essai au prochain clic
+        return (shard && shard.sessions) || [];
+      }),
+    );
+  }
+  return roundShards.get(url);
+}
+
+export function renderRoundDetail(session, team, color) {
+  if (!session) return `<p class="dash-duel-empty">${t("tm.roundUnavailable")}</p>`;
+  // Qualifs sprint : pas de position officielle, ordre du meilleur tour
+  const key = (d) => [d.position ?? Infinity, d.bestTimeSec ?? Infinity];
+  const rows = session.drivers
+    .slice()
+    .sort((x, y) => key(x)[0] - key(y)[0] || key(x)[1] - key(y)[1])
+    .map((d, i) => {
+      const mine = d.team === team.team;
+      const style = mine ? ` style="color:${color};font-weight:600"` : "";
+      const pos = d.position ?? (d.bestTimeSec != null ? i + 1 : "—");
+      return `<tr${style}><td>${pos}</td><td>${d.fullName}</td><td>${d.team}</td><td>${d.bestTimeStr || "—"}</td></tr>`;
+    })
+    .join("");
+  const type = session.type === "Q" ? t("tm.quali") : t("tm.sprintQuali");
+  return `
+    <div class="dash-tl-round-head">${t("tm.roundTitle", { gp: session.shortName, type })}</div>
+    <table class="dash-table dash-teammate-table">
+      <thead><tr><th>${t("col.rank")}</th><th>${t("col.driver")}</th><th>${t("col.team")}</th><th>${t("col.time")}</th></tr></thead>
+      <tbody>${rows}</tbody>
+    </table>
+  `;
+}
+
+function attachRoundDrilldown(qualiRes, team, color) {
+  const panel = document.getElementById("dash-tl-round");
+  if (!panel) return;
+  document.querySelectorAll(".dash-tl-dot").forEach((el) => {
+    el.addEventListener("click", async () => {
+      const round = Number(el.getAttribute("data-round"));
+      const type = el.getAttribute("data-type");
+      const sessions = await loadRoundSessions(qualiRes, round);
+      panel.innerHTML = renderRoundDetail(
+        sessions.find((s) => s.type === type),
+        team,
+        color,
+      );
+    });
+  });
+}
+
 function buildTooltipPayload(p, dA, dB, color) {
   // Encodé pour stockage dans data-info ; format JSON minimal
   return JSON.stringify({
@@ -181,14 +249,15 @@ function attachTimelineHover() {
   });
 }
 
-// Câble l'onglet Coéquipiers. Les données qualif (~80 Ko) sont chargées à la
-// demande au premier affichage de l'onglet → allège le chargement initial.
+// Câble l'onglet Coéquipiers. Le résumé qualif (duels agrégés) est chargé à la
+// demande au premier affichage de l'onglet → allège le chargement initial ; les
+// classements d'un GP ne le sont qu'au clic sur ce GP.
 export function initTeammates(dashRes, teamColor) {
   let loaded = false;
   const load = async () => {
     if (loaded) return;
     loaded = true;
-    const qualiRes = await fetchJson("data/qualifying_2026.json");
+    const qualiRes = await fetchJson(seasonDataUrl(dashRes.season, "qualifying"));
     renderTeammatesPane(dashRes, qualiRes, teamColor);
   };
   const tab = document.querySelector('.dash-tab[data-tab="teammates"]');
@@ -218,15 +287,25 @@ function renderTeammatesPane(dashRes, qualiRes, teamColor) {
     return rx - ry;
   });
 
-  teamSelect.innerHTML = teams.map((tm) => `<option value="${tm.team}">${tm.team}</option>`).join("");
-  teamSelect.value = teams[0].team;
+  // Une entrée par duo : une écurie qui a changé de pilote en a plusieurs
+  const pairings = new Map();
+  teams.forEach((tm) => pairings.set(tm.team, (pairings.get(tm.team) || 0) + 1));
+  const label = (tm) =>
+    pairings.get(tm.team) > 1
+      ? `${tm.team} — ${tm.drivers.map(shortName).join(" / ")}`
+      : tm.team;
+  teamSelect.innerHTML = teams
+    .map((tm, i) => `<option value="${i}">${label(tm)}</option>`)
+    .join("");
+  teamSelect.value = "0";
 
   let currentFilter = "ALL";
   const render = () => {
-    const team = teams.find((tm) => tm.team === teamSelect.value);
+    const team = teams[Number(teamSelect.value)];
     if (!team) return;
     teammatesContent.innerHTML = renderTeammateView(team, currentFilter, teamColor);
     attachTimelineHover();
+    attachRoundDrilldown(qualiRes, team, teamColor(team.team));
   };
 
   teamSelect.addEventListener("change", render);
@@ -1,6 +1,7 @@
 /* Beautiful F1 — Dashboard : utilitaires de formatage + chargement de données. */
 
 import { t, LANG } from "./i18n.js";
+import { DEFAULT_SEASON } from "./constants.js";
 
 // Messages d'erreur bilingues codés en dur : la bannière peut s'afficher AVANT
 // que i18n.json soit chargé (échec d'une ressource requise), donc on n'utilise pas t().
@@ -23,16 +24,43 @@ export function showErrorBanner(message) {
   banner.textContent = text;
 }
 
+// Table `data` de assets/manifest.json (publiée par sync_to_docs.py) : nom canonique
+// → copie minifiée au nom hashé, cachable indéfiniment. Vide en local (web/).
+let hashedUrls = {};
+
+export function setDataManifest(manifest) {
+  hashedUrls = (manifest && manifest.data) || {};
+}
+
+export function resolveDataUrl(url) {
+  return hashedUrls[url] || url;
+}
+
+// Saison affichée : `?season=AAAA` si publiée dans data/seasons.json, sinon la saison en cours.
+export function pickSeason(index) {
+  const published = ((index && index.seasons) || []).map((s) => s.season);
+  const wanted = Number(new URLSearchParams(window.location.search).get("season"));
+  if (published.includes(wanted)) return wanted;
+  return (index && index.current) || DEFAULT_SEASON;
+}
+
+// Fichier de données d'une saison : data/<season>/<name>.json (voir seasons.py).
+export function seasonDataUrl(season, name) {
+  return `data/${season}/${name}.json`;
+}
+
 /**
  * Charge un JSON avec gestion d'erreur explicite.
+ * L'URL passe par `resolveDataUrl` (copie hashée si le manifest en déclare une).
  * @param {string} url
- * @param {{required?: boolean, fallback?: any}} opts
+ * @param {{required?: boolean, fallback?: any, cache?: RequestCache}} opts
  *   - required: si le chargement échoue, affiche la bannière et propage l'erreur.
  *   - fallback: valeur retournée si l'échec est toléré (ressource optionnelle).
+ *   - cache: mode de cache fetch (ex. "no-cache" pour toujours revalider le manifest).
  */
-export async function fetchJson(url, { required = false, fallback = null } = {}) {
+export async function fetchJson(url, { required = false, fallback = null, cache } = {}) {
   try {
-    const r = await fetch(url);
+    const r = await fetch(resolveDataUrl(url), cache ? { cache } : undefined);
     if (!r.ok) throw new Error(`HTTP ${r.status}`);
     return await r.json();
   } catch (e) {
@@ -24,13 +24,12 @@ python -m gp_history.tools.gp_history_builder_mexique_v1 \
 from __future__ import annotations
 
 import argparse
-import os
+import sys
 import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List
 
-import fastf1
 import pandas as pd
 from fastf1.ergast import Ergast
 
@@ -43,10 +42,15 @@ BASE_DIR = Path(__file__).resolve().parents[1]  # -> gp_history/
 DATA_DIR = BASE_DIR / "data"
 OUT_DIR = DATA_DIR / "gp_history"
 REF_DIR = DATA_DIR / "reference"
-CACHE_DIR = BASE_DIR / ".cache" / "fastf1"  # cache local au projet
 # Dossier d'assets (pas utilisé ici car on ne télécharge pas d'images)
 ASSET_DIR = BASE_DIR / "asset"
 
+# Racine du repo sur sys.path (pour importer projects.common quand lancé en script)
+REPO_ROOT = BASE_DIR.parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from projects.common.fastf1_cache import enable_cache  # noqa: E402
 
 # --- Paramètres spécifiques au GP du Mexique ---
 #
@@ -305,9 +309,8 @@ def _build_rows_for_gp(
 
 def build_mexico_history() -> pd.DataFrame:
     """Pipeline complet pour le GP du Mexique (v2: via schedule -> rounds)."""
-    # Cache local au projet
-    os.makedirs(CACHE_DIR, exist_ok=True)
-    fastf1.Cache.enable_cache(str(CACHE_DIR))
+    # Cache FastF1 partagé (projects/common/fastf1_cache.py)
+    enable_cache()
 
     ergast = Ergast(result_type="pandas", auto_cast=True, limit=1000)
 
@@ -2,6 +2,7 @@
 # Sortie : hamilton_mildseason_tracker/hamilton_quali_duels_2007_2025_until_R20.csv
 
 import os
+import sys
 import time
 from typing import Optional, Tuple
 
@@ -10,6 +11,13 @@ import pandas as pd
 from fastf1.ergast import Ergast
 from fastf1.ergast.interface import ErgastInvalidRequestError
 
+# Racine du repo sur sys.path (pour importer projects.common quand lancé en script)
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from projects.common.fastf1_cache import enable_cache  # noqa: E402
+
 CURRENT_GPS_COMPLETED = 25  # dernier GP compté = Mexico (R20)
 CSV_NAME = "hamilton_quali_duels_2007_2025_until_R21.csv"
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -53,7 +61,6 @@ TEAMMATE_BY_YEAR = {
 }
 HAM_ID = "hamilton"
 
-# fastf1.Cache.enable_cache("~/.cache/fastf1")
 erg = Ergast(result_type="pandas", auto_cast=True, limit=1000)
 
 
@@ -199,4 +206,5 @@ def build_quali_duels():
 
 
 if __name__ == "__main__":
+    enable_cache()
     build_quali_duels()
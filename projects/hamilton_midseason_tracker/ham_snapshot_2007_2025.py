@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import argparse
 import os
+import sys
 import time
 
 import fastf1
@@ -17,10 +18,16 @@ from fastf1.ergast import Ergast
 from fastf1.ergast.interface import ErgastInvalidRequestError
 from fastf1.req import RateLimitExceededError
 
+# Racine du repo sur sys.path (pour importer projects.common quand lancé en script)
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from projects.common.fastf1_cache import enable_cache  # noqa: E402
+
 LH_ID = "hamilton"
 START_SEASON = 2007
 END_SEASON = 2025
-DEFAULT_CACHE = ".fastf1cache"
 
 COLS = [
     "year",
@@ -52,13 +59,6 @@ TEAM_LABELS = {"mclaren": "McLaren", "mercedes": "Mercedes", "ferrari": "Ferrari
 
 
 # -------------------------------------------------------------
-def enable_cache(path: str = DEFAULT_CACHE) -> None:
-    try:
-        fastf1.Cache.enable_cache(path)
-    except Exception:
-        pass
-
-
 def api_get(fn, **kwargs):
     """Appels Ergast avec retry light (évite 429)."""
     for attempt in range(3):
@@ -382,7 +382,7 @@ def main():
     parser.add_argument("--out", "-o", default="hamilton_2007_2025_snapshot.csv")
     args = parser.parse_args()
 
-    enable_cache(DEFAULT_CACHE)
+    enable_cache()
     erg = Ergast(result_type="pandas", auto_cast=True)
 
     script_dir = os.path.dirname(os.path.abspath(__file__))
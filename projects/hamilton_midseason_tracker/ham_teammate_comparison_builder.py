@@ -1,5 +1,6 @@
 import os
 import re
+import sys
 import unicodedata
 from typing import Optional
 
@@ -8,6 +9,13 @@ import pandas as pd
 import requests
 from fastf1.ergast import Ergast
 
+# Racine du repo sur sys.path (pour importer projects.common quand lancé en script)
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from projects.common.fastf1_cache import enable_cache  # noqa: E402
+
 # --- Headshot overrides (prioritaires) ---
 HEADSHOT_OVERRIDES = {
     # driverId Ergast -> URL souhaitée (prioritaire)
@@ -58,7 +66,6 @@ TEAMMATES = {
 HAM_DRIVER_ID = "hamilton"
 HAM_NAME = "Lewis Hamilton"
 
-# fastf1.Cache.enable_cache("~/.cache/fastf1")  # optionnel
 erg = Ergast(result_type="pandas", auto_cast=True, limit=1000)
 
 
@@ -280,39 +287,50 @@ def _get_reference_next_round(reference_year: int = max(TEAMMATES.keys())) -> in
 # -----------------------------
 #   Build dataset
 # -----------------------------
-records = []
-
-# -> NOUVEAU: cutoff = prochain GP du REFERENCE_YEAR (ex: si R18 fini, on prend 19)
-k_next = _get_reference_next_round()
-
-for year, (team, teammate_name, teammate_id) in TEAMMATES.items():
-    # On applique ce cutoff à chaque saison, borné par son calendrier propre
-    r_eff, gp_name, gp_date = _get_cutoff_event(year, k_next)
-
-    ham_pts = _get_points(year, r_eff, HAM_DRIVER_ID)
-    tm_pts = _get_points(year, r_eff, teammate_id)
-    gap = (ham_pts - tm_pts) if (ham_pts is not None and tm_pts is not None) else None
-
-    ham_img = resolve_headshot_url(HAM_NAME, HAM_DRIVER_ID, year, team_hint=team)
-    tm_img = resolve_headshot_url(teammate_name, teammate_id, year, team_hint=team)
-
-    records.append(
-        {
-            "year": year,
-            "round_cutoff": r_eff,
-            "gp_name_cutoff": gp_name,
-            "gp_date_cutoff": gp_date,
-            "team": team,
-            "hamilton_points": ham_pts,
-            "teammate_name": teammate_name,
-            "teammate_points_to_date": tm_pts,
-            "teammate_gap": gap,
-            # "hamilton_headshot_url": ham_img,
-            # "teammate_headshot_url": tm_img
-        }
-    )
-
-out = pd.DataFrame.from_records(records)
-out.to_csv(OUTPUT_FILE, index=False)
-print(f"✅ Dataset exporté : {OUTPUT_FILE}  |  Cutoff = prochain GP (K_next={k_next})")
-print(out.head(10))
+def build_teammate_comparison() -> pd.DataFrame:
+    """Écart de points Hamilton / coéquipier au même stade de chaque saison."""
+    records = []
+
+    # -> NOUVEAU: cutoff = prochain GP du REFERENCE_YEAR (ex: si R18 fini, on prend 19)
+    k_next = _get_reference_next_round()
+
+    for year, (team, teammate_name, teammate_id) in TEAMMATES.items():
+        # On applique ce cutoff à chaque saison, borné par son calendrier propre
+        r_eff, gp_name, gp_date = _get_cutoff_event(year, k_next)
+
+        ham_pts = _get_points(year, r_eff, HAM_DRIVER_ID)
+        tm_pts = _get_points(year, r_eff, teammate_id)
+        gap = (ham_pts - tm_pts) if (ham_pts is not None and tm_pts is not None) else None
+
+        # Headshots résolus mais non exportés (colonnes commentées ci-dessous)
+        ham_img = resolve_headshot_url(HAM_NAME, HAM_DRIVER_ID, year, team_hint=team)  # noqa: F841
+        tm_img = resolve_headshot_url(  # noqa: F841
+            teammate_name, teammate_id, year, team_hint=team
+        )
+
+        records.append(
+            {
+                "year": year,
+                "round_cutoff": r_eff,
+                "gp_name_cutoff": gp_name,
+                "gp_date_cutoff": gp_date,
+                "team": team,
+                "hamilton_points": ham_pts,
+                "teammate_name": teammate_name,
+                "teammate_points_to_date": tm_pts,
+                "teammate_gap": gap,
+                # "hamilton_headshot_url": ham_img,
+                # "teammate_headshot_url": tm_img
+            }
+        )
+
+    out = pd.DataFrame.from_records(records)
+    out.to_csv(OUTPUT_FILE, index=False)
+    print(f"✅ Dataset exporté : {OUTPUT_FILE}  |  Cutoff = prochain GP (K_next={k_next})")
+    print(out.head(10))
+    return out
+
+
+if __name__ == "__main__":
+    enable_cache()
+    build_teammate_comparison()
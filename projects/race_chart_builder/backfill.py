@@ -0,0 +1,212 @@
+"""Backfill multi-saisons du race chart : une saison par process, reprise sur interruption.
+
+Chaque saison de la plage est construite par `RaceChartBuilderFastF1` dans un
+pool de process (FastF1 et le parsing pandas sont surtout CPU : un process par
+saison contourne le GIL), et écrit son CSV habituel :
+
+    outputs/f1_race_chart_fastf1_<season>.csv
+
+Checkpoint : l'index `outputs/race_chart_index.json` est réécrit (atomiquement)
+dès qu'une saison est terminée. Une relance saute les saisons déjà indexées
+comme complètes (calendrier entièrement couru) dont le CSV existe ; la saison
+en cours est toujours reconstruite, en mode incrémental. --force repart de zéro.
+
+Usage :
+    python projects/race_chart_builder/backfill.py 2018-2026
+    python projects/race_chart_builder/backfill.py 2018-2026 --processes 3
+    python projects/race_chart_builder/backfill.py 2021,2023 --force
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parents[1]
+
+# Racine du repo sur sys.path (pour importer projects.* quand lancé en script)
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from projects.common import clock  # noqa: E402
+from projects.common.run_report import reported  # noqa: E402
+
+OUTPUTS_DIR = HERE / "outputs"
+INDEX_NAME = "race_chart_index.json"
+DEFAULT_PROCESSES = 4
+
+
+def parse_seasons(spec: str) -> list[int]:
+    """'2018-2026' ou '2021,2023' (combinables : '2014-2016,2021') -> saisons triées."""
+    seasons: set[int] = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        first, last = int(start), int(end or start)
+        if first > last:
+            raise ValueError(f"Plage de saisons invalide : {part}")
+        seasons.update(range(first, last + 1))
+    if not seasons:
+        raise ValueError(f"Aucune saison dans : {spec!r}")
+    return sorted(seasons)
+
+
+def build_season(
+    season: int, outputs_dir: Path, incremental: bool = True, max_workers: int | None = None
+) -> dict:
+    """Construit le CSV d'une saison (exécuté dans un process du pool)."""
+    import fastf1
+    import pandas as pd
+
+    from projects.common.fastf1_cache import enable_cache
+    from projects.common.results_store import REFRESH_DAYS
+    from projects.race_chart_builder.race_chart_builder_fastf1 import RaceChartBuilderFastF1
+
+    enable_cache()
+    builder = RaceChartBuilderFastF1(
+        season=season,
+        output_file=str(outputs_dir / f"f1_race_chart_fastf1_{season}.csv"),
+        max_workers=max_workers,
+    )
+    now = clock.now()
+    builder.build_results_table(incremental=incremental, now=now)
+    builder.export_csv()
+
+    # Complète = dernière course du calendrier courue et hors fenêtre de propagation
+    schedule = fastf1.get_event_schedule(season, include_testing=False)
+    last_race = pd.to_datetime(schedule["Session5DateUtc"]).max()
+    settled = pd.notna(last_race) and (
+        now - last_race.to_pydatetime().replace(tzinfo=timezone.utc) > timedelta(days=REFRESH_DAYS)
+    )
+    return {
+        "file": Path(builder.output_file).name,
+        "rounds": len(builder.race_keys),
+        "lastGp": builder.race_keys[-1] if builder.race_keys else None,
+        "complete": bool(builder.race_keys) and bool(settled),
+        "builtAt": now.isoformat(timespec="seconds"),
+    }
+
+
+def load_index(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"seasons": {}}
+
+
+def write_index(path: Path, index: dict) -> None:
+    """Écriture atomique : un run interrompu laisse l'index précédent intact."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    index["seasons"] = dict(sorted(index["seasons"].items()))
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def pending_seasons(seasons: list[int], index: dict, outputs_dir: Path) -> list[int]:
+    """Saisons à (re)construire : ni complètes dans l'index, ni dotées de leur CSV."""
+    todo = []
+    for season in seasons:
+        entry = index["seasons"].get(str(season))
+        if entry and entry.get("complete") and (outputs_dir / entry["file"]).exists():
+            continue
+        todo.append(season)
+    return todo
+
+
+def run_backfill(
+    seasons: list[int],
+    outputs_dir: Path = OUTPUTS_DIR,
+    processes: int = DEFAULT_PROCESSES,
+    force: bool = False,
+    build: Callable[[int, Path, bool], dict] = build_season,
+) -> dict[str, int]:
+    """Construit les saisons manquantes ; l'index sert de checkpoint après chaque saison.
+
+    Hors --force, une saison déjà exportée repart de son CSV (mode incrémental).
+    """
+    index_path = outputs_dir / INDEX_NAME
+    index = load_index(index_path)
+    todo = list(seasons) if force else pending_seasons(seasons, index, outputs_dir)
+    skipped = len(seasons) - len(todo)
+    for season in sorted(set(seasons) - set(todo)):
+        print(f"  [SKIP {season}] déjà construite (checkpoint)")
+
+    failed = 0
+
+    def done(season: int, entry: dict | None, error: Exception | None) -> None:
+        nonlocal failed
+        if error is not None:
+            failed += 1
+            print(f"  [ERREUR {season}] {error}", file=sys.stderr)
+            return
+        index["seasons"][str(season)] = entry
+        index["generatedAt"] = clock.now().isoformat(timespec="seconds")
+        write_index(index_path, index)
+        state = "complète" if entry["complete"] else "en cours"
+        print(f"  [OK {season}] {entry['rounds']} GP ({state}) -> {entry['file']}")
+
+    if processes <= 1 or len(todo) <= 1:
+        for season in todo:
+            try:
+                done(season, build(season, outputs_dir, not force), None)
+            except Exception as e:
+                done(season, None, e)
+    else:
+        with ProcessPoolExecutor(max_workers=min(processes, len(todo))) as pool:
+            futures = {
+                pool.submit(build, season, outputs_dir, not force): season for season in todo
+            }
+            for future in as_completed(futures):
+                season = futures[future]
+                try:
+                    done(season, future.result(), None)
+                except Exception as e:
+                    done(season, None, e)
+
+    return {"built": len(todo) - failed, "skipped": skipped, "failed": failed}
+
+
+@reported("race_chart_backfill")
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Backfill multi-saisons du race chart.")
+    parser.add_argument("seasons", help="Plage de saisons : 2018-2026, 2021,2023…")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=DEFAULT_PROCESSES,
+        help=f"Saisons construites en parallèle (défaut : {DEFAULT_PROCESSES})",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Ignore le checkpoint et reconstruit tout"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        seasons = parse_seasons(args.seasons)
+    except ValueError as e:
+        print(f"[ERREUR] {e}", file=sys.stderr)
+        return 2
+    print(f"[INFO] Backfill race chart : {seasons[0]}–{seasons[-1]} ({len(seasons)} saisons)")
+    counts = run_backfill(seasons, processes=args.processes, force=args.force)
+    print(
+        f"[OK] {counts['built']} saison(s) construite(s), {counts['skipped']} déjà à jour, "
+        f"{counts['failed']} en échec — index : {OUTPUTS_DIR / INDEX_NAME}"
+    )
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Moteur de points cumulés du race chart : matrice pilotes × GP, calculée en bloc.
+
+Chaque GP chargé donne des lignes longues (`round_points`) : une par pilote
+classé en course, points course + sprint du même week-end. `cumulative_table`
+les pivote en une matrice NumPy pilotes × GP puis fait, en une passe :
+
+  - cumul (cumsum sur l'axe des GP), repris à partir d'un tableau existant
+    pour le mode incrémental ;
+  - report des points pour un pilote absent d'un GP (0 point ce GP-là) ;
+  - colonnes passées à 0 pour un pilote arrivé en cours de saison.
+
+Les GP sont repérés par leur position, pas par leur nom : deux GP d'un même
+pays (colonnes homonymes) ne se mélangent pas. Coût en O(pilotes × GP), sans
+boucle Python par pilote : une backfill de plusieurs saisons reste instantanée.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+META_COLUMNS = ["Pilote", "image", "team", "start"]
+
+
+def _text(df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    return df[column].fillna("").astype(str)
+
+
+def _points(df: pd.DataFrame) -> pd.Series:
+    return pd.to_numeric(df["Points"], errors="coerce").fillna(0.0).astype(float)
+
+
+def round_points(
+    sessions: Iterable[tuple[pd.DataFrame, pd.DataFrame | None]],
+    images: dict[str, str] | None = None,
+) -> pd.DataFrame:
+    """Lignes longues des GP donnés (course, sprint | None) : Pilote, image, team, GP, Points.
+
+    GP = position du week-end dans `sessions`. Photo : HeadshotUrl FastF1 si
+    fourni, sinon `images` par abréviation FIA, sinon chaîne vide. Les points
+    sprint s'ajoutent aux pilotes classés en course.
+    """
+    races, sprints = [], []
+    for position, (race, sprint) in enumerate(sessions):
+        races.append(race.assign(GP=position))
+        if sprint is not None and len(sprint):
+            sprints.append(sprint[["FullName", "Points"]].assign(GP=position))
+    if not races:
+        return pd.DataFrame(columns=["Pilote", "image", "team", "GP", "Points"])
+
+    race = pd.concat(races, ignore_index=True)
+    image = _text(race, "HeadshotUrl")
+    fallback = _text(race, "Abbreviation").map(images or {}).fillna("")
+    points = _points(race)
+    if sprints:
+        sprint = pd.concat(sprints, ignore_index=True)
+        by_driver = _points(sprint).groupby([sprint["GP"], sprint["FullName"]]).sum()
+        key = pd.MultiIndex.from_arrays([race["GP"], race["FullName"]])
+        points = points + by_driver.reindex(key).fillna(0.0).to_numpy()
+    return pd.DataFrame(
+        {
+            "Pilote": race["FullName"].to_numpy(),
+            "image": image.where(image != "", fallback).to_numpy(),
+            "team": _text(race, "TeamName").to_numpy(),
+            "GP": race["GP"].to_numpy(),
+            "Points": points.to_numpy(),
+        }
+    )
+
+
+def cumulative_table(
+    rounds: pd.DataFrame, keys: Iterable[str], base: pd.DataFrame | None = None
+) -> pd.DataFrame:
+    """Tableau large Pilote, image, team, start, <GP…> des points cumulés.
+
+    `rounds` : sortie de `round_points`, GP numérotés 0..len(keys)-1 dans l'ordre
+    de `keys` (noms des colonnes). `base` : tableau déjà cumulé auquel ajouter ces
+    GP (mode incrémental) ; ses pilotes gardent leur photo et leur écurie.
+    """
+    keys = list(keys)
+    base = base if base is not None else pd.DataFrame(columns=META_COLUMNS)
+    base_values = base.iloc[:, len(META_COLUMNS) :]
+
+    # Pilotes : ceux du tableau existant, puis par ordre d'apparition
+    meta = pd.concat([base[["Pilote", "image", "team"]], rounds[["Pilote", "image", "team"]]])
+    meta = meta.drop_duplicates("Pilote").reset_index(drop=True)
+    drivers = pd.Index(meta["Pilote"])
+
+    matrix = np.zeros((len(drivers), len(keys)))
+    if len(rounds):
+        rows = drivers.get_indexer(rounds["Pilote"])
+        np.add.at(matrix, (rows, rounds["GP"].to_numpy(dtype=int)), rounds["Points"].to_numpy())
+
+    offset = np.zeros(len(drivers))
+    if base_values.shape[1]:
+        last = pd.to_numeric(base_values.iloc[:, -1], errors="coerce").fillna(0.0)
+        offset[drivers.get_indexer(base["Pilote"])] = last.to_numpy(dtype=float)
+    cumulative = matrix.cumsum(axis=1) + offset[:, None]
+
+    past = np.zeros((len(drivers), base_values.shape[1]))
+    if base_values.shape[1]:
+        past[drivers.get_indexer(base["Pilote"])] = base_values.to_numpy(dtype=float)
+
+    values = pd.DataFrame(np.hstack([past, cumulative]), columns=list(base_values.columns) + keys)
+    meta.insert(3, "start", 0)
+    return pd.concat([meta, values], axis=1)
+
+
+def order_by_last(table: pd.DataFrame) -> pd.DataFrame:
+    """Classement au dernier GP ; égalités départagées par nom (ordre stable)."""
+    key = pd.DataFrame(
+        {"last": table.iloc[:, -1].to_numpy(dtype=float), "Pilote": table["Pilote"].to_numpy()}
+    )
+    order = key.sort_values(["last", "Pilote"], ascending=[False, True], kind="mergesort").index
+    return table.iloc[order]
@@ -3,16 +3,35 @@ from __future__ import annotations
 import argparse
 import json
 import os
-from datetime import datetime
+import sys
+from datetime import datetime, timedelta, timezone
 
 import fastf1
 import pandas as pd
 
-# fastf1.Cache.enable_cache("cache")  # cache local
-
 # Mapping fallback des photos pilotes (utilisé quand FastF1 ne fournit pas
 # HeadshotUrl, ce qui arrive notamment sur runners Linux / cache vide).
 _HERE = os.path.dirname(__file__)
+
+# Racine du repo sur sys.path (pour importer projects.common quand lancé en script)
+_REPO_ROOT = os.path.abspath(os.path.join(_HERE, "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from projects.common import clock  # noqa: E402
+from projects.common.fastf1_cache import enable_cache  # noqa: E402
+from projects.common.load_plan import PlannedSession, format_plan, plan_sessions  # noqa: E402
+from projects.common.results_store import REFRESH_DAYS, stored_in  # noqa: E402
+from projects.common.run_report import reported  # noqa: E402
+from projects.common.session_loader import load_sessions  # noqa: E402
+from projects.dashboard import seasons  # noqa: E402
+from projects.race_chart_builder.points_matrix import (  # noqa: E402
+    META_COLUMNS,
+    cumulative_table,
+    order_by_last,
+    round_points,
+)
+
 DRIVER_IMAGES_PATH = os.path.join(_HERE, "..", "dashboard", "driver_images.json")
 
 
@@ -32,15 +51,17 @@ class RaceChartBuilderFastF1:
         season: int,
         output_file: str | None = None,
         top_n: int | None = None,
+        max_workers: int | None = None,
     ):
         self.season = season
         self.top_n = top_n
+        self.max_workers = max_workers
         outputs_dir = os.path.join(os.path.dirname(__file__), "outputs")
         os.makedirs(outputs_dir, exist_ok=True)
         if output_file is None:
             output_file = f"f1_race_chart_fastf1_{season}.csv"
         self.output_file = os.path.join(outputs_dir, output_file)
-        self.drivers_data = {}
+        self.table = pd.DataFrame(columns=META_COLUMNS)
         self.race_keys = []
         self.driver_images_fallback = load_driver_images_fallback()
 
@@ -51,16 +72,23 @@ class RaceChartBuilderFastF1:
             return f"{country} - {locality}"
         return country
 
-    def build_results_table(self):
+    def plan(self, now: datetime | None = None) -> list[PlannedSession]:
+        """Sessions à charger d'après le calendrier (Race + Sprint des seuls week-ends sprint)."""
+        now = now or clock.now()
         schedule = fastf1.get_event_schedule(self.season)
+        return plan_sessions(
+            schedule, builders=("race_chart",), now=now, is_stored=stored_in(self.season)
+        )
 
-        # 1) On collecte d'abord toutes les courses PASSÉES avec leurs données + date réelle de la session Race
-        past_events_payload = (
-            []
-        )  # liste de tuples (race_date, round, col_name, race_results_df, sprint_points_dict)
-
-        from datetime import timezone
-
+    def _past_events(self, now: datetime) -> list[tuple[datetime, int, str, bool]]:
+        """(race_date, round, col_name, has_sprint) des courses passées, triées par date."""
+        schedule = fastf1.get_event_schedule(self.season)
+        sprints = {
+            p.round
+            for p in plan_sessions(schedule, builders=("race_chart",), now=now)
+            if p.code == "S"
+        }
+        past_events = []
         for _, event in schedule.iterrows():
             # 1️⃣ Identifier la date réelle de la course (session Race)
             race_date = event.get("Session5DateUtc", None)
@@ -69,92 +97,105 @@ class RaceChartBuilderFastF1:
             race_date = pd.to_datetime(race_date).to_pydatetime().replace(tzinfo=timezone.utc)
 
             # 2️⃣ Si la course n’a pas encore eu lieu → on saute
-            if race_date > datetime.now(timezone.utc):
+            if race_date > now:
                 continue
 
             round_no = int(event["RoundNumber"])
             col_name = self._col_name(event["Country"], event["Location"])
-
-            try:
-                race = fastf1.get_session(self.season, round_no, "Race")
-                race.load()
-                if race.results is None or len(race.results) == 0:
-                    continue
-            except Exception:
+            past_events.append((race_date, round_no, col_name, round_no in sprints))
+
+        # TRIER par date réelle de la course (ordre effectif des GP)
+        past_events.sort(key=lambda x: x[0])
+        return past_events
+
+    def _load_payload(self, events: list[tuple[datetime, int, str, bool]]) -> list[tuple]:
+        """Charge Race (+ Sprint si au programme du week-end) des GP donnés.
+
+        Retourne une liste de tuples (race_date, round, col_name, race_results_df,
+        sprint_results_df | None), sans les GP dont la course n'a pas de résultats.
+        """
+        # Chargement concurrent des sessions (erreurs capturées par session)
+        keys = []
+        for _, rnd, _, has_sprint in events:
+            keys.append((self.season, rnd, "R"))
+            if has_sprint:
+                keys.append((self.season, rnd, "S"))
+        loaded = load_sessions(keys, max_workers=self.max_workers)
+
+        payload = []
+        for race_date, round_no, col_name, has_sprint in events:
+            race = loaded[(self.season, round_no, "R")]
+            race_results = race.value if race.ok else None
+            if race_results is None or len(race_results) == 0:
                 continue
-
-            # On garde la même logique ensuite
-            sprint_points = {}
-            try:
-                sprint = fastf1.get_session(self.season, round_no, "Sprint")
-                sprint.load()
-                if sprint.results is not None and len(sprint.results) > 0:
-                    for _, row in sprint.results.iterrows():
-                        sprint_points[row.FullName] = float(row.Points or 0.0)
-            except Exception:
-                pass
-
-            past_events_payload.append(
-                (race_date, round_no, col_name, race.results.copy(), sprint_points)
-            )
-
-        # 2) TRIER par date réelle de la course (ordre effectif des GP)
-        past_events_payload.sort(key=lambda x: x[0])
-
-        # 3) Construire le cumul dans cet ordre
-        for idx, (race_date, round_no, col_name, race_results, sprint_points) in enumerate(
-            past_events_payload
-        ):
-            self.race_keys.append(col_name)
-
-            # cumuler les points (Race + Sprint éventuel)
-            for _, row in race_results.iterrows():
-                full_name = row.FullName
-                team = row.TeamName
-                # 1) HeadshotUrl FastF1 si fourni (cas idéal)
-                # 2) sinon fallback via driver_images.json (par abréviation FIA)
-                # 3) sinon chaîne vide (comportement historique)
-                image = getattr(row, "HeadshotUrl", "") or ""
-                if not image:
-                    abbr = getattr(row, "Abbreviation", "") or ""
-                    image = self.driver_images_fallback.get(abbr, "")
-                race_pts = float(row.Points or 0.0)
-                total_pts = race_pts + float(sprint_points.get(full_name, 0.0))
-
-                if full_name not in self.drivers_data:
-                    self.drivers_data[full_name] = {
-                        "Pilote": full_name,
-                        "image": image,
-                        "team": team,
-                        "start": 0,
-                    }
-                    # initialiser toutes les colonnes passées à 0
-                    for past in self.race_keys:
-                        self.drivers_data[full_name][past] = 0
-
-                # cumul
-                if idx == 0:
-                    self.drivers_data[full_name][col_name] = total_pts
-                else:
-                    prev = self.race_keys[-2]
-                    prev_points = float(self.drivers_data[full_name].get(prev, 0.0))
-                    self.drivers_data[full_name][col_name] = prev_points + total_pts
-
-            # compléter pour les pilotes absents à cette course
-            for d in self.drivers_data.values():
-                if col_name not in d:
-                    prev = d.get(self.race_keys[-2], 0.0) if len(self.race_keys) > 1 else 0.0
-                    d[col_name] = prev
+            sprint = loaded.get((self.season, round_no, "S"))
+            sprint_results = sprint.value if sprint and sprint.ok else None
+            payload.append((race_date, round_no, col_name, race_results, sprint_results))
+        return payload
+
+    def _accumulate(self, payload: list[tuple]) -> None:
+        """Ajoute les colonnes cumulées des GP du payload (déjà triés) à la suite."""
+        if not payload:
+            return
+        rounds = round_points(
+            [(race, sprint) for _, _, _, race, sprint in payload], self.driver_images_fallback
+        )
+        keys = [col_name for _, _, col_name, _, _ in payload]
+        self.table = cumulative_table(rounds, keys, base=self.table)
+        self.race_keys += keys
+
+    def load_existing(self) -> bool:
+        """Recharge le CSV déjà exporté (pilotes + colonnes cumulées).
+
+        Retourne False si le fichier est absent ou illisible.
+        """
+        if not os.path.exists(self.output_file):
+            return False
+        try:
+            df = pd.read_csv(self.output_file, encoding="utf-8-sig")
+        except (OSError, ValueError, pd.errors.ParserError):
+            return False
+        if list(df.columns[: len(META_COLUMNS)]) != META_COLUMNS:
+            return False
+        df[["image", "team"]] = df[["image", "team"]].fillna("")
+        self.race_keys = list(df.columns[len(META_COLUMNS) :])
+        self.table = df
+        return True
+
+    def build_results_table(self, incremental: bool = False, now: datetime | None = None):
+        """Construit le tableau cumulé des points.
+
+        `incremental=True` : repart du CSV existant et ne charge que les GP courus
+        qui y manquent (une course + un sprint éventuel après un GP au lieu de
+        toute la saison). Reconstruction complète si le CSV ne correspond pas au
+        début du calendrier (GP manquant au milieu, colonne inconnue) ou si son
+        dernier GP a moins de REFRESH_DAYS jours (résultats encore susceptibles
+        d'évoluer). Suppose un CSV exporté sans --top.
+        """
+        now = now or clock.now()
+        events = self._past_events(now)
+
+        if incremental and self.load_existing():
+            done = len(self.race_keys)
+            is_prefix = done > 0 and self.race_keys == [e[2] for e in events[:done]]
+            settled = is_prefix and now - events[done - 1][0] > timedelta(days=REFRESH_DAYS)
+            if settled:
+                missing = events[done:]
+                print(f"[INFO] Incrémental : {done} GP conservés, {len(missing)} à charger")
+                self._accumulate(self._load_payload(missing))
+                return
+            print("[INFO] Incrémental impossible : reconstruction complète")
+            self.table, self.race_keys = pd.DataFrame(columns=META_COLUMNS), []
+
+        self._accumulate(self._load_payload(events))
 
     def export_csv(self):
-        df = pd.DataFrame.from_dict(self.drivers_data, orient="index")
-
         if not self.race_keys:
             print("[!] Aucun GP couru detecte - rien a exporter.")
             return
 
-        last_gp = self.race_keys[-1]
-        df = df.sort_values(by=last_gp, ascending=False)
+        # Égalités départagées par nom : même ordre en build complet ou incrémental
+        df = order_by_last(self.table)
         if self.top_n is not None:
             df = df.head(self.top_n)
 
@@ -163,9 +204,14 @@ class RaceChartBuilderFastF1:
         print(df)
 
 
-def _parse_args() -> argparse.Namespace:
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="F1 race chart dataset builder (FastF1).")
-    parser.add_argument("--season", type=int, default=2025, help="Saison F1 (ex: 2025, 2026)")
+    parser.add_argument(
+        "--season",
+        type=int,
+        default=seasons.CURRENT_SEASON,
+        help=f"Saison F1 (défaut : {seasons.CURRENT_SEASON}, saison en cours)",
+    )
     parser.add_argument(
         "--top",
         type=int,
@@ -178,11 +224,39 @@ def _parse_args() -> argparse.Namespace:
         default=None,
         help="Nom du fichier CSV (défaut: f1_race_chart_fastf1_<season>.csv)",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Sessions FastF1 chargées en parallèle (défaut: F1_LOAD_WORKERS ou 4)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Repartir du CSV existant et n'ajouter que les GP courus manquants",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Affiche les sessions à charger et le volume estimé, sans rien charger",
+    )
+    return parser.parse_args(argv)
 
 
-if __name__ == "__main__":
-    args = _parse_args()
-    builder = RaceChartBuilderFastF1(season=args.season, output_file=args.output, top_n=args.top)
-    builder.build_results_table()
+@reported("race_chart_builder_fastf1")
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    enable_cache()
+    builder = RaceChartBuilderFastF1(
+        season=args.season, output_file=args.output, top_n=args.top, max_workers=args.workers
+    )
+    if args.dry_run:
+        print(format_plan(builder.plan(), args.season))
+        return 0
+    builder.build_results_table(incremental=args.incremental)
     builder.export_csv()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
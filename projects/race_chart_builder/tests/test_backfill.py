@@ -0,0 +1,53 @@
+"""Tests du backfill multi-saisons (plage, checkpoint, reprise) sans FastF1."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from projects.race_chart_builder import backfill
+
+
+def fake_build(season: int, outputs_dir: Path, incremental: bool) -> dict:
+    """Builder factice (module-level : picklable pour le pool de process)."""
+    if season == 2020:
+        raise RuntimeError("saison indisponible")
+    name = f"f1_race_chart_fastf1_{season}.csv"
+    (outputs_dir / name).write_text("Pilote\n", encoding="utf-8")
+    return {"file": name, "rounds": 3, "lastGp": "Japan", "complete": season < 2026}
+
+
+def test_parse_seasons() -> None:
+    assert backfill.parse_seasons("2018-2020,2023, 2019") == [2018, 2019, 2020, 2023]
+    with pytest.raises(ValueError):
+        backfill.parse_seasons("2026-2018")
+
+
+def test_backfill_checkpoints_and_resumes(tmp_path: Path) -> None:
+    counts = backfill.run_backfill([2019, 2020, 2021], tmp_path, processes=1, build=fake_build)
+    assert counts == {"built": 2, "skipped": 0, "failed": 1}
+    index = json.loads((tmp_path / backfill.INDEX_NAME).read_text(encoding="utf-8"))
+    assert list(index["seasons"]) == ["2019", "2021"]
+
+    # Reprise : seules la saison en échec et la saison en cours sont relancées
+    built: list[int] = []
+
+    def record(season: int, outputs_dir: Path, incremental: bool) -> dict:
+        built.append(season)
+        return {"file": f"{season}.csv", "rounds": 1, "lastGp": None, "complete": False}
+
+    counts = backfill.run_backfill([2019, 2020, 2021, 2026], tmp_path, processes=1, build=record)
+    assert built == [2020, 2026]
+    assert counts["skipped"] == 2
+
+
+def test_backfill_process_pool(tmp_path: Path) -> None:
+    counts = backfill.run_backfill([2021, 2022, 2026], tmp_path, processes=2, build=fake_build)
+    assert counts == {"built": 3, "skipped": 0, "failed": 0}
+    assert sorted(p.name for p in tmp_path.glob("*.csv")) == [
+        "f1_race_chart_fastf1_2021.csv",
+        "f1_race_chart_fastf1_2022.csv",
+        "f1_race_chart_fastf1_2026.csv",
+    ]
@@ -0,0 +1,107 @@
+"""Tests du mode incrémental du race chart (sans réseau : calendrier et sessions simulés)."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from projects.common.session_loader import Loaded
+from projects.race_chart_builder import race_chart_builder_fastf1 as rc
+
+RACES = {
+    1: ("Australia", "Melbourne", "2026-03-08 04:00"),
+    2: ("China", "Shanghai", "2026-03-15 07:00"),
+    3: ("Japan", "Suzuka", "2026-03-29 05:00"),
+}
+POINTS = {
+    (1, "R"): {"Max Verstappen": 25.0, "Lando Norris": 18.0},
+    (2, "S"): {"Lando Norris": 8.0, "Max Verstappen": 7.0},
+    (2, "R"): {"Lando Norris": 25.0, "Max Verstappen": 18.0},
+    # Nouveau pilote au round 3 : colonnes précédentes à 0
+    (3, "R"): {"Oscar Piastri": 25.0, "Max Verstappen": 18.0},
+}
+
+
+def _results(points: dict[str, float]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "FullName": list(points),
+            "Abbreviation": [n.split()[-1][:3].upper() for n in points],
+            "TeamName": ["Team"] * len(points),
+            "HeadshotUrl": [""] * len(points),
+            "Points": list(points.values()),
+        }
+    )
+
+
+@pytest.fixture
+def fake_fastf1(monkeypatch) -> list[tuple]:
+    requested: list[tuple] = []
+    schedule = pd.DataFrame(
+        [
+            {
+                "RoundNumber": rnd,
+                "Country": country,
+                "Location": location,
+                # Round 2 = week-end sprint
+                "Session3": "Sprint" if rnd == 2 else "Practice 3",
+                "Session3DateUtc": pd.Timestamp(date) - pd.Timedelta(days=1),
+                "Session5": "Race",
+                "Session5DateUtc": pd.Timestamp(date),
+            }
+            for rnd, (country, location, date) in RACES.items()
+        ]
+    )
+
+    def load_sessions(keys, max_workers=None):
+        out = {}
+        for key in keys:
+            requested.append(key)
+            pts = POINTS.get(key[1:])
+            if pts is None:
+                out[key] = Loaded(key, error=ValueError("session absente"))
+            else:
+                out[key] = Loaded(key, value=_results(pts))
+        return out
+
+    monkeypatch.setattr(rc.fastf1, "get_event_schedule", lambda season: schedule)
+    monkeypatch.setattr(rc, "load_sessions", load_sessions)
+    return requested
+
+
+def _build(path: Path, now: datetime, incremental: bool = False) -> str:
+    builder = rc.RaceChartBuilderFastF1(season=2026, output_file=str(path))
+    builder.build_results_table(incremental=incremental, now=now)
+    builder.export_csv()
+    return path.read_text(encoding="utf-8-sig")
+
+
+def test_incremental_matches_full_rebuild(tmp_path: Path, fake_fastf1: list) -> None:
+    after_r3 = datetime(2026, 4, 10, tzinfo=timezone.utc)
+    full = _build(tmp_path / "full.csv", after_r3)
+
+    # CSV à jour au round 2, puis passage incrémental après le round 3
+    partial = tmp_path / "partial.csv"
+    _build(partial, datetime(2026, 3, 25, tzinfo=timezone.utc))
+    fake_fastf1.clear()
+    assert _build(partial, after_r3, incremental=True) == full
+    # Seul le round 3 a été chargé
+    assert fake_fastf1 == [(2026, 3, "R")]
+
+
+def test_recent_last_round_forces_full_rebuild(tmp_path: Path, fake_fastf1: list) -> None:
+    path = tmp_path / "chart.csv"
+    _build(path, datetime(2026, 3, 15, 12, tzinfo=timezone.utc))  # soir du round 2
+    fake_fastf1.clear()
+    # Le lendemain, le round 2 est encore dans la fenêtre de propagation
+    _build(path, datetime(2026, 3, 16, 12, tzinfo=timezone.utc), incremental=True)
+    # Sprint chargé pour le seul week-end sprint
+    assert fake_fastf1 == [(2026, 1, "R"), (2026, 2, "R"), (2026, 2, "S")]
+
+
+def test_incremental_without_csv_builds_everything(tmp_path: Path, fake_fastf1: list) -> None:
+    csv = _build(tmp_path / "new.csv", datetime(2026, 4, 10, tzinfo=timezone.utc), True)
+    assert csv.splitlines()[0] == "Pilote,image,team,start,Australia,China,Japan"
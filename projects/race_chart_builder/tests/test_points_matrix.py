@@ -0,0 +1,50 @@
+"""Tests du moteur de points cumulés (matrice pilotes × GP)."""
+
+from __future__ import annotations
+
+import pandas as pd
+
+from projects.race_chart_builder.points_matrix import cumulative_table, order_by_last, round_points
+
+
+def _race(points: dict[str, float]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "FullName": list(points),
+            "Abbreviation": [n[:3].upper() for n in points],
+            "TeamName": ["Team"] * len(points),
+            "HeadshotUrl": [""] * len(points),
+            "Points": list(points.values()),
+        }
+    )
+
+
+SESSIONS = [
+    (_race({"Max": 25.0, "Lando": 18.0}), None),
+    # Sprint : ajouté aux classés de la course du même week-end
+    (_race({"Lando": 25.0, "Max": 18.0}), pd.DataFrame({"FullName": ["Max"], "Points": [8.0]})),
+    # Lando absent (report), Oscar arrive (colonnes passées à 0)
+    (_race({"Oscar": 25.0, "Max": float("nan")}), None),
+]
+
+
+def test_cumulative_table_carries_points_forward() -> None:
+    table = cumulative_table(
+        round_points(SESSIONS, {"OSC": "oscar.png"}), ["Australia", "Spain", "Spain"]
+    )
+    assert list(table.columns[4:]) == ["Australia", "Spain", "Spain"]
+    rows = {r[0]: list(r[4:]) for r in table.itertuples(index=False)}
+    assert rows == {
+        "Max": [25.0, 51.0, 51.0],
+        "Lando": [18.0, 43.0, 43.0],
+        "Oscar": [0.0, 0.0, 25.0],
+    }
+    assert table.loc[table["Pilote"] == "Oscar", "image"].item() == "oscar.png"
+    assert list(order_by_last(table)["Pilote"]) == ["Max", "Lando", "Oscar"]
+
+
+def test_cumulative_table_extends_existing_base() -> None:
+    full = cumulative_table(round_points(SESSIONS), ["A", "B", "C"])
+    base = cumulative_table(round_points(SESSIONS[:1]), ["A"])
+    extended = cumulative_table(round_points(SESSIONS[1:]), ["B", "C"], base=base)
+    pd.testing.assert_frame_equal(extended, full)
@@ -0,0 +1,456 @@
+"""Moteur commun des heatmaps de saison : données chargées une fois, sorties en variantes.
+
+Les deux heatmaps (complète V1, leaders V2) partagent les mêmes sessions
+(Race + Sprint des week-ends sprint) et la même table de base : une ligne par
+pilote classé et par GP, totaux et rang de saison. Chaque variante (`Flavor`)
+déclare ensuite :
+
+  - son libellé de GP (avec ou sans "*" pour les week-ends sprint) ;
+  - les colonnes métriques qu'elle ajoute, par nom, parmi celles enregistrées
+    avec `@metric` (FinishIcon, colonnes d'analyse des popups…) ;
+  - ses colonnes de sortie et celles affichées en entiers.
+
+    engine = HeatmapEngine(2026, flavors=("leaders", "full"))
+    engine.run()   # un chargement, deux CSV
+
+Une nouvelle sortie = un `Flavor` dans FLAVORS (+ ses `@metric` si besoin),
+sans recharger la saison.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import sys
+from dataclasses import dataclass
+from datetime import timedelta, timezone
+from typing import Callable
+
+import fastf1 as ff1
+import pandas as pd
+
+# Racine du repo sur sys.path (pour importer projects.common quand lancé en script)
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from projects.common import clock  # noqa: E402
+from projects.common.load_plan import plan_sessions  # noqa: E402
+from projects.common.results_store import REFRESH_DAYS, stored_in  # noqa: E402
+from projects.common.rolling_stats import (  # noqa: E402
+    NAN,
+    CumulativeRate,
+    RunningMean,
+    RunningMedian,
+    RunningSum,
+    WindowMean,
+)
+from projects.common.session_loader import load_sessions  # noqa: E402
+
+SPRINT_EVENT_FORMATS = {"sprint", "sprint_shootout", "sprint_qualifying"}
+DRIVER_IMAGES_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "dashboard", "driver_images.json"
+)
+
+METRICS: dict[str, Callable[[pd.DataFrame], pd.DataFrame]] = {}
+
+
+def metric(name: str):
+    """Enregistre une fonction (df trié par pilote puis GP) -> df enrichi de colonnes."""
+
+    def register(func: Callable[[pd.DataFrame], pd.DataFrame]):
+        METRICS[name] = func
+        return func
+
+    return register
+
+
+@dataclass(frozen=True)
+class Flavor:
+    name: str
+    filename: str  # motif, {season} remplacé
+    columns: tuple[str, ...]
+    metrics: tuple[str, ...] = ()
+    sprint_star: bool = False  # libellé "Chinese*" pour un week-end sprint
+    int_columns: tuple[str, ...] = ()  # entiers "propres" ('' si absent)
+    nullable_int_columns: tuple[str, ...] = ()  # Int64 (<NA> si absent)
+
+
+def rank_label(rank) -> str:
+    if pd.isna(rank):
+        return ""
+    rank = int(rank)
+    return "1er" if rank == 1 else f"{rank}e"
+
+
+def finish_icon(pos) -> str:
+    if pd.isna(pos):
+        return ""
+    try:
+        p = int(pos)
+    except Exception:
+        return ""
+    return {1: "🥇", 2: "🥈", 3: "🥉"}.get(p, "")
+
+
+@metric("finish_icon")
+def _finish_icon(df: pd.DataFrame) -> pd.DataFrame:
+    df["FinishIcon"] = df["FinishPosition"].map(finish_icon)
+    return df
+
+
+ANALYSIS_COLUMNS = (
+    "GridGain",
+    "CumulativePoints",
+    "AvgPointsToDate",
+    "Last5Avg",
+    "AvgFinish",
+    "MedianFinish",
+    "PodiumRate",
+    "PointsRate",
+    "AvgGridGain",
+)
+
+
+class DriverForm:
+    """État "à date" d'un pilote : un `push` par GP, dans l'ordre du calendrier."""
+
+    def __init__(self) -> None:
+        self.races = 0
+        self.points = RunningSum()
+        self.last5 = WindowMean(5)
+        self.finish_mean = RunningMean()
+        self.finish_median = RunningMedian()
+        self.podiums = CumulativeRate()
+        self.scored = CumulativeRate()
+        self.grid_gain = RunningMean()
+
+    def push(self, points: float, finish: float, grid: float) -> tuple[float, ...]:
+        """Valeurs des ANALYSIS_COLUMNS après ce GP (NaN = donnée absente)."""
+        self.races += 1
+        gain = grid - finish  # NaN si grille ou arrivée inconnue
+        cumulative = self.points.push(points)
+        return (
+            gain,
+            cumulative,
+            cumulative / self.races,
+            self.last5.push(points),
+            self.finish_mean.push(finish),
+            self.finish_median.push(finish),
+            self.podiums.push(NAN if math.isnan(finish) else float(finish <= 3)),
+            self.scored.push(float(points > 0)),
+            self.grid_gain.push(gain),
+        )
+
+
+@metric("analysis")
+def _analysis(df: pd.DataFrame) -> pd.DataFrame:
+    """Colonnes des popups (cumulées / glissantes) : une passe, dans l'ordre pilote puis GP."""
+    forms: dict[str, DriverForm] = {}
+    rows = [
+        forms.setdefault(driver, DriverForm()).push(points, finish, grid)
+        for driver, points, finish, grid in zip(
+            df["Driver"],
+            df["Points"].to_numpy(dtype=float),
+            df["FinishPosition"].to_numpy(dtype=float),
+            df["GridPosition"].to_numpy(dtype=float),
+        )
+    ]
+    computed = pd.DataFrame(rows, index=df.index, columns=ANALYSIS_COLUMNS)
+    if "Stored" in df.columns:
+        # GP déjà exportés (mode incrémental) : valeurs conservées, noyaux seulement rejoués
+        stored = df["Stored"].fillna(False).to_numpy(dtype=bool)
+        computed.loc[stored] = df.loc[stored, list(ANALYSIS_COLUMNS)].to_numpy(dtype=float)
+    df[list(ANALYSIS_COLUMNS)] = computed
+    return df
+
+
+_BASE = ("Driver", "DriverName", "Team", "EventName", "EventNameFull")
+
+FLAVORS = {
+    "full": Flavor(
+        name="full",
+        filename="f1_{season}_full_heatmap.csv",
+        columns=_BASE
+        + ("Points", "TotalPoints", "Rank", "RankLabel", "HeadshotUrl")
+        + ("GridPosition", "FinishPosition"),
+        nullable_int_columns=("TotalPoints", "GridPosition", "FinishPosition", "Rank"),
+    ),
+    "leaders": Flavor(
+        name="leaders",
+        filename="f1_{season}_leaders_heatmap.csv",
+        columns=_BASE
+        + ("Points", "SprintPoints", "TotalPoints", "Rank", "RankLabel", "HeadshotUrl")
+        + ("GridPosition", "FinishPosition", "FinishIcon", "GridGain", "CumulativePoints")
+        + ("AvgPointsToDate", "Last5Avg", "AvgFinish", "MedianFinish", "PodiumRate")
+        + ("PointsRate", "AvgGridGain"),
+        metrics=("finish_icon", "analysis"),
+        sprint_star=True,
+        int_columns=(
+            "TotalPoints",
+            "GridPosition",
+            "FinishPosition",
+            "Rank",
+            "Points",
+            "SprintPoints",
+            "CumulativePoints",
+        ),
+    ),
+}
+
+
+def load_headshot_fallback() -> dict[str, str]:
+    """{ abréviation FIA : URL photo } depuis projects/dashboard/driver_images.json."""
+    try:
+        with open(DRIVER_IMAGES_PATH, encoding="utf-8") as f:
+            data = json.load(f)
+        return {abbr: info.get("image", "") for abbr, info in data.get("drivers", {}).items()}
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    return df[name] if name in df.columns else pd.Series(None, index=df.index, dtype=object)
+
+
+class HeatmapEngine:
+    """Charge une saison une fois et produit les CSV des variantes demandées."""
+
+    def __init__(self, season, flavors=("leaders",), outputs=None, max_workers=None):
+        self.season = season
+        self.max_workers = max_workers
+        self.flavors = [FLAVORS[f] if isinstance(f, str) else f for f in flavors]
+        self.output_dir = os.path.join(os.path.dirname(__file__), "outputs")
+        os.makedirs(self.output_dir, exist_ok=True)
+        outputs = outputs or {}
+        self.output_paths = {
+            f.name: self._resolve_output_path(
+                outputs.get(f.name) or f.filename.format(season=season)
+            )
+            for f in self.flavors
+        }
+        self.schedule = self._get_schedule()
+        self.df = None
+        self.frames: dict[str, pd.DataFrame] = {}
+
+    def _resolve_output_path(self, output_csv):
+        output_csv = os.fspath(output_csv)
+        if os.path.isabs(output_csv):
+            return output_csv
+        return os.path.join(self.output_dir, output_csv)
+
+    def _get_schedule(self):
+        schedule = ff1.get_event_schedule(self.season, include_testing=False).copy()
+        schedule["ShortEventName"] = schedule["EventName"].str.replace("Grand Prix", "").str.strip()
+        schedule["HasSprint"] = schedule["EventFormat"].isin(SPRINT_EVENT_FORMATS)
+        return schedule
+
+    def plan(self, now=None):
+        """Sessions disputées utiles à la heatmap (Race + Sprint des week-ends sprint)."""
+        return plan_sessions(
+            self.schedule, builders=("heatmap",), now=now, is_stored=stored_in(self.season)
+        )
+
+    def fetch_results(self, rounds=None, now=None):
+        """Table de base : une ligne par pilote classé et par GP couru (Course + Sprint).
+
+        `rounds` : limite le chargement à ces GP (mode incrémental).
+        """
+        keys = [
+            (self.season, p.round, p.code)
+            for p in self.plan(now)
+            if rounds is None or p.round in rounds
+        ]
+        loaded = load_sessions(keys, max_workers=self.max_workers)
+
+        frames = []
+        for event in self.schedule.itertuples(index=False):
+            round_number = int(event.RoundNumber)
+            if rounds is not None and round_number not in rounds:
+                continue
+            race = loaded.get((self.season, round_number, "R"))
+            if race is None or not race.ok or race.value is None or race.value.empty:
+                continue  # GP non couru ou data absente
+            results = race.value
+
+            sprint_points = pd.Series(0.0, index=results.index)
+            if event.HasSprint:
+                sprint = loaded.get((self.season, round_number, "S"))
+                if sprint is None or not sprint.ok or sprint.value is None:
+                    continue  # sprint pas encore disponible : GP complet au prochain run
+                by_driver = sprint.value.groupby("Abbreviation")["Points"].sum()
+                sprint_points = results["Abbreviation"].map(by_driver).fillna(0.0)
+
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "Driver": results["Abbreviation"],
+                        "DriverName": results["FullName"],
+                        "Team": results["TeamName"],
+                        "RoundNumber": round_number,
+                        "ShortEventName": event.ShortEventName,
+                        "HasSprint": bool(event.HasSprint),
+                        "EventNameFull": event.EventName,
+                        "Points": results["Points"] + sprint_points,  # Course + Sprint éventuel
+                        "SprintPoints": sprint_points,
+                        "GridPosition": _column(results, "GridPosition"),
+                        "FinishPosition": _column(results, "Position"),
+                        "HeadshotUrl": _column(results, "HeadshotUrl"),
+                    }
+                )
+            )
+        self.df = pd.concat(frames, ignore_index=True) if frames else None
+
+    def build_dataframe(self):
+        """Totaux de saison et rang (méthode min) par pilote."""
+        totals = self.df.groupby("Driver")["Points"].sum()
+        ranks = totals.rank(method="min", ascending=False).astype(int)
+        self.df["TotalPoints"] = self.df["Driver"].map(totals)
+        self.df["Rank"] = self.df["Driver"].map(ranks)
+        self.df["RankLabel"] = self.df["Rank"].map(rank_label)
+
+    def patch_headshots(self):
+        """Comble les HeadshotUrl manquantes via projects/dashboard/driver_images.json.
+
+        Cas typique : sur runner Linux ou cache vide, FastF1 ne fournit pas l'URL.
+        Le mapping partagé (par abréviation FIA) sert de source de vérité.
+        """
+        urls = self.df["HeadshotUrl"].astype(str)
+        missing = urls.isin(["", "None"]) | urls.str.lower().isin(["none", "nan"])
+        fallback = self.df["Driver"].map(load_headshot_fallback()).fillna("")
+        self.df["HeadshotUrl"] = urls.where(~missing | (fallback == ""), fallback)
+
+    def finalize(self, flavor: Flavor) -> pd.DataFrame:
+        df = self.df.copy()
+        df["EventName"] = df["ShortEventName"] + (
+            df["HasSprint"].map({True: "*", False: ""}) if flavor.sprint_star else ""
+        )
+
+        # Ordre des pilotes (classement) et des GP (calendrier)
+        pilot_order = (
+            df.groupby("Driver")["TotalPoints"].mean().sort_values(ascending=False).index.tolist()
+        )
+        df["Driver"] = pd.Categorical(df["Driver"], categories=pilot_order, ordered=True)
+        events = self.schedule.sort_values("RoundNumber")
+        gp_order = events["ShortEventName"] + (
+            events["HasSprint"].map({True: "*", False: ""}) if flavor.sprint_star else ""
+        )
+        df["EventName"] = pd.Categorical(df["EventName"], categories=gp_order, ordered=True)
+
+        for col in ("TotalPoints", "GridPosition", "FinishPosition", "Rank"):
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+        df = df.sort_values(["Driver", "EventName"])
+
+        for name in flavor.metrics:
+            df = METRICS[name](df)
+
+        for col in flavor.nullable_int_columns:
+            # Total à demi-points (12.5) : arrondi comme les int_columns avant Int64
+            df[col] = df[col].round().astype(pd.Int64Dtype())
+        for col in flavor.int_columns:
+            df[col] = df[col].apply(lambda x: "" if pd.isna(x) else int(round(x)))
+        return df[list(flavor.columns)].sort_values(["Driver", "EventName"])
+
+    def finalize_dataframe(self):
+        self.frames = {f.name: self.finalize(f) for f in self.flavors}
+
+    def export(self):
+        for flavor in self.flavors:
+            path = self.output_paths[flavor.name]
+            self.frames[flavor.name].to_csv(path, index=False)
+            print(f"Exported to {path}")
+
+    def _read_export(self, name):
+        """CSV déjà exporté de la variante `name` (None si absent ou d'un autre format)."""
+        flavor = next((f for f in self.flavors if f.name == name), None)
+        path = flavor and self.output_paths[name]
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            df = pd.read_csv(path, keep_default_na=False, na_values=[""])
+        except (OSError, ValueError, pd.errors.ParserError):
+            return None
+        return df if list(df.columns) == list(flavor.columns) else None
+
+    def load_existing(self, now=None):
+        """Relit le CSV leaders déjà exporté, sous forme de table de base.
+
+        Garde les colonnes d'analyse (reprises telles quelles, `Stored`=True) et
+        écarte les GP de moins de REFRESH_DAYS jours (résultats encore susceptibles
+        d'évoluer : rechargés). Le CSV leaders arrondit les points à l'entier :
+        si la variante full est demandée, les points exacts (demi-points) sont
+        repris de son propre CSV. None si un CSV est absent, d'un autre format,
+        si les deux CSV ne couvrent pas les mêmes lignes ou si un GP est inconnu
+        du calendrier.
+        """
+        df = self._read_export("leaders")
+        if df is None:
+            return None
+        if "full" in self.output_paths:
+            full = self._read_export("full")
+            if full is None:
+                return None
+            exact = full.set_index(["Driver", "EventNameFull"])["Points"]
+            keys = pd.MultiIndex.from_frame(df[["Driver", "EventNameFull"]])
+            if len(full) != len(df) or not keys.isin(exact.index).all():
+                return None
+            df["Points"] = exact.reindex(keys).to_numpy()
+
+        events = self.schedule.set_index("EventName")
+        rounds = df["EventNameFull"].map(events["RoundNumber"])
+        if rounds.isna().any():
+            return None
+        race_dates = pd.to_datetime(events["Session5DateUtc"]).dt.tz_localize(timezone.utc)
+        now = now or clock.now()
+        settled = now - df["EventNameFull"].map(race_dates) > timedelta(days=REFRESH_DAYS)
+
+        df["RoundNumber"] = rounds.astype(int)
+        df["ShortEventName"] = df["EventNameFull"].map(events["ShortEventName"])
+        df["HasSprint"] = df["EventNameFull"].map(events["HasSprint"]).astype(bool)
+        for col in ("DriverName", "Team", "HeadshotUrl"):
+            df[col] = df[col].fillna("").astype(str)
+        df["Stored"] = True
+        keep = ["Driver", "DriverName", "Team", "RoundNumber", "ShortEventName", "HasSprint"]
+        keep += ["EventNameFull", "Points", "SprintPoints", "GridPosition", "FinishPosition"]
+        keep += ["HeadshotUrl", "Stored", *ANALYSIS_COLUMNS]
+        return df.loc[settled.to_numpy(), keep].reset_index(drop=True)
+
+    def run(self, incremental=False, now=None):
+        """Charge, calcule et exporte les variantes.
+
+        `incremental=True` (variante leaders requise, ValueError sinon) : repart
+        du CSV leaders existant et ne charge que les GP
+        courus qui y manquent. Totaux, rangs et ordre des pilotes sont recalculés
+        sur toute la saison ; les colonnes d'analyse des GP déjà exportés sont
+        conservées et celles des nouveaux GP prolongent l'état des noyaux, rejoué
+        depuis l'historique des CSV (points exacts du CSV full s'il est demandé,
+        sinon arrondis à l'entier comme dans le CSV leaders).
+        """
+        if incremental and "leaders" not in self.output_paths:
+            # Base incrémentale = CSV leaders (SprintPoints, colonnes d'analyse)
+            raise ValueError("incremental=True requiert la variante leaders")
+        now = now or clock.now()
+        stored = self.load_existing(now) if incremental else None
+        if stored is not None:
+            missing = {p.round for p in self.plan(now)} - set(stored["RoundNumber"])
+            print(
+                f"[INFO] Incrémental : {stored['RoundNumber'].nunique()} GP conservés, "
+                f"{len(missing)} à charger"
+            )
+            self.fetch_results(rounds=missing, now=now)
+            fresh = self.df.assign(Stored=False) if self.df is not None else None
+            self.df = pd.concat([stored, fresh], ignore_index=True) if fresh is not None else stored
+            if self.df.empty:
+                self.df = None
+        else:
+            if incremental:
+                print("[INFO] Incrémental impossible : reconstruction complète")
+            self.fetch_results(now=now)
+        if self.df is None:
+            print("[!] Aucun GP couru detecte - rien a exporter.")
+            return
+        self.build_dataframe()
+        self.patch_headshots()
+        self.finalize_dataframe()
+        self.export()
@@ -1,24 +1,91 @@
-from exporter_lead import F1FlourishExporterLead
+import os
+import sys
 
+# Racine du repo sur sys.path (pour importer projects.common quand lancé en script)
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
 
-def parse_args():
+from projects.common.fastf1_cache import enable_cache  # noqa: E402
+from projects.common.load_plan import format_plan  # noqa: E402
+from projects.common.run_report import reported  # noqa: E402
+from projects.dashboard import seasons  # noqa: E402
+from projects.season_summary_heatmap.engine import FLAVORS, HeatmapEngine  # noqa: E402
+
+DEFAULT_FLAVORS = "leaders"
+
+
+def parse_args(argv=None, default_flavors=DEFAULT_FLAVORS, description=None):
     import argparse
 
-    parser = argparse.ArgumentParser(description="Export F1 season leaders heatmap CSV.")
-    parser.add_argument("--season", type=int, default=2025, help="Season to export.")
+    parser = argparse.ArgumentParser(
+        description=description or "Export F1 season leaders heatmap CSV."
+    )
+    parser.add_argument(
+        "--season",
+        type=int,
+        default=seasons.CURRENT_SEASON,
+        help=f"Season to export (default: {seasons.CURRENT_SEASON}, the current season).",
+    )
+    parser.add_argument(
+        "--flavors",
+        default=default_flavors,
+        help=f"Comma-separated heatmaps built from one load ({', '.join(FLAVORS)}).",
+    )
     parser.add_argument(
         "--output",
         default=None,
-        help="CSV filename in outputs/ or an absolute output path.",
+        help="CSV filename in outputs/ or an absolute output path (first flavor only).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Sessions loaded in parallel (default: F1_LOAD_WORKERS or 4).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Extend the existing leaders CSV with the races it is missing only "
+        "(requires the leaders flavor).",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the session load plan and estimated download size, then exit.",
     )
-    return parser.parse_args()
+    args = parser.parse_args(argv)
+    args.flavors = [f.strip() for f in args.flavors.split(",") if f.strip()]
+    unknown = [f for f in args.flavors if f not in FLAVORS]
+    if unknown or not args.flavors:
+        parser.error(f"unknown flavor(s): {', '.join(unknown)} (choose from {', '.join(FLAVORS)})")
+    if args.incremental and "leaders" not in args.flavors:
+        parser.error(
+            "--incremental extends the leaders CSV: add the leaders flavor "
+            "(--flavors leaders,full) or drop --incremental"
+        )
+    return args
+
+
+def run(args):
+    enable_cache()
+    engine = HeatmapEngine(
+        season=args.season,
+        flavors=args.flavors,
+        outputs={args.flavors[0]: args.output},
+        max_workers=args.workers,
+    )
+    if args.dry_run:
+        print(format_plan(engine.plan(), args.season))
+        return 0
+    engine.run(incremental=args.incremental)
+    return 0
+
+
+@reported("lead_main")
+def main(argv=None):
+    return run(parse_args(argv))
 
 
 if __name__ == "__main__":
-    args = parse_args()
-    exporter = F1FlourishExporterLead(season=args.season, output_csv=args.output)
-    exporter.fetch_results()
-    exporter.build_dataframe()
-    exporter.patch_headshots()
-    exporter.finalize_dataframe()
-    exporter.export()
+    sys.exit(main())
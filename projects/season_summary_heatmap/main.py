@@ -1,24 +1,23 @@
-from exporter import F1FlourishExporter
+import os
+import sys
 
+from lead_main import parse_args, run
 
-def parse_args():
-    import argparse
+# Racine du repo sur sys.path (pour importer projects.common quand lancé en script)
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
 
-    parser = argparse.ArgumentParser(description="Export F1 season full heatmap CSV.")
-    parser.add_argument("--season", type=int, default=2025, help="Season to export.")
-    parser.add_argument(
-        "--output",
-        default=None,
-        help="CSV filename in outputs/ or an absolute output path.",
+from projects.common.run_report import reported  # noqa: E402
+
+
+@reported("main")
+def main(argv=None):
+    args = parse_args(
+        argv, default_flavors="full", description="Export F1 season full heatmap CSV."
     )
-    return parser.parse_args()
+    return run(args)
 
 
 if __name__ == "__main__":
-    args = parse_args()
-    exporter = F1FlourishExporter(season=args.season, output_csv=args.output)
-    exporter.fetch_results()
-    exporter.build_dataframe()
-    exporter.patch_headshots()
-    exporter.finalize_dataframe()
-    exporter.export()
+    sys.exit(main())
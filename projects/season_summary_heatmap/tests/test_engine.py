@@ -0,0 +1,199 @@
+"""Tests du moteur de heatmaps (un chargement, plusieurs variantes) sans réseau."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from projects.common.session_loader import Loaded
+from projects.season_summary_heatmap import engine as hm
+from projects.season_summary_heatmap import lead_main
+
+EVENTS = [
+    (1, "Australian Grand Prix", "conventional"),
+    (2, "Chinese Grand Prix", "sprint_qualifying"),
+    (3, "Japanese Grand Prix", "conventional"),  # couru le 12/04, résultats absents
+]
+SESSIONS = {
+    (1, "R"): [("VER", 1.0, 3.0, 25.0), ("NOR", 2.0, 1.0, 18.0), ("PIA", None, 2.0, 0.0)],
+    (2, "S"): [("NOR", 1.0, 1.0, 8.0), ("VER", 2.0, 2.0, 7.0)],
+    (2, "R"): [("NOR", 1.0, 2.0, 25.0), ("PIA", 2.0, 1.0, 18.0), ("VER", 3.0, 3.0, 15.0)],
+}
+
+
+def _results(rows) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Abbreviation": [r[0] for r in rows],
+            "FullName": [f"Driver {r[0]}" for r in rows],
+            "TeamName": ["Team"] * len(rows),
+            "HeadshotUrl": [""] * len(rows),
+            "Position": [r[1] for r in rows],
+            "GridPosition": [r[2] for r in rows],
+            "Points": [r[3] for r in rows],
+        }
+    )
+
+
+@pytest.fixture
+def fake_fastf1(monkeypatch) -> list[tuple]:
+    requested: list[tuple] = []
+    schedule = pd.DataFrame(
+        [
+            {
+                "RoundNumber": rnd,
+                "EventName": name,
+                "EventFormat": fmt,
+                "Session3": "Sprint" if fmt != "conventional" else "Practice 3",
+                "Session3DateUtc": pd.Timestamp("2026-03-01") + pd.Timedelta(days=14 * rnd - 1),
+                "Session5": "Race",
+                "Session5DateUtc": pd.Timestamp("2026-03-01") + pd.Timedelta(days=14 * rnd),
+            }
+            for rnd, name, fmt in EVENTS
+        ]
+    )
+
+    def load_sessions(keys, max_workers=None):
+        requested.extend(keys)
+        return {
+            k: (
+                Loaded(k, value=_results(SESSIONS[k[1:]]))
+                if k[1:] in SESSIONS
+                else Loaded(k, error=ValueError("session absente"))
+            )
+            for k in keys
+        }
+
+    monkeypatch.setattr(hm.ff1, "get_event_schedule", lambda *a, **k: schedule)
+    monkeypatch.setattr(hm, "load_sessions", load_sessions)
+    monkeypatch.setattr(hm, "stored_in", lambda season: lambda rnd, code: True)
+    monkeypatch.setattr(hm, "load_headshot_fallback", lambda: {"PIA": "pia.png"})
+    return requested
+
+
+def test_one_load_for_both_flavors(tmp_path: Path, fake_fastf1: list) -> None:
+    engine = hm.HeatmapEngine(
+        2026,
+        flavors=("leaders", "full"),
+        outputs={"leaders": tmp_path / "leaders.csv", "full": tmp_path / "full.csv"},
+    )
+    engine.run()
+    # Une seule série de chargements (sessions courues, sprint du seul week-end sprint)
+    assert len(fake_fastf1) == len(set(fake_fastf1))
+    assert {k[1:] for k in fake_fastf1} <= set(SESSIONS) | {(3, "R")}
+
+    leaders = pd.read_csv(tmp_path / "leaders.csv")
+    full = pd.read_csv(tmp_path / "full.csv")
+    assert list(full.columns) == list(hm.FLAVORS["full"].columns)
+    assert list(leaders.columns) == list(hm.FLAVORS["leaders"].columns)
+    assert list(leaders["EventName"].unique()) == ["Australian", "Chinese*"]
+    assert list(full["EventName"].unique()) == ["Australian", "Chinese"]
+
+    nor = leaders[leaders["Driver"] == "NOR"].reset_index(drop=True)
+    assert list(nor["Points"]) == [18, 33]  # course + sprint
+    assert list(nor["CumulativePoints"]) == [18, 51]
+    assert nor.loc[0, "Rank"] == 1 and nor.loc[0, "RankLabel"] == "1er"
+    pia = leaders[leaders["Driver"] == "PIA"]
+    assert set(pia["HeadshotUrl"]) == {"pia.png"}
+    assert list(leaders["Driver"].drop_duplicates()) == ["NOR", "VER", "PIA"]
+
+
+def test_custom_flavor_registers_metric(tmp_path: Path, fake_fastf1: list, monkeypatch) -> None:
+    monkeypatch.setattr(hm, "METRICS", dict(hm.METRICS))
+
+    @hm.metric("race_count")
+    def _race_count(df: pd.DataFrame) -> pd.DataFrame:
+        df["Races"] = df.groupby("Driver", observed=True).cumcount() + 1
+        return df
+
+    flavor = hm.Flavor(
+        name="mini",
+        filename="mini_{season}.csv",
+        columns=("Driver", "EventName", "Races"),
+        metrics=("race_count",),
+    )
+    engine = hm.HeatmapEngine(2026, flavors=(flavor,), outputs={"mini": tmp_path / "m.csv"})
+    engine.run()
+    mini = pd.read_csv(tmp_path / "m.csv")
+    assert list(mini.loc[mini["Driver"] == "VER", "Races"]) == [1, 2]
+
+
+def _leaders(path: Path, now: datetime, incremental: bool = False) -> str:
+    engine = hm.HeatmapEngine(2026, flavors=("leaders",), outputs={"leaders": path})
+    engine.run(incremental=incremental, now=now)
+    return path.read_text(encoding="utf-8")
+
+
+def test_incremental_matches_full_rebuild(tmp_path: Path, fake_fastf1: list, monkeypatch) -> None:
+    now = datetime(2026, 4, 10, tzinfo=timezone.utc)
+    full = _leaders(tmp_path / "full.csv", now)
+
+    # CSV exporté quand seul le round 1 était disponible, puis passage incrémental
+    partial = tmp_path / "partial.csv"
+    race_2 = SESSIONS[(2, "R")]
+    monkeypatch.delitem(SESSIONS, (2, "R"))
+    _leaders(partial, now)
+    monkeypatch.setitem(SESSIONS, (2, "R"), race_2)
+    fake_fastf1.clear()
+
+    assert _leaders(partial, now, incremental=True) == full
+    # Round 1 conservé : seuls les GP absents du CSV sont chargés
+    assert {k[1] for k in fake_fastf1} == {2}
+
+
+def test_recent_round_is_reloaded(tmp_path: Path, fake_fastf1: list) -> None:
+    path = tmp_path / "leaders.csv"
+    # Lendemain du round 2 : encore dans la fenêtre de propagation, rechargé
+    now = datetime(2026, 3, 30, tzinfo=timezone.utc)
+    full = _leaders(path, now)
+    fake_fastf1.clear()
+    assert _leaders(path, now, incremental=True) == full
+    assert {k[1] for k in fake_fastf1} == {2}
+
+
+def _both(tmp_path: Path, name: str, now: datetime, incremental: bool = False) -> tuple[str, str]:
+    paths = {"leaders": tmp_path / f"{name}_leaders.csv", "full": tmp_path / f"{name}_full.csv"}
+    hm.HeatmapEngine(2026, flavors=("leaders", "full"), outputs=paths).run(
+        incremental=incremental, now=now
+    )
+    return tuple(p.read_text(encoding="utf-8") for p in paths.values())
+
+
+def test_incremental_keeps_half_points(tmp_path: Path, fake_fastf1: list, monkeypatch) -> None:
+    # Course 1 à demi-points : le CSV leaders arrondit, le CSV full garde 12.5 / 9.0
+    monkeypatch.setitem(
+        SESSIONS,
+        (1, "R"),
+        [("VER", 1.0, 3.0, 12.5), ("NOR", 2.0, 1.0, 9.0), ("PIA", None, 2.0, 0.0)],
+    )
+    now = datetime(2026, 4, 10, tzinfo=timezone.utc)
+    rebuilt = _both(tmp_path, "rebuilt", now)
+
+    race_2 = SESSIONS[(2, "R")]
+    monkeypatch.delitem(SESSIONS, (2, "R"))
+    _both(tmp_path, "partial", now)
+    monkeypatch.setitem(SESSIONS, (2, "R"), race_2)
+    fake_fastf1.clear()
+
+    assert _both(tmp_path, "partial", now, incremental=True) == rebuilt
+    assert {k[1] for k in fake_fastf1} == {2}
+
+    # CSV full absent : pas de points exacts, reconstruction complète
+    (tmp_path / "partial_full.csv").unlink()
+    fake_fastf1.clear()
+    assert _both(tmp_path, "partial", now, incremental=True) == rebuilt
+    assert {k[1] for k in fake_fastf1} == {1, 2}
+
+
+def test_incremental_requires_leaders(tmp_path: Path, fake_fastf1: list) -> None:
+    engine = hm.HeatmapEngine(2026, flavors=("full",), outputs={"full": tmp_path / "full.csv"})
+    with pytest.raises(ValueError, match="leaders"):
+        engine.run(incremental=True)
+    assert fake_fastf1 == []
+    # main.py (variante full seule) : erreur explicite plutôt qu'une reconstruction muette
+    with pytest.raises(SystemExit):
+        lead_main.parse_args(["--incremental"], default_flavors="full")
+    assert lead_main.parse_args(["--incremental", "--flavors", "leaders,full"]).incremental